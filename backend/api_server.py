@@ -2,31 +2,79 @@
 Repo Rover API Server V2
 Flask backend with conversational paper selection flow
 """
+# Patch the stdlib before anything else imports socket/ssl/subprocess so that
+# ArXiv, GitHub, Gemini and git I/O yield to other requests under gevent.
+from gevent import monkey
+monkey.patch_all()
+
 import sys
 import os
+import re
+import time
+import uuid
 from pathlib import Path
 
 # Add backend and src directories to path for imports
 sys.path.insert(0, str(Path(__file__).parent))  # backend/
 sys.path.insert(0, str(Path(__file__).parent / "src"))  # backend/src/
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import gevent
+from gevent.event import AsyncResult
+from gevent.threadpool import ThreadPool
+import orjson
 import logging
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 
-from session_manager import SessionManager
+from session_manager import create_session_manager
+from rover import RoverInstance
 from utils.config import Config
 from utils.repo_utils import RepoAnalyzer
 from utils.paper_cache import get_cache
+from utils.http_session import get_http_session
 from discovery.paper_finder import PaperFinder
 from discovery.repo_finder import RepoFinder
+from understanding.chroma_client import ChromaClientWrapper
 from understanding.code_indexer import ChromaIndexer
 from understanding.gemini_synthesizer import GeminiSynthesizer
 from understanding.query_pipeline import QueryPipeline
-from collection_manager import find_or_create_collection, collection_has_documents
+from collection_manager import find_or_create_collection, collection_has_documents, invalidate as invalidate_collection
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Fallback for types orjson does not serialize natively"""
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson (used by jsonify and request.get_json)"""
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_orjson_default, option=self.option).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_orjson_default, option=self.option)
+        return self._app.response_class(body, mimetype="application/json")
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 logging.basicConfig(level=logging.INFO)
@@ -36,7 +84,82 @@ logger = logging.getLogger("api_server")
 Config.ensure_directories()
 
 # Global session manager
-session_manager = SessionManager(max_age_hours=2)
+session_manager = create_session_manager(max_age_hours=2, redis_url=Config.REDIS_URL)
+session_manager.start_sweeper(interval_seconds=60)
+
+# Hot-path lookups, bound once
+_get_session = session_manager.get_session
+_update_session = session_manager.update_session
+
+
+# Shared clients: built on first use, then reused by every request so HTTP
+# sessions, gRPC channels and the Chroma database stay warm
+@lru_cache(maxsize=None)
+def _paper_finder() -> PaperFinder:
+    return PaperFinder(session=get_http_session())
+
+
+@lru_cache(maxsize=None)
+def _repo_finder() -> RepoFinder:
+    return RepoFinder()
+
+
+@lru_cache(maxsize=None)
+def _repo_analyzer() -> RepoAnalyzer:
+    return RepoAnalyzer(Config.REPO_CLONE_DIR)
+
+
+@lru_cache(maxsize=None)
+def _chroma_client() -> ChromaClientWrapper:
+    return ChromaClientWrapper(
+        persist_directory=Config.CHROMA_PATH,
+        cloud_api_key=Config.CHROMA_CLOUD_API_KEY,
+        cloud_host=Config.CHROMA_CLOUD_HOST
+    )
+
+
+@lru_cache(maxsize=None)
+def _gemini(model_name: str = "gemini-2.5-pro") -> GeminiSynthesizer:
+    # Pro model by default for synthesis/code analysis
+    return GeminiSynthesizer(Config.GEMINI_API_KEY, model_name)
+
+
+# path -> (checked_at, exists); bursts of inits for the same paper share one stat()
+_path_exists_cache: Dict[str, tuple] = {}
+PATH_EXISTS_TTL_SECONDS = 10.0
+
+
+def _path_exists(path: Path) -> bool:
+    """Path.exists() with a short-lived cache for hot request paths"""
+    key = str(path)
+    now = time.monotonic()
+    hit = _path_exists_cache.get(key)
+    if hit is not None and now - hit[0] < PATH_EXISTS_TTL_SECONDS:
+        return hit[1]
+
+    exists = path.exists()
+    _path_exists_cache[key] = (now, exists)
+    return exists
+
+
+def _invalidate_path(path: Optional[Path]):
+    """Forget a cached existence check after the path was created or removed"""
+    if path is not None:
+        _path_exists_cache.pop(str(path), None)
+
+
+# Native threads for CPU/native-heavy work (Chroma embedding/search), so one
+# long call doesn't stall the gevent hub and every other request with it
+_POOL = ThreadPool(maxsize=int(os.getenv("ROVER_THREADPOOL_SIZE", 8)))
+
+
+# ArXiv ID: 4 digits, dot, 4-5 digits, optional version
+_ARXIV_RE = re.compile(r'^\d{4}\.\d{4,5}(v\d+)?$')
+_ARXIV_URL_RE = re.compile(r'arxiv\.org', re.IGNORECASE)
+
+# A direct ArXiv ID lookup slower than this gets the (billed) Gemini search
+# started alongside it; faster hits never send a Gemini request
+ARXIV_DIRECT_FETCH_DEADLINE_SECONDS = 1.5
 
 
 def _is_arxiv_id(query: str) -> bool:
@@ -49,26 +172,21 @@ def _is_arxiv_id(query: str) -> bool:
     - arxiv.org/abs/1706.03762
     - https://arxiv.org/abs/1706.03762
     """
-    query = query.strip()
-
     # Check if it's a URL
-    if "arxiv.org" in query.lower():
+    if _ARXIV_URL_RE.search(query):
         return True
 
     # Check if it matches ArXiv ID pattern (YYMM.NNNNN or YYMM.NNNNNvN)
-    import re
-    # Pattern: 4 digits, dot, 4-5 digits, optional version
-    if re.match(r'^\d{4}\.\d{4,5}(v\d+)?$', query):
-        return True
-
-    return False
+    return bool(_ARXIV_RE.match(query.strip()))
 
 
 def _format_paper_option(paper: Dict, index: int) -> Dict:
     """Format a paper option for frontend display"""
-    authors = paper.get("authors", [])[:2]
-    authors_str = ", ".join(authors)
-    if len(paper.get("authors", [])) > 2:
+    authors = paper.get("authors") or []
+    summary = paper.get("summary") or ""
+
+    authors_str = ", ".join(authors[:2])
+    if len(authors) > 2:
         authors_str += "..."
 
     return {
@@ -76,7 +194,7 @@ def _format_paper_option(paper: Dict, index: int) -> Dict:
         "title": paper.get("title", "Unknown"),
         "arxiv_id": paper.get("arxiv_id", ""),
         "authors": authors_str,
-        "summary": paper.get("summary", "")[:200] + "..." if len(paper.get("summary", "")) > 200 else paper.get("summary", "")
+        "summary": summary[:200] + "..." if len(summary) > 200 else summary
     }
 
 
@@ -92,7 +210,7 @@ def health():
 @app.post("/api/session")
 def create_session():
     """Create a new session"""
-    session_id = session_manager.create_session()
+    session_id = session_manager.create_session().session_id
     return jsonify({
         "session_id": session_id
     })
@@ -130,24 +248,32 @@ def search_paper():
                 "error": "Missing session_id or query"
             }), 400
 
-        session = session_manager.get_session(session_id)
+        session = _get_session(session_id)
         if not session:
             return jsonify({
                 "success": False,
                 "error": "Invalid session"
             }), 404
 
-        paper_finder = PaperFinder()
+        paper_finder = _paper_finder()
+        g_search = None
 
         # Check if query is an ArXiv ID - if so, try direct fetch
         if _is_arxiv_id(query):
-            logger.info(f"Query looks like ArXiv ID: {query}")
-            paper = paper_finder.get_paper_by_id(query)
+            logger.info("Query looks like ArXiv ID: %s", query)
+            g_direct = gevent.spawn(paper_finder.get_paper_by_id, query)
+            # Only when the direct fetch is slow, start the fallback search
+            # too, so a miss doesn't pay for both round trips back to back
+            if not gevent.wait([g_direct], timeout=ARXIV_DIRECT_FETCH_DEADLINE_SECONDS):
+                g_search = gevent.spawn(paper_finder.search_paper_options, query, use_gemini=True)
+            paper = g_direct.get()
 
             if paper:
                 # Direct match - no selection needed
-                logger.info(f"Found exact match: {paper.get('title')}")
-                session_manager.update_session(
+                if g_search is not None:
+                    g_search.kill(block=False)
+                logger.info("Found exact match: %s", paper.get('title'))
+                _update_session(
                     session_id,
                     awaiting_paper_selection=False,
                     paper_options=None,
@@ -171,19 +297,22 @@ def search_paper():
                 })
             else:
                 # ArXiv ID format but not found - fall through to search
-                logger.info(f"ArXiv ID not found, falling back to search")
+                logger.info("ArXiv ID not found, falling back to search")
 
         # Not an ArXiv ID or direct fetch failed
         # Strategy: Go straight to Gemini search (skip ArXiv text search)
         # ArXiv text search is often poor quality, Gemini is much better
-        logger.info(f"Searching for: {query} (use_gemini={use_gemini})")
+        logger.info("Searching for: %s (use_gemini=%s)", query, use_gemini)
 
         # Always use Gemini search unless explicitly set to False
         if not use_gemini:
             # User explicitly requested ArXiv search - honor it but warn it's poor
             logger.info("Using ArXiv search (not recommended)")
 
-        options = paper_finder.search_paper_options(query, use_gemini=True)
+        if g_search is not None:
+            options = g_search.get()
+        else:
+            options = paper_finder.search_paper_options(query, use_gemini=True)
 
         if not options:
             # No results even from Gemini
@@ -196,7 +325,7 @@ def search_paper():
         formatted_options = [_format_paper_option(p, i+1) for i, p in enumerate(options)]
 
         # Store in session
-        session_manager.update_session(
+        _update_session(
             session_id,
             awaiting_paper_selection=True,
             paper_options=options,
@@ -248,7 +377,7 @@ def select_paper():
                 "error": "Missing session_id"
             }), 400
 
-        session = session_manager.get_session(session_id)
+        session = _get_session(session_id)
         if not session:
             return jsonify({
                 "success": False,
@@ -263,7 +392,7 @@ def select_paper():
 
         # Handle special commands
         if selection == "cancel":
-            session_manager.update_session(
+            _update_session(
                 session_id,
                 awaiting_paper_selection=False,
                 paper_options=None
@@ -289,7 +418,7 @@ def select_paper():
                 arxiv_id = selected_paper.get("arxiv_id")
 
                 # Clear selection state
-                session_manager.update_session(
+                _update_session(
                     session_id,
                     awaiting_paper_selection=False,
                     paper_options=None
@@ -326,6 +455,256 @@ def select_paper():
         }), 500
 
 
+# Cache-miss initializations in progress: arxiv_id -> result of the leading call
+_INFLIGHT: Dict[str, AsyncResult] = {}
+INFLIGHT_WAIT_SECONDS = 900
+
+
+def _init_paper_job(session_id: str, arxiv_id: str) -> Dict[str, Any]:
+    """
+    Initialize a paper for a session, coalescing concurrent cold starts
+
+    If another request is already doing the full (uncached) initialization of
+    the same paper, wait for it and then take the cheap cache-hit path instead
+    of downloading, scanning, cloning and indexing a second time.
+
+    Args:
+        session_id: Session to attach the rover instance to
+        arxiv_id: ArXiv ID of the selected paper
+
+    Returns:
+        Response payload for /api/init-paper
+    """
+    if get_cache().exists(arxiv_id):
+        return _initialize_paper(session_id, arxiv_id)
+
+    leader = _INFLIGHT.get(arxiv_id)
+    if leader is not None:
+        logger.info("Waiting for in-flight initialization of %s", arxiv_id)
+        try:
+            result = leader.get(timeout=INFLIGHT_WAIT_SECONDS)
+        except Exception:
+            # Leader crashed or is taking too long: do the work ourselves
+            result = None
+
+        # A failed lookup (paper/repo not found) would fail again; share it
+        if result is not None and not result.get("success"):
+            return result
+        return _initialize_paper(session_id, arxiv_id)
+
+    ar = AsyncResult()
+    _INFLIGHT[arxiv_id] = ar
+    try:
+        result = _initialize_paper(session_id, arxiv_id)
+        ar.set(result)
+        return result
+    except Exception as e:
+        ar.set_exception(e)
+        raise
+    finally:
+        _INFLIGHT.pop(arxiv_id, None)
+
+
+def _initialize_paper(session_id: str, arxiv_id: str) -> Dict[str, Any]:
+    """
+    Run the full paper initialization for a session
+
+    Args:
+        session_id: Session to attach the rover instance to
+        arxiv_id: ArXiv ID of the selected paper
+
+    Returns:
+        Response payload for /api/init-paper
+    """
+    # Get cache instance
+    cache = get_cache()
+    cached_data = cache.get(arxiv_id)
+    from_cache = False
+
+    repo_analyzer = _repo_analyzer()
+
+    # Check cache first
+    if cached_data:
+        logger.info("Found cached data for %s", arxiv_id)
+        from_cache = True
+
+        # Use cached paper info
+        paper_info = {
+            "title": cached_data.get("title"),
+            "arxiv_id": arxiv_id,
+            "authors": cached_data.get("authors", []),
+            "summary": cached_data.get("summary", ""),
+            "pdf_url": cached_data.get("pdf_url"),
+            "pdf_path": cached_data.get("pdf_path"),
+        }
+
+        # Use cached repo URL (skip expensive PDF scan!)
+        repo_url = cached_data.get("repo_url")
+        repo_path = Path(cached_data.get("repo_path", ""))
+
+        # Validate repo still exists
+        if not _path_exists(repo_path):
+            logger.warning("Cached repo path doesn't exist, re-cloning: %s", repo_path)
+            _invalidate_path(repo_path)
+            repo_path = repo_analyzer.clone_repository(repo_url)
+            _invalidate_path(repo_path)
+            if repo_path:
+                cache.update(arxiv_id, {"repo_path": str(repo_path)})
+
+    else:
+        logger.info("Cache MISS for %s, performing full initialization", arxiv_id)
+
+        # Step 1: Get paper
+        logger.info("Fetching paper: %s", arxiv_id)
+        paper_finder = _paper_finder()
+        paper_info = paper_finder.get_paper_by_id(arxiv_id)
+
+        if not paper_info:
+            return {
+                "success": False,
+                "error": "Paper not found",
+                "message": f"Could not fetch paper with ID {arxiv_id}"
+            }
+
+        # Download PDF
+        pdf_path = paper_finder.download_paper(paper_info)
+        paper_info["pdf_path"] = str(pdf_path) if pdf_path else None
+
+        # Step 2: Find repository (EXPENSIVE - scan PDF with Gemini)
+        logger.info("Finding repository via PDF scan...")
+        repo_url = _repo_finder().find_with_fallback(paper_info)
+
+        if not repo_url:
+            return {
+                "success": False,
+                "error": "Repository not found",
+                "message": f"Found the paper but couldn't locate a code repository for '{paper_info['title']}'",
+                "paper_info": {
+                    "title": paper_info.get("title"),
+                    "arxiv_id": arxiv_id,
+                }
+            }
+
+        # Step 3: Clone repository
+        logger.info("Cloning repository: %s", repo_url)
+        repo_path = repo_analyzer.clone_repository(repo_url)
+        _invalidate_path(repo_path)
+
+        if not repo_path:
+            return {
+                "success": False,
+                "error": "Clone failed",
+                "message": "Failed to clone the repository"
+            }
+
+    # Step 4: Index code (uses existing ChromaDB caching)
+    # The collection check and repo scans are independent, run them together
+    collection_name = arxiv_id
+    g_exists = _POOL.spawn(collection_has_documents, collection_name)
+    g_structure = gevent.spawn(repo_analyzer.get_repo_structure, repo_path)
+    g_readme = gevent.spawn(repo_analyzer.get_readme_content, repo_path)
+    gevent.joinall([g_exists, g_structure, g_readme], raise_error=True)
+
+    repo_structure = g_structure.value
+    readme = g_readme.value
+
+    # Clients are only needed from here on (the indexer tracks the active
+    # collection, so each pipeline gets its own on top of the shared client)
+    chroma = ChromaIndexer(client=_chroma_client())
+    gemini = _gemini()
+    chroma.set_collection(collection_name)
+
+    g_index = None
+    if g_exists.value:
+        logger.info("Using cached ChromaDB collection for %s", collection_name)
+        indexed_count = "cached"
+    else:
+        # Embedding the repo and generating the concept map both wait on
+        # Gemini, so index in the background while the pipeline initializes
+        logger.info("Indexing code in ChromaDB...")
+        g_index = _POOL.spawn(chroma.index_repository, repo_path, collection_name)
+
+    # Step 5: Initialize pipeline with concept map
+    logger.info("Initializing query pipeline...")
+    pipeline = QueryPipeline(chroma, gemini, paper_info, repo_path)
+
+    # Load or generate concept map
+    concept_map = None
+    if from_cache:
+        concept_map = cache.load_concept_map(arxiv_id)
+        if concept_map:
+            logger.info("Loaded cached concept map for %s", arxiv_id)
+
+    pipeline.initialize(readme or "", repo_structure, concept_map=concept_map)
+
+    if g_index is not None:
+        indexed_count = g_index.get()
+        invalidate_collection(collection_name)
+
+    # Store in session
+    rover = RoverInstance(pipeline, paper_info, repo_path)
+
+    logger.info("Updating session %s with rover instance", session_id)
+    _update_session(
+        session_id,
+        rover_instance=rover,
+        paper_info=paper_info,
+        repo_path=repo_path,
+        is_initialized=True,
+        initialization_error=None
+    )
+    logger.info("Session updated successfully - is_initialized: True")
+
+    title = paper_info.get("title")
+    authors = paper_info.get("authors") or []
+    summary = paper_info.get("summary") or ""
+    pdf_url = paper_info.get("pdf_url", "")
+
+    # Save to cache if this was a fresh initialization
+    if not from_cache:
+        logger.info("Saving paper data to cache for %s", arxiv_id)
+
+        # Save concept map if generated
+        if hasattr(pipeline, 'concept_map') and pipeline.concept_map:
+            concept_map_path = cache.save_concept_map(arxiv_id, pipeline.concept_map)
+        else:
+            concept_map_path = None
+
+        # Save all metadata to cache
+        from datetime import datetime, timezone
+        cache.set(arxiv_id, {
+            "arxiv_id": arxiv_id,
+            "title": title,
+            "authors": authors,
+            "summary": summary,
+            "pdf_url": pdf_url,
+            "pdf_path": paper_info.get("pdf_path"),
+            "repo_url": repo_url,
+            "repo_path": str(repo_path),
+            "chroma_collection": collection_name,
+            "chroma_indexed_at": datetime.now(timezone.utc).isoformat(),
+            "chroma_file_count": indexed_count if isinstance(indexed_count, int) else None,
+            "concept_map_path": str(concept_map_path) if concept_map_path else None,
+        })
+
+    logger.info("Pipeline initialization complete!")
+
+    return {
+        "success": True,
+        "message": "Successfully analyzed paper and code repository",
+        "from_cache": from_cache,
+        "paper_info": {
+            "title": title,
+            "arxiv_id": arxiv_id,
+            "authors": authors[:3],
+            "summary": summary[:500],
+            "pdf_url": pdf_url,
+        },
+        "repo_url": repo_url,
+        "indexed_files": indexed_count
+    }
+
+
 @app.post("/api/init-paper")
 def init_paper():
     """
@@ -335,7 +714,8 @@ def init_paper():
     Request body:
         {
             "session_id": "uuid",
-            "arxiv_id": "1706.03762"
+            "arxiv_id": "1706.03762",
+            "background": false   # optional: run as a task, poll for status
         }
     """
     try:
@@ -349,227 +729,173 @@ def init_paper():
                 "error": "Missing session_id or arxiv_id"
             }), 400
 
-        session = session_manager.get_session(session_id)
+        session = _get_session(session_id)
         if not session:
             return jsonify({
                 "success": False,
                 "error": "Invalid session"
             }), 404
 
-        # Get cache instance
-        cache = get_cache()
-        cached_data = cache.get(arxiv_id)
-        from_cache = False
-
-        # Initialize components
-        paper_finder = PaperFinder()
-        repo_analyzer = RepoAnalyzer(Config.REPO_CLONE_DIR)
-
-        chroma = ChromaIndexer(
-            persist_directory=Config.CHROMA_PATH,
-            cloud_api_key=Config.CHROMA_CLOUD_API_KEY,
-            cloud_host=Config.CHROMA_CLOUD_HOST
-        )
-
-        # Use Pro model specifically for synthesis/code analysis
-        gemini = GeminiSynthesizer(
-            Config.GEMINI_API_KEY,
-            "gemini-2.5-pro"
-        )
-
-        # Check cache first
-        if cached_data:
-            logger.info(f"Found cached data for {arxiv_id}")
-            from_cache = True
-
-            # Use cached paper info
-            paper_info = {
-                "title": cached_data.get("title"),
-                "arxiv_id": arxiv_id,
-                "authors": cached_data.get("authors", []),
-                "summary": cached_data.get("summary", ""),
-                "pdf_url": cached_data.get("pdf_url"),
-                "pdf_path": cached_data.get("pdf_path"),
-            }
-
-            # Use cached repo URL (skip expensive PDF scan!)
-            repo_url = cached_data.get("repo_url")
-            repo_path = Path(cached_data.get("repo_path", ""))
-
-            # Validate repo still exists
-            if not repo_path.exists():
-                logger.warning(f"Cached repo path doesn't exist, re-cloning: {repo_path}")
-                repo_path = repo_analyzer.clone_repository(repo_url)
-                if repo_path:
-                    cache.update(arxiv_id, {"repo_path": str(repo_path)})
-
-        else:
-            logger.info(f"Cache MISS for {arxiv_id}, performing full initialization")
-
-            # Step 1: Get paper
-            logger.info(f"Fetching paper: {arxiv_id}")
-            paper_info = paper_finder.get_paper_by_id(arxiv_id)
+        if data.get("background"):
+            task_id = _submit_init_task(session_id, arxiv_id)
+            return jsonify({
+                "success": True,
+                "task_id": task_id,
+                "status_url": f"/api/init-paper/status/{task_id}"
+            }), 202
 
-            if not paper_info:
-                return jsonify({
-                    "success": False,
-                    "error": "Paper not found",
-                    "message": f"Could not fetch paper with ID {arxiv_id}"
-                })
+        return jsonify(_init_paper_job(session_id, arxiv_id))
 
-            # Download PDF
-            pdf_path = paper_finder.download_paper(paper_info)
-            paper_info["pdf_path"] = str(pdf_path) if pdf_path else None
+    except Exception as e:
+        logger.exception("Error in init_paper")
+        return jsonify({
+            "success": False,
+            "error": "Server error",
+            "message": str(e)
+        }), 500
 
-            # Step 2: Find repository (EXPENSIVE - scan PDF with Gemini)
-            logger.info("Finding repository via PDF scan...")
-            repo_finder = RepoFinder()
-            repo_url = repo_finder.find_with_fallback(paper_info)
 
-            if not repo_url:
-                return jsonify({
-                    "success": False,
-                    "error": "Repository not found",
-                    "message": f"Found the paper but couldn't locate a code repository for '{paper_info['title']}'",
-                    "paper_info": {
-                        "title": paper_info.get("title"),
-                        "arxiv_id": arxiv_id,
-                    }
-                })
+# Background init tasks: task_id -> {"state", "session_id", "arxiv_id", "result", "finished_at"}
+# Kept in this process unless sessions are in Redis; then tasks go there too
+# (one hash per task with a TTL), so a status poll can land on any worker
+_init_tasks: Dict[str, Dict[str, Any]] = {}
+INIT_TASK_TTL_SECONDS = 3600
 
-            # Step 3: Clone repository
-            logger.info(f"Cloning repository: {repo_url}")
-            repo_path = repo_analyzer.clone_repository(repo_url)
 
-            if not repo_path:
-                return jsonify({
-                    "success": False,
-                    "error": "Clone failed",
-                    "message": "Failed to clone the repository"
-                })
+def _task_key(task_id: str) -> str:
+    return f"init-task:{task_id}"
 
-        # Step 4: Index code (uses existing ChromaDB caching)
-        collection_name = arxiv_id
-        collection_exists = collection_has_documents(collection_name)
 
-        if collection_exists:
-            logger.info(f"Using cached ChromaDB collection for {collection_name}")
-            indexed_count = "cached"
-        else:
-            logger.info("Indexing code in ChromaDB...")
-            chroma.set_collection(collection_name)
-            indexed_count = chroma.index_repository(repo_path, collection_name)
+def _save_task(task_id: str, **fields) -> None:
+    """Create or update a background init task"""
+    redis = getattr(session_manager, "redis", None)
+    if redis is None:
+        _init_tasks.setdefault(task_id, {}).update(fields)
+        return
 
-        # Step 5: Initialize pipeline with concept map
-        logger.info("Initializing query pipeline...")
-        repo_structure = repo_analyzer.get_repo_structure(repo_path)
-        readme = repo_analyzer.get_readme_content(repo_path)
+    key = _task_key(task_id)
+    pipe = redis.pipeline()
+    pipe.hset(key, mapping={field: orjson.dumps(value, default=str) for field, value in fields.items()})
+    pipe.expire(key, INIT_TASK_TTL_SECONDS)
+    pipe.execute()
 
-        chroma.set_collection(collection_name)
 
-        pipeline = QueryPipeline(chroma, gemini, paper_info, repo_path)
+def _load_task(task_id: str) -> Optional[Dict[str, Any]]:
+    """Background init task by ID, or None if unknown/expired"""
+    redis = getattr(session_manager, "redis", None)
+    if redis is None:
+        return _init_tasks.get(task_id)
 
-        # Load or generate concept map
-        concept_map = None
-        if from_cache:
-            concept_map = cache.load_concept_map(arxiv_id)
-            if concept_map:
-                logger.info(f"Loaded cached concept map for {arxiv_id}")
+    data = redis.hgetall(_task_key(task_id))
+    if not data:
+        return None
+    return {field.decode(): orjson.loads(raw) for field, raw in data.items()}
 
-        pipeline.initialize(readme or "", repo_structure, concept_map=concept_map)
 
-        # Store in session
-        class RoverInstance:
-            def __init__(self, pipeline, paper_info, repo_path):
-                self.pipeline = pipeline
-                self.paper_info = paper_info
-                self.repo_path = repo_path
-
-            def query(self, question):
-                response = self.pipeline.query(question)
-                return {
-                    "success": True,
-                    "answer": response.get("answer", ""),
-                    "code_snippets": response.get("code_snippets", []),
-                    "confidence": response.get("confidence", "medium"),
-                    "num_sources": response.get("num_sources", 0)
-                }
+def _run_init_task(task_id: str, session_id: str, arxiv_id: str) -> None:
+    """Greenlet body for a background init task"""
+    _save_task(task_id, state="STARTED")
 
-        rover = RoverInstance(pipeline, paper_info, repo_path)
+    try:
+        result = _init_paper_job(session_id, arxiv_id)
+    except Exception as e:
+        logger.exception("Error in background init_paper")
+        result = {
+            "success": False,
+            "error": "Server error",
+            "message": str(e)
+        }
 
-        logger.info(f"Updating session {session_id} with rover instance")
-        session_manager.update_session(
+    if not result.get("success"):
+        _update_session(
             session_id,
-            rover_instance=rover,
-            paper_info=paper_info,
-            repo_path=repo_path,
-            is_initialized=True,
-            initialization_error=None
+            initialization_error=result.get("message") or result.get("error")
         )
-        logger.info(f"Session updated successfully - is_initialized: True")
 
-        # Save to cache if this was a fresh initialization
-        if not from_cache:
-            logger.info(f"Saving paper data to cache for {arxiv_id}")
+    _save_task(
+        task_id,
+        result=result,
+        state="SUCCESS" if result.get("success") else "FAILURE",
+        finished_at=time.monotonic()
+    )
 
-            # Save concept map if generated
-            if hasattr(pipeline, 'concept_map') and pipeline.concept_map:
-                concept_map_path = cache.save_concept_map(arxiv_id, pipeline.concept_map)
-            else:
-                concept_map_path = None
-
-            # Save all metadata to cache
-            from datetime import datetime, timezone
-            cache.set(arxiv_id, {
-                "arxiv_id": arxiv_id,
-                "title": paper_info.get("title"),
-                "authors": paper_info.get("authors", []),
-                "summary": paper_info.get("summary", ""),
-                "pdf_url": paper_info.get("pdf_url", ""),
-                "pdf_path": paper_info.get("pdf_path"),
-                "repo_url": repo_url,
-                "repo_path": str(repo_path),
-                "chroma_collection": collection_name,
-                "chroma_indexed_at": datetime.now(timezone.utc).isoformat(),
-                "chroma_file_count": indexed_count if isinstance(indexed_count, int) else None,
-                "concept_map_path": str(concept_map_path) if concept_map_path else None,
-            })
 
-        logger.info("Pipeline initialization complete!")
+def _submit_init_task(session_id: str, arxiv_id: str) -> str:
+    """
+    Start initialization in a greenlet so the request returns immediately
 
-        return jsonify({
-            "success": True,
-            "message": "Successfully analyzed paper and code repository",
-            "from_cache": from_cache,
-            "paper_info": {
-                "title": paper_info.get("title"),
-                "arxiv_id": arxiv_id,
-                "authors": paper_info.get("authors", [])[:3],
-                "summary": paper_info.get("summary", "")[:500],
-                "pdf_url": paper_info.get("pdf_url", ""),
-            },
-            "repo_url": repo_url,
-            "indexed_files": indexed_count
-        })
+    Returns:
+        Task ID to poll via /api/init-paper/status/<task_id>
+    """
+    # Forget finished tasks nobody polled for (Redis expires its own)
+    now = time.monotonic()
+    for old_id in [
+        tid for tid, t in _init_tasks.items()
+        if t["finished_at"] is not None and now - t["finished_at"] > INIT_TASK_TTL_SECONDS
+    ]:
+        del _init_tasks[old_id]
+
+    task_id = uuid.uuid4().hex
+    _save_task(
+        task_id,
+        state="PENDING",
+        session_id=session_id,
+        arxiv_id=arxiv_id,
+        result=None,
+        finished_at=None
+    )
+    gevent.spawn(_run_init_task, task_id, session_id, arxiv_id)
+    logger.info("Queued background init %s for %s", task_id, arxiv_id)
+    return task_id
+
+
+@app.get("/api/init-paper/status/<task_id>")
+def init_paper_status(task_id: str):
+    """
+    Poll a background initialization started with "background": true
 
-    except Exception as e:
-        logger.exception("Error in init_paper")
+    Response:
+        {"success": true, "task_id": "...", "state": "PENDING|STARTED|SUCCESS|FAILURE",
+         "result": {...init-paper payload, once finished...}}
+    """
+    task = _load_task(task_id)
+    if not task:
         return jsonify({
             "success": False,
-            "error": "Server error",
-            "message": str(e)
-        }), 500
+            "error": "Unknown task"
+        }), 404
+
+    return jsonify({
+        "success": True,
+        "task_id": task_id,
+        "state": task["state"],
+        "arxiv_id": task["arxiv_id"],
+        "result": task["result"]
+    })
 
 
 @app.post("/api/chat")
 def chat():
-    """Answer a question about the loaded paper"""
+    """
+    Answer a question about the loaded paper
+
+    Request body:
+        {
+            "session_id": "uuid",
+            "message": "How is attention implemented?",
+            "stream": false   # optional: answer as server-sent events
+        }
+
+    With "stream": true the response is text/event-stream; each event is a
+    JSON object: one "sources" event, "delta" events with answer text, then
+    "done" with the full answer (or "error").
+    """
     try:
         data = request.get_json() or {}
         session_id = data.get("session_id")
         message = data.get("message", "").strip()
 
-        logger.info(f"Chat request - Session ID: {session_id}, Message: {message[:50]}...")
+        logger.info("Chat request - Session ID: %s, Message: %.50s...", session_id, message)
 
         if not session_id or not message:
             return jsonify({
@@ -577,18 +903,25 @@ def chat():
                 "error": "Missing session_id or message"
             }), 400
 
-        session = session_manager.get_session(session_id)
+        session = _get_session(session_id)
         if not session:
-            logger.error(f"Session not found: {session_id}")
+            logger.error("Session not found: %s", session_id)
             return jsonify({
                 "success": False,
                 "error": "Invalid session"
             }), 404
 
-        logger.info(f"Session found - is_initialized: {session.is_initialized}, rover_instance: {session.rover_instance is not None}")
+        logger.info("Session found - is_initialized: %s, rover_instance: %s", session.is_initialized, session.rover_instance is not None)
+
+        if session.is_initialized and not session.rover_instance and session.paper_info:
+            # Initialized on another worker: rebuild the pipeline here (cache hit path)
+            arxiv_id = session.paper_info.get("arxiv_id")
+            logger.info("Restoring rover instance for %s in this worker", arxiv_id)
+            _init_paper_job(session_id, arxiv_id)
+            session = _get_session(session_id) or session
 
         if not session.is_initialized or not session.rover_instance:
-            logger.error(f"Session not initialized - is_initialized: {session.is_initialized}, has_rover: {session.rover_instance is not None}")
+            logger.error("Session not initialized - is_initialized: %s, has_rover: %s", session.is_initialized, session.rover_instance is not None)
             return jsonify({
                 "success": False,
                 "error": "Not initialized",
@@ -596,7 +929,27 @@ def chat():
             }), 400
 
         rover = session.rover_instance
-        response = rover.query(message)
+
+        if data.get("stream"):
+            def generate():
+                events = rover.stream(message)
+                # Everything up to the first event is the Chroma search and
+                # query embedding; run that part on the pool, the Gemini
+                # stream after it is network I/O the hub handles fine
+                first = _POOL.apply(next, (events, None))
+                if first is None:
+                    return
+                yield b"data: " + orjson.dumps(first, default=str) + b"\n\n"
+                for event in events:
+                    yield b"data: " + orjson.dumps(event, default=str) + b"\n\n"
+
+            return Response(
+                stream_with_context(generate()),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
+        response = _POOL.apply(rover.query, (message,))
 
         return jsonify(response)
 
@@ -622,7 +975,7 @@ def reset():
         }), 400
 
     session_manager.delete_session(session_id)
-    new_session_id = session_manager.create_session()
+    new_session_id = session_manager.create_session().session_id
 
     return jsonify({
         "success": True,
@@ -665,11 +1018,9 @@ def clear_cache(arxiv_id: str):
         # Delete from cache
         deleted = cache.delete(arxiv_id)
 
-        # Also delete concept map file if it exists
-        concept_map_path = Config.CONCEPT_MAPS_DIR / f"{arxiv_id}.json"
-        if concept_map_path.exists():
-            concept_map_path.unlink()
-            logger.info(f"Deleted concept map file for {arxiv_id}")
+        # Also delete the concept map
+        if cache.delete_concept_map(arxiv_id):
+            logger.info("Deleted concept map for %s", arxiv_id)
 
         return jsonify({
             "success": True,
@@ -706,26 +1057,58 @@ def clear_all_cache():
         }), 500
 
 
+SHOWCASE_METADATA_PATH = Path(__file__).parent / "showcase_papers" / "metadata.json"
+
+# (mtime, papers, index by arxiv_id/id) - reparsed only when the file changes
+_showcase_state: Optional[tuple] = None
+
+
+def _load_showcase() -> Optional[tuple]:
+    """
+    Return showcase papers and a lookup index, parsing metadata.json only
+    when it has changed on disk
+
+    Returns:
+        (papers, index) tuple, or None if the showcase is not configured
+    """
+    global _showcase_state
+
+    try:
+        mtime = SHOWCASE_METADATA_PATH.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+    state = _showcase_state
+    if state is None or state[0] != mtime:
+        papers = orjson.loads(SHOWCASE_METADATA_PATH.read_bytes()).get("papers", [])
+
+        # First paper wins for a key, matching the old in-order scan
+        index: Dict[str, Dict] = {}
+        for paper in papers:
+            index.setdefault(paper["arxiv_id"], paper)
+            index.setdefault(paper["id"], paper)
+
+        state = _showcase_state = (mtime, papers, index)
+
+    return state[1], state[2]
+
+
 @app.get("/api/showcase-papers")
 def get_showcase_papers():
     """Get the list of featured showcase papers"""
     try:
-        import json
-        showcase_metadata_path = Path(__file__).parent / "showcase_papers" / "metadata.json"
-        
-        if not showcase_metadata_path.exists():
+        showcase = _load_showcase()
+
+        if showcase is None:
             return jsonify({
                 "success": False,
                 "error": "Showcase not configured",
                 "papers": []
             })
-        
-        with open(showcase_metadata_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-        
+
         return jsonify({
             "success": True,
-            "papers": metadata.get("papers", [])
+            "papers": showcase[0]
         })
     
     except Exception as e:
@@ -753,25 +1136,17 @@ def init_showcase_paper():
             }), 400
         
         # Load showcase metadata
-        import json
-        showcase_metadata_path = Path(__file__).parent / "showcase_papers" / "metadata.json"
-        
-        if not showcase_metadata_path.exists():
+        showcase = _load_showcase()
+
+        if showcase is None:
             return jsonify({
                 "success": False,
                 "error": "Showcase not configured"
             }), 500
-        
-        with open(showcase_metadata_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-        
+
         # Find the requested paper
-        showcase_paper_info = None
-        for paper in metadata.get("papers", []):
-            if paper["id"] == arxiv_id or paper["arxiv_id"] == arxiv_id:
-                showcase_paper_info = paper
-                break
-        
+        showcase_paper_info = showcase[1].get(arxiv_id)
+
         if not showcase_paper_info:
             return jsonify({
                 "success": False,
@@ -779,7 +1154,7 @@ def init_showcase_paper():
             }), 404
         
         # Get session (should already exist from frontend)
-        session = session_manager.get_session(session_id)
+        session = _get_session(session_id)
         
         if not session:
             return jsonify({
@@ -800,7 +1175,7 @@ def init_showcase_paper():
         
         # Get cached data
         repo_path = Path(cached_paper.get("repo_path", ""))
-        if not repo_path.exists():
+        if not _path_exists(repo_path):
             return jsonify({
                 "success": False,
                 "error": "Repository not found",
@@ -808,14 +1183,14 @@ def init_showcase_paper():
             }), 404
         
         # Initialize the query pipeline with cached data
-        logger.info(f"Initializing showcase paper {arxiv_id} for session {session_id}")
+        logger.info("Initializing showcase paper %s for session %s", arxiv_id, session_id)
         
         # Get the ChromaDB collection
         collection_name = cached_paper.get("chroma_collection", arxiv_id)
         
         # Initialize ChromaDB indexer and Gemini synthesizer (same as regular flow)
-        chroma = ChromaIndexer()
-        gemini = GeminiSynthesizer(Config.GEMINI_API_KEY, "gemini-2.5-pro")
+        chroma = ChromaIndexer(client=_chroma_client())
+        gemini = _gemini()
         
         # Set the collection
         chroma.set_collection(collection_name)
@@ -838,7 +1213,7 @@ def init_showcase_paper():
         concept_map = cache.load_concept_map(arxiv_id)
         
         # Get repo structure
-        repo_analyzer = RepoAnalyzer(Config.REPO_CLONE_DIR)
+        repo_analyzer = _repo_analyzer()
         repo_structure = repo_analyzer.get_repo_structure(repo_path)
         readme = repo_analyzer.get_readme_content(repo_path)
         
@@ -846,27 +1221,11 @@ def init_showcase_paper():
         pipeline.initialize(readme or "", repo_structure, concept_map=concept_map)
         
         # Create RoverInstance (same as regular flow)
-        class RoverInstance:
-            def __init__(self, pipeline, paper_info, repo_path):
-                self.pipeline = pipeline
-                self.paper_info = paper_info
-                self.repo_path = repo_path
-
-            def query(self, question):
-                response = self.pipeline.query(question)
-                return {
-                    "success": True,
-                    "answer": response.get("answer", ""),
-                    "code_snippets": response.get("code_snippets", []),
-                    "confidence": response.get("confidence", "medium"),
-                    "num_sources": response.get("num_sources", 0)
-                }
-        
         rover = RoverInstance(pipeline, paper_info, repo_path)
         
         # Store in session using update_session
-        logger.info(f"Updating session {session_id} with showcase paper rover instance")
-        session_manager.update_session(
+        logger.info("Updating session %s with showcase paper rover instance", session_id)
+        _update_session(
             session_id,
             rover_instance=rover,
             paper_info=paper_info,
@@ -875,7 +1234,7 @@ def init_showcase_paper():
             initialization_error=None
         )
         
-        logger.info(f"Showcase paper {arxiv_id} initialization complete!")
+        logger.info("Showcase paper %s initialization complete!", arxiv_id)
         
         return jsonify({
             "success": True,
@@ -917,41 +1276,24 @@ def transcribe_audio():
                 "message": "Empty audio file"
             }), 400
 
-        # Save audio temporarily
-        import tempfile
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as tmp_file:
-            audio_path = tmp_file.name
-            audio_file.save(audio_path)
+        # Werkzeug has already buffered the upload; hand the bytes straight to Gemini
+        audio_data = audio_file.read()
 
-        try:
-            logger.info(f"Transcribing audio file: {audio_path}")
-
-            # Use Gemini to transcribe
-            synthesizer = GeminiSynthesizer(api_key=Config.GEMINI_API_KEY)
-            transcription = synthesizer.transcribe_audio(audio_path)
+        logger.info("Transcribing audio upload: %s (%d bytes)", audio_file.filename, len(audio_data))
 
-            logger.info(f"Transcription successful: {len(transcription)} characters")
+        # Use Gemini to transcribe
+        synthesizer = _gemini("gemini-2.0-flash-exp")
+        transcription = synthesizer.transcribe_audio_bytes(audio_data, audio_file.mimetype)
 
-            # Clean up temp file
-            os.remove(audio_path)
+        logger.info("Transcription successful: %s characters", len(transcription))
 
-            return jsonify({
-                "success": True,
-                "transcription": transcription
-            })
-
-        except Exception as e:
-            logger.exception(f"Error during transcription: {str(e)}")
-            # Clean up temp file on error
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
-            raise e
+        return jsonify({
+            "success": True,
+            "transcription": transcription
+        })
 
     except Exception as e:
         logger.exception("Error transcribing audio")
-        import traceback
-        error_details = traceback.format_exc()
-        logger.error(f"Full error details: {error_details}")
         return jsonify({
             "success": False,
             "message": f"Transcription failed: {str(e)}"
@@ -959,5 +1301,8 @@ def transcribe_audio():
 
 
 if __name__ == "__main__":
+    # Local development only; production runs under gunicorn:
+    #   gunicorn -c backend/gunicorn.conf.py backend.api_server:app
     port = int(os.getenv("PORT", 5000))
-    app.run(host="127.0.0.1", port=port, debug=True)
+    debug = os.getenv("FLASK_DEBUG", "0").lower() in ("1", "true")
+    app.run(host="127.0.0.1", port=port, debug=debug)
@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for the Repo Rover API server
+
+Usage:
+    gunicorn -c backend/gunicorn.conf.py backend.api_server:app
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Requests are dominated by network I/O (ArXiv, PDF download, git clone,
+# Gemini, ChromaDB), so a cooperative gevent worker can serve hundreds of
+# them concurrently instead of blocking one OS thread each.
+worker_class = "gevent"
+worker_connections = int(os.getenv("WORKER_CONNECTIONS", 1000))
+
+# Sessions and background init tasks live in process memory unless REDIS_URL
+# is set, so a single worker is the default. With Redis, raise WEB_CONCURRENCY
+# (e.g. 2 * CPU + 1); each worker rebuilds a paper's pipeline from the shared
+# paper cache the first time one of its sessions reaches it.
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+
+# Paper initialization (clone + index + concept map) can take minutes
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 0))
+
+# Worker heartbeat files on tmpfs, so a slow container disk can't stall workers
+worker_tmp_dir = os.getenv("WORKER_TMP_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else None)
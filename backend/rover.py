@@ -0,0 +1,63 @@
+"""
+Rover instance stored in a session once a paper is initialized
+Wraps a QueryPipeline with the response shape the API returns
+"""
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from understanding.query_pipeline import QueryPipeline
+
+
+class RoverInstance:
+    """Initialized paper + repository, ready for Q&A"""
+
+    def __init__(self, pipeline: QueryPipeline, paper_info: Dict[str, Any], repo_path: Path):
+        self.pipeline = pipeline
+        self.paper_info = paper_info
+        self.repo_path = repo_path
+
+    @staticmethod
+    def _payload(response: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "answer": response.get("answer", ""),
+            "code_snippets": response.get("code_snippets", []),
+            "confidence": response.get("confidence", "medium"),
+            "num_sources": response.get("num_sources", 0)
+        }
+
+    def query(self, question: str) -> Dict[str, Any]:
+        """
+        Answer a question about the paper
+
+        Args:
+            question: User question
+
+        Returns:
+            Chat response payload
+        """
+        return self._payload(self.pipeline.query(question))
+
+    async def aquery(self, question: str) -> Dict[str, Any]:
+        """
+        Async variant of query for event-loop callers (e.g. the uAgent)
+
+        Args:
+            question: User question
+
+        Returns:
+            Chat response payload
+        """
+        return self._payload(await self.pipeline.aquery(question))
+
+    def stream(self, question: str) -> Iterator[Dict[str, Any]]:
+        """
+        Answer a question, yielding events as the answer is generated
+
+        Args:
+            question: User question
+
+        Yields:
+            Events from QueryPipeline.query_stream
+        """
+        return self.pipeline.query_stream(question)
@@ -2,10 +2,16 @@
 Session Manager for Repo Rover API
 Manages user sessions and pipeline state
 """
+import heapq
+import time
 import uuid
-from typing import Dict, Optional
-from datetime import datetime, timedelta
-from threading import Lock
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from datetime import datetime
+from threading import Event, Lock, Thread
+
+import orjson
 
 
 class Session:
@@ -13,8 +19,8 @@ class Session:
 
     def __init__(self, session_id: str):
         self.session_id = session_id
-        self.created_at = datetime.now()
-        self.last_accessed = datetime.now()
+        self.created_at = datetime.now()  # for display only
+        self.last_accessed = time.monotonic()  # expiry clock, cheap to update
 
         # Pipeline state
         self.rover_instance = None  # RepoRover instance
@@ -31,33 +37,63 @@ class Session:
 
     def touch(self):
         """Update last accessed time"""
-        self.last_accessed = datetime.now()
+        self.last_accessed = time.monotonic()
 
     def is_expired(self, max_age_hours: int = 2) -> bool:
         """Check if session has expired"""
-        age = datetime.now() - self.last_accessed
-        return age > timedelta(hours=max_age_hours)
+        return time.monotonic() - self.last_accessed > max_age_hours * 3600
 
 
 class SessionManager:
-    """Thread-safe session manager"""
+    """
+    Thread-safe session manager
+
+    Lookups are plain dict reads (atomic under the GIL) and take no lock.
+    Mutations take one of a fixed set of striped locks chosen by session ID,
+    so updates to different sessions don't serialize on a single mutex.
+    """
+
+    NUM_LOCK_STRIPES = 16
 
     def __init__(self, max_age_hours: int = 2):
         self.sessions: Dict[str, Session] = {}
-        self.lock = Lock()
+        self.locks = [Lock() for _ in range(self.NUM_LOCK_STRIPES)]
         self.max_age_hours = max_age_hours
+        self.max_age_seconds = max_age_hours * 3600
+        self._sweeper: Optional[Thread] = None
+        self._stop_sweeper = Event()
+
+        # (earliest possible expiry, session_id); entries are checked lazily,
+        # so touches don't need to update the heap
+        self._expiry_heap: list = []
+        self._heap_lock = Lock()
+
+    def _lock_for(self, session_id: str) -> Lock:
+        return self.locks[hash(session_id) % self.NUM_LOCK_STRIPES]
+
+    def _evict(self, session_id: str, session: Session):
+        """Remove a session if it is still the one we saw expire"""
+        with self._lock_for(session_id):
+            if self.sessions.get(session_id) is session:
+                del self.sessions[session_id]
 
-    def create_session(self) -> str:
+    def create_session(self) -> Session:
         """
         Create a new session
 
         Returns:
-            Session ID
+            The new Session (its ID is session.session_id)
         """
-        with self.lock:
-            session_id = str(uuid.uuid4())
-            self.sessions[session_id] = Session(session_id)
-            return session_id
+        session_id = str(uuid.uuid4())
+        session = Session(session_id)
+        with self._lock_for(session_id):
+            self.sessions[session_id] = session
+        with self._heap_lock:
+            heapq.heappush(
+                self._expiry_heap,
+                (session.last_accessed + self.max_age_seconds, session_id)
+            )
+        return session
 
     def get_session(self, session_id: str) -> Optional[Session]:
         """
@@ -69,19 +105,18 @@ class SessionManager:
         Returns:
             Session or None if not found/expired
         """
-        with self.lock:
-            session = self.sessions.get(session_id)
+        session = self.sessions.get(session_id)
 
-            if not session:
-                return None
+        if not session:
+            return None
 
-            if session.is_expired(self.max_age_hours):
-                # Clean up expired session
-                del self.sessions[session_id]
-                return None
+        if session.is_expired(self.max_age_hours):
+            # Clean up expired session
+            self._evict(session_id, session)
+            return None
 
-            session.touch()
-            return session
+        session.touch()
+        return session
 
     def update_session(self, session_id: str, **kwargs):
         """
@@ -91,7 +126,7 @@ class SessionManager:
             session_id: Session ID
             **kwargs: Attributes to update
         """
-        with self.lock:
+        with self._lock_for(session_id):
             session = self.sessions.get(session_id)
             if session:
                 for key, value in kwargs.items():
@@ -101,22 +136,253 @@ class SessionManager:
 
     def delete_session(self, session_id: str):
         """Delete a session"""
-        with self.lock:
-            if session_id in self.sessions:
-                del self.sessions[session_id]
+        with self._lock_for(session_id):
+            self.sessions.pop(session_id, None)
 
     def cleanup_expired(self):
-        """Remove all expired sessions"""
-        with self.lock:
-            expired = [
-                sid for sid, session in self.sessions.items()
-                if session.is_expired(self.max_age_hours)
-            ]
-            for sid in expired:
-                del self.sessions[sid]
-            return len(expired)
+        """
+        Remove all expired sessions
+
+        Only sessions whose recorded expiry has passed are looked at. A
+        session touched since then is pushed back with its new expiry.
+        """
+        max_age = self.max_age_seconds
+        now = time.monotonic()
+        expired = []
+
+        with self._heap_lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now:
+                _, sid = heapq.heappop(heap)
+                session = self.sessions.get(sid)
+                if session is None:
+                    continue  # already deleted
+
+                expires_at = session.last_accessed + max_age
+                if expires_at > now:
+                    heapq.heappush(heap, (expires_at, sid))
+                else:
+                    expired.append((sid, session))
+
+        for sid, session in expired:
+            self._evict(sid, session)
+        return len(expired)
+
+    def start_sweeper(self, interval_seconds: float = 60.0):
+        """
+        Periodically remove expired sessions in the background
+
+        Expired sessions are otherwise only dropped when someone asks for
+        them again, so abandoned ones (and their pipelines) would pile up.
+        Under gevent's monkey patching this runs as a greenlet.
+
+        Args:
+            interval_seconds: Time between sweeps
+        """
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+
+        def _loop():
+            while not self._stop_sweeper.wait(interval_seconds):
+                self.cleanup_expired()
+
+        self._stop_sweeper.clear()
+        self._sweeper = Thread(target=_loop, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        """Stop the background sweeper"""
+        self._stop_sweeper.set()
 
     def get_session_count(self) -> int:
         """Get number of active sessions"""
-        with self.lock:
-            return len(self.sessions)
+        return len(self.sessions)
+
+
+class RedisSessionManager:
+    """
+    Session manager backed by Redis, so any worker process can serve any session
+
+    Plain session fields are stored in a Redis hash per session with a
+    sliding expiry. The rover instance holds a live pipeline and can't be
+    serialized, so it is kept in a small per-process LRU keyed by arxiv_id;
+    a worker that misses it rebuilds it from the paper cache.
+
+    Requires the optional `redis` package.
+    """
+
+    # Session attributes persisted in Redis (everything except rover_instance)
+    FIELDS = (
+        "paper_info", "repo_path", "is_initialized", "initialization_error",
+        "awaiting_paper_selection", "paper_options", "original_query", "search_mode",
+    )
+
+    def __init__(self, redis_url: str, max_age_hours: int = 2, rover_cache_size: int = 16):
+        import redis
+
+        self.redis = redis.Redis.from_url(redis_url)
+        self.max_age_hours = max_age_hours
+        self.ttl_seconds = int(max_age_hours * 3600)
+        self.rover_cache_size = rover_cache_size
+        self._rovers: "OrderedDict[str, Any]" = OrderedDict()
+        self._rovers_lock = Lock()
+        # (monotonic timestamp, count) from the last SCAN
+        self._count_snapshot = (0.0, 0)
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"sess:{session_id}"
+
+    def _get_rover(self, arxiv_id: Optional[str]):
+        if not arxiv_id:
+            return None
+        with self._rovers_lock:
+            rover = self._rovers.get(arxiv_id)
+            if rover is not None:
+                self._rovers.move_to_end(arxiv_id)
+            return rover
+
+    def _put_rover(self, arxiv_id: Optional[str], rover):
+        if not arxiv_id or rover is None:
+            return
+        with self._rovers_lock:
+            self._rovers[arxiv_id] = rover
+            self._rovers.move_to_end(arxiv_id)
+            while len(self._rovers) > self.rover_cache_size:
+                self._rovers.popitem(last=False)
+
+    def create_session(self) -> Session:
+        """
+        Create a new session
+
+        Returns:
+            The new Session (its ID is session.session_id)
+        """
+        session_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        key = self._key(session_id)
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping={"created_at": now, "last_accessed": now})
+        pipe.expire(key, self.ttl_seconds)
+        pipe.execute()
+        return Session(session_id)
+
+    def get_session(self, session_id: str) -> Optional[Session]:
+        """
+        Get session by ID (refreshes its expiry)
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            Session or None if not found/expired
+        """
+        key = self._key(session_id)
+        data = self.redis.hgetall(key)
+        if not data:
+            return None
+
+        now = datetime.now()
+        pipe = self.redis.pipeline()
+        pipe.hset(key, "last_accessed", now.isoformat())
+        pipe.expire(key, self.ttl_seconds)
+        pipe.execute()
+
+        session = Session(session_id)
+        created_at = data.get(b"created_at")
+        if created_at:
+            session.created_at = datetime.fromisoformat(created_at.decode())
+        session.last_accessed = time.monotonic()
+
+        for field in self.FIELDS:
+            raw = data.get(field.encode())
+            if raw is not None:
+                setattr(session, field, orjson.loads(raw))
+
+        if session.repo_path:
+            session.repo_path = Path(session.repo_path)
+
+        arxiv_id = (session.paper_info or {}).get("arxiv_id")
+        session.rover_instance = self._get_rover(arxiv_id)
+        return session
+
+    def update_session(self, session_id: str, **kwargs):
+        """
+        Update session attributes
+
+        Args:
+            session_id: Session ID
+            **kwargs: Attributes to update
+        """
+        key = self._key(session_id)
+        if not self.redis.exists(key):
+            return
+
+        rover = kwargs.pop("rover_instance", None)
+        if rover is not None:
+            paper_info = kwargs.get("paper_info") or getattr(rover, "paper_info", None) or {}
+            self._put_rover(paper_info.get("arxiv_id"), rover)
+
+        mapping = {
+            field: orjson.dumps(value, default=str)
+            for field, value in kwargs.items()
+            if field in self.FIELDS
+        }
+        mapping["last_accessed"] = datetime.now().isoformat()
+
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, self.ttl_seconds)
+        pipe.execute()
+
+    def delete_session(self, session_id: str):
+        """Delete a session"""
+        self.redis.delete(self._key(session_id))
+
+    def cleanup_expired(self):
+        """Expiry is handled by Redis key TTLs"""
+        return 0
+
+    def start_sweeper(self, interval_seconds: float = 60.0):
+        """No-op: Redis expires sessions itself"""
+
+    def stop_sweeper(self):
+        """No-op: Redis expires sessions itself"""
+
+    def get_session_count(self, max_staleness: float = 5.0) -> int:
+        """
+        Get number of active sessions
+
+        Counting needs a full SCAN of the keyspace, so the result is reused
+        for a few seconds; health checks and metrics scrapes don't need it exact.
+
+        Args:
+            max_staleness: Seconds a previous count may be reused for
+
+        Returns:
+            Approximate number of live sessions
+        """
+        taken_at, count = self._count_snapshot
+        now = time.monotonic()
+        if taken_at and now - taken_at < max_staleness:
+            return count
+
+        count = sum(1 for _ in self.redis.scan_iter(match=self._key("*"), count=1000))
+        self._count_snapshot = (now, count)
+        return count
+
+
+def create_session_manager(max_age_hours: int = 2, redis_url: Optional[str] = None):
+    """
+    Build the session manager for this process
+
+    Args:
+        max_age_hours: Session lifetime since last access
+        redis_url: If set, share sessions between workers via Redis
+
+    Returns:
+        RedisSessionManager when redis_url is given, else an in-process SessionManager
+    """
+    if redis_url:
+        return RedisSessionManager(redis_url, max_age_hours=max_age_hours)
+    return SessionManager(max_age_hours=max_age_hours)
@@ -4,7 +4,10 @@ Deploys the paper analysis system as a discoverable agent
 """
 from uagents import Agent, Context, Model
 from typing import Optional, List, Dict, Any
+import asyncio
+import re
 import sys
+from functools import lru_cache
 import os
 from pathlib import Path
 
@@ -12,15 +15,21 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from session_manager import SessionManager
+from rover import RoverInstance
 from utils.config import Config
 from utils.paper_cache import get_cache
+from utils.ttl_cache import TTLCache
 from utils.repo_utils import RepoAnalyzer
 from discovery.paper_finder import PaperFinder
 from discovery.repo_finder import RepoFinder
+from understanding.chroma_client import ChromaClientWrapper
 from understanding.code_indexer import ChromaIndexer
 from understanding.gemini_synthesizer import GeminiSynthesizer
 from understanding.query_pipeline import QueryPipeline
 
+# New-style (2403.12345, 2403.12345v2) and old-style (cs/0601001) ArXiv IDs
+_ARXIV_ID_RE = re.compile(r'^\d{4}\.\d{4,5}(v\d+)?$|^[a-z\-]+(\.[A-Z]{2})?/\d{7}(v\d+)?$')
+
 # Message Models
 
 # === Phase 1: Paper Search ===
@@ -120,11 +129,36 @@ paper_finder: Optional[PaperFinder] = None
 repo_finder: Optional[RepoFinder] = None
 cache = None
 
+# Bound session_manager methods for the message handlers, set in startup
+_get_session = None
+_update_session = None
+
+
+@lru_cache(maxsize=None)
+def _chroma_client() -> ChromaClientWrapper:
+    """Shared ChromaDB client (one database connection per process)"""
+    return ChromaClientWrapper(
+        persist_directory=Config.CHROMA_PATH,
+        cloud_api_key=Config.CHROMA_CLOUD_API_KEY,
+        cloud_host=Config.CHROMA_CLOUD_HOST
+    )
+
+
+# arxiv_id -> RoverInstance; pipelines are stateless per question, so
+# sessions on the same paper can share one
+_pipeline_cache = TTLCache(maxsize=32, ttl=2 * 3600)
+
+
+@lru_cache(maxsize=None)
+def _repo_analyzer() -> RepoAnalyzer:
+    """Shared repository analyzer"""
+    return RepoAnalyzer(Config.REPO_CLONE_DIR)
+
 
 @agent.on_event("startup")
 async def startup(ctx: Context):
     """Initialize ArXini Agent components"""
-    global session_manager, paper_finder, repo_finder, cache
+    global session_manager, paper_finder, repo_finder, cache, _get_session, _update_session
     
     ctx.logger.info("=" * 60)
     ctx.logger.info("Initializing ArXini Agent...")
@@ -136,6 +170,8 @@ async def startup(ctx: Context):
         
         # Initialize core components
         session_manager = SessionManager(max_age_hours=2)
+        _get_session = session_manager.get_session
+        _update_session = session_manager.update_session
         paper_finder = PaperFinder()
         repo_finder = RepoFinder()
         cache = get_cache()
@@ -169,15 +205,17 @@ async def handle_search_paper(ctx: Context, sender: str, msg: SearchPaperRequest
     
     try:
         # Create a new session for this user
-        session_id = session_manager.create_session()
-        session = session_manager.get_session(session_id)
+        session = session_manager.create_session()
+        session_id = session.session_id
         
         ctx.logger.info(f"✓ Created session: {session_id[:8]}...")
         
         # Determine if query is direct ArXiv ID
-        if msg.query.strip().replace('.', '').replace('v', '').isdigit():
+        # IDs are short and never contain spaces; reject sentences before the regex
+        query = msg.query.strip()
+        if len(query) <= 20 and ' ' not in query and _ARXIV_ID_RE.match(query):
             # Direct ArXiv ID - no search needed
-            arxiv_id = msg.query.strip()
+            arxiv_id = query
             ctx.logger.info(f"✓ Direct ArXiv ID detected: {arxiv_id}")
             
             response = SearchPaperResponse(
@@ -195,7 +233,7 @@ async def handle_search_paper(ctx: Context, sender: str, msg: SearchPaperRequest
             )
             
             # Store the selection
-            session_manager.update_session(session_id,
+            _update_session(session_id,
                 awaiting_paper_selection=False,
                 paper_options=None,
                 original_query=msg.query
@@ -234,7 +272,7 @@ async def handle_search_paper(ctx: Context, sender: str, msg: SearchPaperRequest
                 ctx.logger.info(f"✓ Found {len(options)} papers")
                 
                 # Store in session
-                session_manager.update_session(session_id,
+                _update_session(session_id,
                     awaiting_paper_selection=True,
                     paper_options=results,
                     original_query=msg.query
@@ -270,7 +308,7 @@ async def handle_select_paper(ctx: Context, sender: str, msg: SelectPaperRequest
     ctx.logger.info(f"📌 Selection request: session={msg.session_id[:8]}..., choice={msg.selection}")
     
     try:
-        session = session_manager.get_session(msg.session_id)
+        session = _get_session(msg.session_id)
         
         if not session:
             await ctx.send(sender, Response(
@@ -301,7 +339,7 @@ async def handle_select_paper(ctx: Context, sender: str, msg: SelectPaperRequest
         ctx.logger.info(f"✓ Selected: {selected_paper.get('title', '')[:50]}...")
         
         # Update session
-        session_manager.update_session(msg.session_id,
+        _update_session(msg.session_id,
             awaiting_paper_selection=False,
             paper_options=None
         )
@@ -334,7 +372,7 @@ async def handle_init_paper(ctx: Context, sender: str, msg: InitPaperRequest):
     ctx.logger.info(f"🚀 Init request: session={msg.session_id[:8]}..., arxiv={msg.arxiv_id}")
     
     try:
-        session = session_manager.get_session(msg.session_id)
+        session = _get_session(msg.session_id)
         
         if not session:
             await ctx.send(sender, InitPaperResponse(
@@ -351,6 +389,11 @@ async def handle_init_paper(ctx: Context, sender: str, msg: InitPaperRequest):
         cached_paper = cache.get(arxiv_id)
         from_cache = cached_paper is not None
         
+        # One indexer per pipeline (it tracks the active collection), on top
+        # of the shared client
+        chroma = ChromaIndexer(client=_chroma_client())
+        repo_analyzer = _repo_analyzer()
+        
         if from_cache:
             ctx.logger.info(f"✓ Cache HIT for {arxiv_id}")
             
@@ -361,19 +404,21 @@ async def handle_init_paper(ctx: Context, sender: str, msg: InitPaperRequest):
                 "authors": cached_paper.get("authors", []),
                 "summary": cached_paper.get("summary", ""),
                 "pdf_url": cached_paper.get("pdf_url", ""),
+                "pdf_path": cached_paper.get("pdf_path"),
                 "published": ""
             }
             
             repo_path = Path(cached_paper.get("repo_path", ""))
             collection_name = cached_paper.get("chroma_collection", arxiv_id)
             indexed_files = cached_paper.get("chroma_file_count", 0)
+            index_task = None
             
         else:
             ctx.logger.info(f"✓ Cache MISS for {arxiv_id} - Full pipeline")
             
             # Step 1: Get paper info
             ctx.logger.info("📄 Fetching paper from ArXiv...")
-            paper_info_raw = paper_finder.get_paper_by_id(arxiv_id)
+            paper_info_raw = await asyncio.to_thread(paper_finder.get_paper_by_id, arxiv_id)
             
             if not paper_info_raw:
                 await ctx.send(sender, InitPaperResponse(
@@ -384,12 +429,13 @@ async def handle_init_paper(ctx: Context, sender: str, msg: InitPaperRequest):
                 ))
                 return
             
-            # Download PDF
-            pdf_path = paper_finder.download_paper(paper_info_raw)
+            # Download PDF (the repo finder scans it, so this has to finish first)
+            pdf_path = await asyncio.to_thread(paper_finder.download_paper, paper_info_raw)
+            paper_info_raw["pdf_path"] = str(pdf_path) if pdf_path else None
             
             # Step 2: Find repository
             ctx.logger.info("🔍 Finding GitHub repository...")
-            repo_url = repo_finder.find_with_fallback(paper_info_raw)
+            repo_url = await asyncio.to_thread(repo_finder.find_with_fallback, paper_info_raw)
             
             if not repo_url:
                 await ctx.send(sender, InitPaperResponse(
@@ -402,8 +448,7 @@ async def handle_init_paper(ctx: Context, sender: str, msg: InitPaperRequest):
             
             # Step 3: Clone repository
             ctx.logger.info(f"📥 Cloning repository: {repo_url}")
-            repo_analyzer = RepoAnalyzer(Config.REPO_CLONE_DIR)
-            repo_path = repo_analyzer.clone_repository(repo_url)
+            repo_path = await asyncio.to_thread(repo_analyzer.clone_repository, repo_url)
             
             if not repo_path:
                 await ctx.send(sender, InitPaperResponse(
@@ -414,14 +459,13 @@ async def handle_init_paper(ctx: Context, sender: str, msg: InitPaperRequest):
                 ))
                 return
             
-            # Step 4: Index code with ChromaDB
+            # Step 4: Index code with ChromaDB (overlaps with pipeline setup below)
             ctx.logger.info("🗂️  Indexing code with ChromaDB...")
-            chroma = ChromaIndexer()
             collection_name = arxiv_id
             chroma.set_collection(collection_name)
-            indexed_files = chroma.index_repository(repo_path, collection_name)
-            
-            ctx.logger.info(f"✓ Indexed {indexed_files} files")
+            index_task = asyncio.create_task(
+                asyncio.to_thread(chroma.index_repository, repo_path, collection_name)
+            )
             
             # Build paper_info
             paper_info = {
@@ -430,8 +474,43 @@ async def handle_init_paper(ctx: Context, sender: str, msg: InitPaperRequest):
                 "authors": paper_info_raw.get("authors", []),
                 "summary": paper_info_raw.get("summary", ""),
                 "pdf_url": paper_info_raw.get("pdf_url", ""),
+                "pdf_path": paper_info_raw.get("pdf_path"),
                 "published": paper_info_raw.get("published", "")
             }
+        
+        # Step 5: Initialize QueryPipeline
+        # Reuse a live pipeline for papers already initialized in this process
+        rover = _pipeline_cache.get(arxiv_id) if index_task is None else None
+        
+        if rover is not None:
+            ctx.logger.info(f"✓ Reusing initialized pipeline for {arxiv_id}")
+        else:
+            ctx.logger.info("🧠 Initializing query pipeline...")
+            
+            chroma.set_collection(collection_name)
+        
+            gemini = GeminiSynthesizer(Config.GEMINI_API_KEY, "gemini-2.5-pro")
+        
+            pipeline = QueryPipeline(chroma, gemini, paper_info, repo_path)
+        
+            # Load concept map if available
+            concept_map = cache.load_concept_map(arxiv_id)
+        
+            # Get repo structure (independent scans, run them together)
+            repo_structure, readme = await asyncio.gather(
+                asyncio.to_thread(repo_analyzer.get_repo_structure, repo_path),
+                asyncio.to_thread(repo_analyzer.get_readme_content, repo_path),
+            )
+        
+            await asyncio.to_thread(
+                pipeline.initialize, readme or "", repo_structure, concept_map=concept_map
+            )
+        
+            rover = RoverInstance(pipeline, paper_info, repo_path)
+        
+        if index_task is not None:
+            indexed_files = await index_task
+            ctx.logger.info(f"✓ Indexed {indexed_files} files")
             
             # Cache the result
             from datetime import datetime, timezone
@@ -441,7 +520,7 @@ async def handle_init_paper(ctx: Context, sender: str, msg: InitPaperRequest):
                 "authors": paper_info["authors"],
                 "summary": paper_info["summary"],
                 "pdf_url": paper_info["pdf_url"],
-                "pdf_path": str(pdf_path) if pdf_path else None,
+                "pdf_path": paper_info["pdf_path"],
                 "repo_url": repo_url,
                 "repo_path": str(repo_path),
                 "chroma_collection": collection_name,
@@ -449,47 +528,10 @@ async def handle_init_paper(ctx: Context, sender: str, msg: InitPaperRequest):
                 "chroma_file_count": indexed_files
             })
         
-        # Step 5: Initialize QueryPipeline
-        ctx.logger.info("🧠 Initializing query pipeline...")
-        
-        chroma = ChromaIndexer()
-        chroma.set_collection(collection_name)
-        
-        gemini = GeminiSynthesizer(Config.GEMINI_API_KEY, "gemini-2.5-pro")
-        
-        pipeline = QueryPipeline(chroma, gemini, paper_info, repo_path)
-        
-        # Load concept map if available
-        concept_map = cache.load_concept_map(arxiv_id)
-        
-        # Get repo structure
-        repo_analyzer = RepoAnalyzer(Config.REPO_CLONE_DIR)
-        repo_structure = repo_analyzer.get_repo_structure(repo_path)
-        readme = repo_analyzer.get_readme_content(repo_path)
-        
-        pipeline.initialize(readme or "", repo_structure, concept_map=concept_map)
-        
-        # Create RoverInstance wrapper
-        class RoverInstance:
-            def __init__(self, pipeline, paper_info, repo_path):
-                self.pipeline = pipeline
-                self.paper_info = paper_info
-                self.repo_path = repo_path
-
-            def query(self, question):
-                response = self.pipeline.query(question)
-                return {
-                    "success": True,
-                    "answer": response.get("answer", ""),
-                    "code_snippets": response.get("code_snippets", []),
-                    "confidence": response.get("confidence", "medium"),
-                    "num_sources": response.get("num_sources", 0)
-                }
-        
-        rover = RoverInstance(pipeline, paper_info, repo_path)
+        _pipeline_cache.set(arxiv_id, rover)
         
         # Store in session
-        session_manager.update_session(msg.session_id,
+        _update_session(msg.session_id,
             rover_instance=rover,
             paper_info=paper_info,
             repo_path=repo_path,
@@ -509,9 +551,7 @@ async def handle_init_paper(ctx: Context, sender: str, msg: InitPaperRequest):
         await ctx.send(sender, response)
         
     except Exception as e:
-        ctx.logger.error(f"❌ Init error: {e}")
-        import traceback
-        traceback.print_exc()
+        ctx.logger.exception(f"❌ Init error: {e}")
         
         await ctx.send(sender, InitPaperResponse(
             success=False,
@@ -529,7 +569,7 @@ async def handle_chat(ctx: Context, sender: str, msg: ChatRequest):
     ctx.logger.info(f"💬 Chat: session={msg.session_id[:8]}..., msg='{msg.message[:50]}...'")
     
     try:
-        session = session_manager.get_session(msg.session_id)
+        session = _get_session(msg.session_id)
         
         if not session:
             await ctx.send(sender, ChatResponse(
@@ -551,7 +591,7 @@ async def handle_chat(ctx: Context, sender: str, msg: ChatRequest):
         
         # Query the pipeline
         rover = session.rover_instance
-        result = rover.query(msg.message)
+        result = await rover.aquery(msg.message)
         
         ctx.logger.info(f"✓ Answer generated ({result.get('confidence', 'unknown')} confidence)")
         
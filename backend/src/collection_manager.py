@@ -10,10 +10,13 @@ Usage:
     from collection_manager import find_or_create_collection
     collection_name = find_or_create_collection("Attention Is All You Need")
 """
+import atexit
 import os
-from typing import Optional
+from threading import Lock
+from typing import Optional, Set
 from dotenv import load_dotenv
 from understanding.chroma_client import ChromaClientWrapper
+from utils.ttl_cache import TTLCache
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,17 +26,44 @@ CHROMA_PATH = os.getenv("CHROMA_PATH", "./chroma_db")
 CHROMA_CLOUD_API_KEY = os.getenv("CHROMA_CLOUD_API_KEY")
 CHROMA_CLOUD_HOST = os.getenv("CHROMA_CLOUD_HOST")
 
-# Initialize a shared client wrapper
+# Shared client wrapper, created on first use so importing this module
+# doesn't open the database (and load its indexes) for callers that never query
 _chroma_client: Optional[ChromaClientWrapper] = None
-try:
-    _chroma_client = ChromaClientWrapper(
-        persist_directory=CHROMA_PATH,
-        cloud_api_key=CHROMA_CLOUD_API_KEY,
-        cloud_host=CHROMA_CLOUD_HOST
-    )
-except Exception as e:
-    print(f"Warning: Could not initialize ChromaDB client: {e}")
-    _chroma_client = None
+_client_failed = False
+_client_lock = Lock()
+
+
+def _get_client() -> Optional[ChromaClientWrapper]:
+    """Get the shared ChromaDB client, creating it on first call"""
+    global _chroma_client, _client_failed
+
+    if _chroma_client is not None or _client_failed:
+        return _chroma_client
+
+    with _client_lock:
+        if _chroma_client is None and not _client_failed:
+            try:
+                _chroma_client = ChromaClientWrapper(
+                    persist_directory=CHROMA_PATH,
+                    cloud_api_key=CHROMA_CLOUD_API_KEY,
+                    cloud_host=CHROMA_CLOUD_HOST
+                )
+                atexit.register(_chroma_client.close)
+            except Exception as e:
+                print(f"Warning: Could not initialize ChromaDB client: {e}")
+                _client_failed = True
+
+    return _chroma_client
+
+# Collections known to hold documents. A non-empty collection only becomes
+# empty again through delete_collection, so these are kept until then.
+_populated: Set[str] = set()
+_populated_lock = Lock()
+
+# Collections recently seen empty. Indexing can fill one at any time, so
+# these expire quickly and indexers call invalidate() when they finish.
+EMPTY_COUNT_TTL_SECONDS = 60
+_empty = TTLCache(maxsize=1024, ttl=EMPTY_COUNT_TTL_SECONDS)
 
 
 def collection_has_documents(collection_name: str) -> bool:
@@ -46,15 +76,42 @@ def collection_has_documents(collection_name: str) -> bool:
     Returns:
         bool: True if collection has documents, False otherwise
     """
-    if not _chroma_client:
+    client = _get_client()
+    if not client:
+        return False
+
+    if collection_name in _populated:
+        return True
+    if _empty.get(collection_name):
         return False
 
     try:
-        count = _chroma_client.get_collection_count(collection_name)
-        return count > 0
+        count = client.get_collection_count(collection_name)
     except Exception:
         return False
 
+    if count > 0:
+        with _populated_lock:
+            _populated.add(collection_name)
+        return True
+
+    _empty.set(collection_name, True)
+    return False
+
+
+def invalidate(collection_name: str):
+    """
+    Forget what collection_has_documents knows about a collection
+
+    Call after indexing into it or deleting it.
+
+    Args:
+        collection_name: Collection name
+    """
+    _empty.pop(collection_name)
+    with _populated_lock:
+        _populated.discard(collection_name)
+
 
 def find_or_create_collection(collection_name: str) -> Optional[str]:
     """
@@ -66,30 +123,23 @@ def find_or_create_collection(collection_name: str) -> Optional[str]:
     Returns:
         str: The collection name, or None if creation failed
     """
-    if not _chroma_client:
+    client = _get_client()
+    if not client:
         print("ERROR: ChromaDB client not initialized. Check CHROMA_PATH in .env")
         return None
 
     print(f"Checking for existing collection: '{collection_name}'...")
 
     try:
-        # List existing collections
-        existing = _chroma_client.list_collections()
-
-        # Check if collection already exists
-        for collection in existing:
-            if collection.get("name") == collection_name:
-                print(f"✓ Found existing collection '{collection_name}' with {collection.get('count', 0)} documents")
-                return collection_name
-
-        # Not found, create new collection
+        # Idempotent on the server: returns the existing collection if there is one,
+        # so no need to list (and count) every collection first
         metadata = {
             "description": f"Code repository for research paper: {collection_name}",
             "type": "code_repository"
         }
 
-        _chroma_client.get_or_create_collection(collection_name, metadata=metadata)
-        print(f"✓ Successfully created collection: {collection_name}")
+        client.get_or_create_collection(collection_name, metadata=metadata)
+        print(f"✓ Collection ready: {collection_name}")
         return collection_name
 
     except Exception as e:
@@ -107,12 +157,15 @@ def delete_collection(collection_name: str) -> bool:
     Returns:
         bool: True if successful, False otherwise
     """
-    if not _chroma_client:
+    client = _get_client()
+    if not client:
         print("ERROR: ChromaDB client not initialized")
         return False
 
+    invalidate(collection_name)
+
     try:
-        success = _chroma_client.delete_collection(collection_name)
+        success = client.delete_collection(collection_name)
         if success:
             print(f"✓ Successfully deleted collection: {collection_name}")
         return success
@@ -121,19 +174,32 @@ def delete_collection(collection_name: str) -> bool:
         return False
 
 
-def list_all_collections() -> list:
+def list_all_collections(
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    with_counts: bool = True
+) -> list:
     """
-    List all available collections
+    List available collections, optionally one page at a time
+
+    Each counted collection costs a count() round trip, so pass a limit
+    or with_counts=False when the database holds many papers.
+
+    Args:
+        limit: Maximum number of collections to return (all if None)
+        offset: Number of collections to skip
+        with_counts: Include each collection's document count
 
     Returns:
         list: List of collection metadata dictionaries
     """
-    if not _chroma_client:
+    client = _get_client()
+    if not client:
         print("ERROR: ChromaDB client not initialized")
         return []
 
     try:
-        return _chroma_client.list_collections()
+        return client.list_collections(limit=limit, offset=offset, with_counts=with_counts)
     except Exception as e:
         print(f"Error listing collections: {e}")
         return []
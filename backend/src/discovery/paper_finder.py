@@ -4,9 +4,19 @@ Handles Gemini SDK 2024/2025+ schema (no AttributeError: 'NoneType' object has n
 """
 
 import arxiv
+import asyncio
+import hashlib
+import io
+import logging
 import os
-import json
+import requests
+import orjson
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from operator import attrgetter
+from threading import Lock, get_ident
 from pathlib import Path
 from typing import Optional, Dict, List
 from rich.console import Console
@@ -14,25 +24,74 @@ from rich.table import Table
 from google import genai
 from google.genai import types
 from utils.config import Config
+from utils.http_session import get_http_session
+from utils.ttl_cache import TTLCache
 
 console = Console()
+logger = logging.getLogger(__name__)
+
+# ArXiv responses are reused for this long before asking the API again
+ARXIV_CACHE_TTL_SECONDS = 600
+ARXIV_CACHE_MAX_ENTRIES = 2048
+ARXIV_PAGE_SIZE = 10
+
+# Parsed paper metadata changes at most daily (ArXiv publishes once a day)
+PAPER_CACHE_TTL_SECONDS = 24 * 3600
+
+# Parallel PDF downloads (PDFs come from the arxiv.org CDN, not the rate-limited API)
+PDF_DOWNLOAD_WORKERS = 4
+PDF_CHUNK_SIZE = 64 * 1024
+
+# Keys of a paper info dict, in display order
+PAPER_FIELDS = (
+    "title", "arxiv_id", "authors", "summary", "published",
+    "pdf_url", "primary_category", "categories", "entry_id",
+)
+
+_name = attrgetter("name")
+_VERSION_RE = re.compile(r"v\d+$")
+_FENCE_RE = re.compile(r"^```(json)?|```$", re.MULTILINE)
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
 
 
 class PaperFinder:
     """Find and download papers from ArXiv with Gemini-based online search fallback."""
 
-    def __init__(self, download_dir: Optional[Path] = None):
+    def __init__(self, download_dir: Optional[Path] = None, session: Optional[requests.Session] = None):
         self.download_dir = download_dir or Path("./papers")
         self.download_dir.mkdir(parents=True, exist_ok=True)
-        self.client = arxiv.Client()
+        # arxiv.Client asks the API for page_size entries per request whatever
+        # max_results is; searches here want a handful, so keep pages small
+        self.client = arxiv.Client(
+            page_size=ARXIV_PAGE_SIZE,
+            delay_seconds=3,
+            num_retries=3,
+        )
+        # Pooled keep-alive session (with 429/5xx backoff) for ArXiv API calls
+        # and direct PDF downloads
+        self.http = session or get_http_session()
+        self.client._session = self.http
+
+        # (query, id_list, max_results, sort) -> (fetched_at, results)
+        self._arxiv_cache: Dict[tuple, tuple] = {}
+        self._arxiv_cache_lock = Lock()
+        # arxiv.Client spaces requests by delay_seconds, but only if calls
+        # don't overlap; serialize them so bursts stay under the rate limit
+        self._arxiv_lock = Lock()
+
+        # Parsed results of search_paper / get_paper_by_id
+        self._search_cache = TTLCache(maxsize=512, ttl=PAPER_CACHE_TTL_SECONDS)
+        self._paper_cache = TTLCache(maxsize=512, ttl=PAPER_CACHE_TTL_SECONDS)
+        # Same results on disk, so they survive restarts
+        self._disk_cache_dir = self.download_dir / ".arxiv_cache"
 
         # Gemini setup
         try:
             api_key = os.getenv("GEMINI_API_KEY")
             if api_key:
                 self.genai_client = genai.Client(api_key=api_key)
-                # Use the globally configured model (defaults to gemini-2.5-flash)
-                self.gemini_model_name = getattr(Config, 'GEMINI_MODEL', 'gemini-2.5-flash')
+                # Search needs only a Flash model (defaults to gemini-2.5-flash)
+                self.gemini_model_name = getattr(Config, 'GEMINI_SEARCH_MODEL', 'gemini-2.5-flash')
                 console.print(f"[green]Gemini initialized with model {self.gemini_model_name}[/green]")
             else:
                 self.genai_client = None
@@ -47,13 +106,14 @@ class PaperFinder:
     # DEBUG HELPERS
     # ---------------------------------------------------------------------- #
     def _debug_response_shape(self, resp):
-        """Prints full response attribute tree and sample values for SDK debugging."""
+        """Logs the response attribute tree and sample values for SDK debugging (DEBUG level)."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         try:
-            console.rule("[bold cyan]Gemini Response Debug[/bold cyan]")
             attrs = [a for a in dir(resp) if not a.startswith("_")]
-            console.print(f"[dim]Attributes ({len(attrs)}): {attrs}[/dim]")
+            logger.debug("Gemini response attributes (%d): %s", len(attrs), attrs)
 
-            # Print sample of top-level fields
+            # Log a sample of top-level fields
             for key in ["text", "output_text", "json", "candidates"]:
                 if hasattr(resp, key):
                     val = getattr(resp, key)
@@ -61,10 +121,9 @@ class PaperFinder:
                         val_preview = str(val)[:400]
                     else:
                         val_preview = repr(val)[:400]
-                    console.print(f"[blue]{key}[/blue]: {val_preview}")
-            console.rule()
+                    logger.debug("Gemini response %s: %s", key, val_preview)
         except Exception as e:
-            console.print(f"[red]Error inspecting response: {e}[/red]")
+            logger.debug("Error inspecting response: %s", e)
 
     def _extract_text_from_gemini(self, response) -> Optional[str]:
         """Extracts textual content safely across SDK variants."""
@@ -94,7 +153,7 @@ class PaperFinder:
                 if isinstance(j, str):
                     candidates.append(j)
                 elif isinstance(j, dict):
-                    candidates.append(json.dumps(j))
+                    candidates.append(orjson.dumps(j).decode())
             except Exception:
                 pass
 
@@ -107,6 +166,77 @@ class PaperFinder:
     # ---------------------------------------------------------------------- #
     # GEMINI SEARCH
     # ---------------------------------------------------------------------- #
+    def _gemini_search_request(self, query: str) -> tuple:
+        """Build the (prompt, config) pair for a Gemini paper search."""
+        prompt = (
+            f'Find 3 research papers about "{query}", preferring ArXiv. '
+            'Reply with only a JSON array of '
+            '{"title": str, "authors": [2-3 names], "arxiv_url": "https://arxiv.org/abs/..."}.'
+        )
+
+        # 1. Define the Google Search tool instance
+        search_tool = types.Tool(google_search=types.GoogleSearch())
+
+        # 2. Add the search tool to the GenerateContentConfig
+        config = types.GenerateContentConfig(
+            temperature=0.1,
+            max_output_tokens=4096,
+            # FIX: Add the tools array to enable Grounding
+            tools=[search_tool],
+        )
+        return prompt, config
+
+    def _parse_gemini_papers(self, raw_text: Optional[str]) -> Optional[List[Dict]]:
+        """Turn Gemini's text answer into paper option dicts."""
+        if not raw_text:
+            console.print("[red]Gemini returned no textual content.[/red]")
+            return None
+
+        # Clean markdown fences or extra text
+        cleaned = raw_text
+        if cleaned.startswith("```"):
+            cleaned = _FENCE_RE.sub("", cleaned).strip()
+
+        json_match = _JSON_ARRAY_RE.search(cleaned)
+        if json_match:
+            cleaned = json_match.group(0)
+
+        try:
+            papers = orjson.loads(cleaned)
+        except orjson.JSONDecodeError:
+            console.print("[red]Failed to parse JSON from Gemini response[/red]")
+            console.print(f"[dim]Raw (first 500 chars): {cleaned[:500]}[/dim]")
+            return None
+
+        if not isinstance(papers, list):
+            console.print(f"[yellow]Gemini returned non-list JSON: {type(papers)}[/yellow]")
+            return None
+
+        parsed = []
+        for p in papers:
+            if not isinstance(p, dict):
+                continue
+            url = p.get("arxiv_url", "")
+            if not url or "arxiv.org" not in url:
+                continue
+            parsed.append(
+                {
+                    "title": p.get("title", "Untitled"),
+                    "authors": p.get("authors", []),
+                    "arxiv_id": self.extract_arxiv_id(url),
+                    "pdf_url": url.replace("/abs/", "/pdf/") + ".pdf"
+                    if "/abs/" in url
+                    else url,
+                    "entry_id": url,
+                }
+            )
+
+        if parsed:
+            console.print(f"[green]✓ Found {len(parsed)} papers via Gemini search[/green]")
+        else:
+            console.print("[yellow]No valid papers found in Gemini output[/yellow]")
+        return parsed or None
+
     def _search_online_with_gemini(self, query: str) -> Optional[List[Dict]]:
         """Use Gemini to find related academic papers."""
         if not self.genai_client:
@@ -115,110 +245,149 @@ class PaperFinder:
 
         console.print(f"\n[bold cyan]Performing online search with Gemini for:[/bold cyan] {query}")
 
-        prompt = f"""
-Search for academic papers about: "{query}"
+        try:
+            prompt, config = self._gemini_search_request(query)
 
-Find 3 relevant research papers, prioritizing those on ArXiv.
+            # 3. The API call now uses the config with the search tool enabled.
+            # Stream it so text is collected while the rest is still generating
+            buffer = io.StringIO()
+            last_chunk = None
+            for chunk in self.genai_client.models.generate_content_stream(
+                model=self.gemini_model_name,
+                contents=prompt,
+                config=config,
+            ):
+                last_chunk = chunk
+                if chunk.text:
+                    buffer.write(chunk.text)
 
-Return ONLY a JSON array, each element containing:
-- title
-- authors (2–3 names)
-- arxiv_url
+            # Response structure for SDK debugging (no-op unless DEBUG logging)
+            self._debug_response_shape(last_chunk)
 
-Example output:
-[
-  {{
-    "title": "Paper Title Here",
-    "authors": ["Author One", "Author Two"],
-    "arxiv_url": "https://arxiv.org/abs/1234.56789"
-  }}
-]
-"""
+            raw_text = buffer.getvalue().strip() or self._extract_text_from_gemini(last_chunk)
+            return self._parse_gemini_papers(raw_text)
 
-        try:
-            # 1. Define the Google Search tool instance
-            search_tool = types.Tool(google_search=types.GoogleSearch())
-            
-            # 2. Add the search tool to the GenerateContentConfig
-            config = types.GenerateContentConfig(
-                temperature=0.1,
-                max_output_tokens=4096,
-                # FIX: Add the tools array to enable Grounding
-                tools=[search_tool],
-            )
+        except Exception as e:
+            console.print(f"[red]Gemini search error: {e}[/red]")
+            import traceback
+
+            console.print(traceback.format_exc())
+            return None
+
+    async def _search_online_with_gemini_async(self, query: str) -> Optional[List[Dict]]:
+        """Async variant of _search_online_with_gemini (uses the aio client)."""
+        if not self.genai_client:
+            return None
+
+        console.print(f"\n[bold cyan]Performing online search with Gemini for:[/bold cyan] {query}")
 
-            # 3. The API call now uses the config with the search tool enabled
-            response = self.genai_client.models.generate_content(
+        try:
+            prompt, config = self._gemini_search_request(query)
+            response = await self.genai_client.aio.models.generate_content(
                 model=self.gemini_model_name,
                 contents=prompt,
                 config=config,
             )
+            return self._parse_gemini_papers(self._extract_text_from_gemini(response))
+        except Exception as e:
+            console.print(f"[red]Gemini search error: {e}[/red]")
+            return None
 
-            # Always print structure once for debugging
-            self._debug_response_shape(response)
-
-            raw_text = self._extract_text_from_gemini(response)
-            if not raw_text:
-                console.print("[red]Gemini returned no textual content.[/red]")
-                return None
+    # ---------------------------------------------------------------------- #
+    # ARXIV FUNCTIONS
+    # ---------------------------------------------------------------------- #
+    def _disk_cache_path(self, key: str) -> Path:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return self._disk_cache_dir / f"{digest}.json"
 
-            # Clean markdown fences or extra text
-            cleaned = raw_text
-            if cleaned.startswith("```"):
-                cleaned = re.sub(r"^```(json)?|```$", "", cleaned, flags=re.MULTILINE).strip()
+    def _disk_cache_get(self, key: str):
+        """Load parsed ArXiv results saved less than PAPER_CACHE_TTL_SECONDS ago"""
+        path = self._disk_cache_path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return None
 
-            json_match = re.search(r"\[.*\]", cleaned, re.DOTALL)
-            if json_match:
-                cleaned = json_match.group(0)
+        if time.time() - entry.get("ts", 0) >= PAPER_CACHE_TTL_SECONDS:
+            return None
 
-            try:
-                papers = json.loads(cleaned)
-            except json.JSONDecodeError:
-                console.print("[red]Failed to parse JSON from Gemini response[/red]")
-                console.print(f"[dim]Raw (first 500 chars): {cleaned[:500]}[/dim]")
-                return None
+        data = entry.get("data")
+        for paper in data if isinstance(data, list) else [data]:
+            if isinstance(paper, dict) and isinstance(paper.get("published"), str):
+                paper["published"] = datetime.fromisoformat(paper["published"])
+        return data
 
-            if not isinstance(papers, list):
-                console.print(f"[yellow]Gemini returned non-list JSON: {type(papers)}[/yellow]")
-                return None
+    def _disk_cache_set(self, key: str, data):
+        """Save parsed ArXiv results; failures only cost a future cache miss"""
+        path = self._disk_cache_path(key)
+        try:
+            self._disk_cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps({"ts": time.time(), "data": data}))
+            os.replace(tmp_path, path)
+        except (OSError, orjson.JSONEncodeError) as e:
+            console.print(f"[yellow]Could not write ArXiv cache: {e}[/yellow]")
+
+    def _fetch_results(self, search: arxiv.Search) -> List[arxiv.Result]:
+        """
+        Run an ArXiv search through a short-lived response cache
 
-            parsed = []
-            for p in papers:
-                if not isinstance(p, dict):
-                    continue
-                url = p.get("arxiv_url", "")
-                if not url or "arxiv.org" not in url:
-                    continue
-                parsed.append(
-                    {
-                        "title": p.get("title", "Untitled"),
-                        "authors": p.get("authors", []),
-                        "arxiv_id": self.extract_arxiv_id(url),
-                        "pdf_url": url.replace("/abs/", "/pdf/") + ".pdf"
-                        if "/abs/" in url
-                        else url,
-                        "entry_id": url,
-                    }
-                )
+        Repeated searches within ARXIV_CACHE_TTL_SECONDS are served from
+        memory. If the API fails (e.g. 429 rate limiting), the last known
+        results for the same search are returned instead.
+        """
+        key = (search.query, tuple(search.id_list), search.max_results, str(search.sort_by))
 
-            if parsed:
-                console.print(f"[green]✓ Found {len(parsed)} papers via Gemini search[/green]")
-            else:
-                console.print("[yellow]No valid papers found in Gemini output[/yellow]")
-            return parsed or None
+        with self._arxiv_cache_lock:
+            hit = self._arxiv_cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < ARXIV_CACHE_TTL_SECONDS:
+            return hit[1]
 
+        try:
+            with self._arxiv_lock:
+                results = list(self.client.results(search))
         except Exception as e:
-            console.print(f"[red]Gemini search error: {e}[/red]")
-            import traceback
+            if hit is not None:
+                console.print(f"[yellow]ArXiv request failed ({e}), using cached results[/yellow]")
+                return hit[1]
+            raise
 
-            console.print(traceback.format_exc())
-            return None
+        with self._arxiv_cache_lock:
+            self._arxiv_cache.pop(key, None)
+            self._arxiv_cache[key] = (time.monotonic(), results)
+            while len(self._arxiv_cache) > ARXIV_CACHE_MAX_ENTRIES:
+                del self._arxiv_cache[next(iter(self._arxiv_cache))]
+
+        return results
+
+    def search_paper(self, query: str, max_results: int = 3, columnar: bool = False):
+        """
+        Search ArXiv directly.
+
+        Args:
+            query: Paper title or search terms
+            max_results: Maximum number of papers to return
+            columnar: Return one list per field ({"title": [...], ...})
+                instead of one dict per paper, for callers that only walk a few fields
+
+        Returns:
+            List of paper dicts (or a dict of columns), None if nothing found
+        """
+        cache_key = (query.strip().lower(), max_results)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            console.print(f"[green]✓ Using cached ArXiv results for: {query}[/green]")
+            return self._project(cached, columnar)
+
+        disk_key = f"search|{cache_key[0]}|{max_results}"
+        cached = self._disk_cache_get(disk_key)
+        if cached:
+            console.print(f"[green]✓ Using cached ArXiv results for: {query}[/green]")
+            self._search_cache.set(cache_key, cached)
+            return self._project(cached, columnar)
 
-    # ---------------------------------------------------------------------- #
-    # ARXIV FUNCTIONS
-    # ---------------------------------------------------------------------- #
-    def search_paper(self, query: str, max_results: int = 3) -> Optional[List[Dict]]:
-        """Search ArXiv directly."""
         try:
             console.print(f"[blue]Searching ArXiv for: {query}[/blue]")
             search = arxiv.Search(
@@ -226,36 +395,57 @@ Example output:
                 max_results=max_results,
                 sort_by=arxiv.SortCriterion.Relevance,
             )
-            results = list(self.client.results(search))
+            results = self._fetch_results(search)
             if not results:
                 search = arxiv.Search(
                     query=query,
                     max_results=max_results,
                     sort_by=arxiv.SortCriterion.Relevance,
                 )
-                results = list(self.client.results(search))
+                results = self._fetch_results(search)
             if not results:
                 return None
-            out = [
-                {
+            out = []
+            append = out.append
+            for r in results:
+                entry_id = r.entry_id
+                append({
                     "title": r.title,
-                    "arxiv_id": r.entry_id.split("/")[-1],
-                    "authors": [a.name for a in r.authors],
+                    "arxiv_id": entry_id.rsplit("/", 1)[-1],
+                    "authors": list(map(_name, r.authors)),
                     "summary": r.summary,
                     "published": r.published,
                     "pdf_url": r.pdf_url,
                     "primary_category": r.primary_category,
                     "categories": r.categories,
-                    "entry_id": r.entry_id,
-                }
-                for r in results
-            ]
+                    "entry_id": entry_id,
+                })
             console.print(f"[green]✓ Found {len(out)} papers on ArXiv[/green]")
-            return out
+            self._search_cache.set(cache_key, out)
+            self._disk_cache_set(disk_key, out)
+            return self._project(out, columnar)
         except Exception as e:
             console.print(f"[red]ArXiv search error: {e}[/red]")
             return None
 
+    @staticmethod
+    def _project(papers: List[Dict], columnar: bool):
+        """Copy cached papers out as rows, or as columns in a single pass"""
+        if not columnar:
+            return [dict(p) for p in papers]
+
+        columns = {field: [] for field in PAPER_FIELDS}
+        appends = [(field, columns[field].append) for field in PAPER_FIELDS]
+        for paper in papers:
+            for field, append in appends:
+                append(paper.get(field))
+        return columns
+
+    @staticmethod
+    def _row(columns: Dict[str, list], index: int) -> Dict:
+        """Paper dict at index of a columnar result"""
+        return {field: column[index] for field, column in columns.items()}
+
     def extract_arxiv_id(self, url_or_id: str) -> str:
         if not url_or_id.startswith("http"):
             return url_or_id
@@ -267,16 +457,79 @@ Example output:
             pdf_path = self.download_dir / f"{arxiv_id}.pdf"
             if pdf_path.exists():
                 return pdf_path
-            console.print(f"[blue]Downloading: {paper_info['pdf_url']}[/blue]")
-            search = arxiv.Search(id_list=[arxiv_id])
-            paper = next(self.client.results(search))
-            paper.download_pdf(dirpath=str(self.download_dir), filename=f"{arxiv_id}.pdf")
+            pdf_url = paper_info.get("pdf_url")
+            if not pdf_url:
+                # Only the ID is known; look up the PDF link first
+                search = arxiv.Search(id_list=[arxiv_id])
+                results = self._fetch_results(search)
+                if not results:
+                    console.print(f"[yellow]No paper found with ID: {arxiv_id}[/yellow]")
+                    return None
+                pdf_url = results[0].pdf_url
+            console.print(f"[blue]Downloading: {pdf_url}[/blue]")
+            self._fetch_pdf(pdf_url, pdf_path)
             console.print(f"[green]✓ Downloaded {pdf_path}[/green]")
             return pdf_path
         except Exception as e:
             console.print(f"[red]Download error: {e}[/red]")
             return None
 
+    def _fetch_pdf(self, pdf_url: str, pdf_path: Path) -> Path:
+        """
+        GET a PDF straight into place
+
+        Writes to a .part file first and renames it when complete, so a
+        partially written PDF is never mistaken for a finished download.
+        """
+        part_path = pdf_path.with_suffix(f".{get_ident()}.part")
+        try:
+            with self.http.get(pdf_url, stream=True, timeout=30) as r:
+                r.raise_for_status()
+                with open(part_path, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=PDF_CHUNK_SIZE):
+                        f.write(chunk)
+            os.replace(part_path, pdf_path)
+        finally:
+            part_path.unlink(missing_ok=True)
+        return pdf_path
+
+    def download_papers(self, paper_infos: List[Dict]) -> List[Optional[Path]]:
+        """
+        Download several PDFs concurrently
+
+        Args:
+            paper_infos: Paper metadata dictionaries (arxiv_id and pdf_url)
+
+        Returns:
+            PDF paths in the same order as paper_infos (None where a download failed)
+        """
+        paths: List[Optional[Path]] = [None] * len(paper_infos)
+        pending = []
+        for i, info in enumerate(paper_infos):
+            pdf_path = self.download_dir / f"{info['arxiv_id']}.pdf"
+            if pdf_path.exists():
+                paths[i] = pdf_path
+            else:
+                pending.append((i, info, pdf_path))
+
+        def fetch(item):
+            i, info, pdf_path = item
+            try:
+                if not info.get("pdf_url"):
+                    return i, self.download_paper(info)
+                return i, self._fetch_pdf(info["pdf_url"], pdf_path)
+            except Exception as e:
+                console.print(f"[red]Download error for {info['arxiv_id']}: {e}[/red]")
+                return i, None
+
+        if pending:
+            console.print(f"[blue]Downloading {len(pending)} papers...[/blue]")
+            with ThreadPoolExecutor(max_workers=PDF_DOWNLOAD_WORKERS) as pool:
+                for i, path in pool.map(fetch, pending):
+                    paths[i] = path
+
+        return paths
+
     def search_paper_options(self, query: str, use_gemini: bool = False) -> Optional[List[Dict]]:
         """
         Search for papers and return options (non-interactive)
@@ -296,6 +549,35 @@ Example output:
             papers = self.search_paper(query, max_results=3)
             return papers if papers else None
 
+    async def search_paper_options_async(self, query: str) -> Optional[List[Dict]]:
+        """
+        Search ArXiv and Gemini at the same time and merge the results
+
+        ArXiv matches come first (they carry full metadata); Gemini results
+        for papers ArXiv already returned are dropped.
+
+        Args:
+            query: Paper title or search term
+
+        Returns:
+            Merged list of paper options, or None if nothing found
+        """
+        arxiv_papers, gemini_papers = await asyncio.gather(
+            asyncio.to_thread(self.search_paper, query, 3),
+            self._search_online_with_gemini_async(query),
+        )
+
+        merged: List[Dict] = []
+        seen = set()
+        for paper in (arxiv_papers or []) + (gemini_papers or []):
+            base_id = _VERSION_RE.sub("", paper.get("arxiv_id") or "")
+            if base_id and base_id in seen:
+                continue
+            seen.add(base_id)
+            merged.append(paper)
+
+        return merged or None
+
     def analyze_paper(self, query_or_id: str, download: bool = True) -> Optional[Dict]:
             """
             Full paper discovery pipeline:
@@ -314,11 +596,13 @@ Example output:
 
             # --- Case 2: interactive search / Gemini fallback ---
             if not final_paper_info:
-                paper_list = self.search_paper(query_or_id, max_results=3)
+                # The table only reads a few fields, so take the results as columns
+                papers = self.search_paper(query_or_id, max_results=3, columnar=True)
 
                 while True:
+                    count = len(papers["arxiv_id"]) if papers else 0
                     # If no results, inform the user
-                    if not paper_list:
+                    if not count:
                         console.print("\n[yellow]No results on ArXiv.[/yellow]")
                     else:
                         # Display results in a Rich Table
@@ -328,9 +612,9 @@ Example output:
                         table.add_column("Authors", style="magenta", width=30)
                         table.add_column("ArXiv ID", style="dim", width=16)
 
-                        for i, p in enumerate(paper_list):
-                            authors = ", ".join(p.get("authors", [])[:3])
-                            table.add_row(str(i + 1), p.get("title", "Untitled"), authors, p.get("arxiv_id", "N/A"))
+                        for i in range(count):
+                            authors = ", ".join((papers["authors"][i] or [])[:3])
+                            table.add_row(str(i + 1), papers["title"][i] or "Untitled", authors, papers["arxiv_id"][i] or "N/A")
 
                         console.print()
                         console.print(table)
@@ -342,16 +626,24 @@ Example output:
                         return None
                     if choice == "g":
                         paper_list = self._search_online_with_gemini(query_or_id)
+                        papers = None
+                        if paper_list:
+                            # Gemini results lack summary/dates; fill them in with one batched lookup
+                            full = self.get_papers_by_ids([p["arxiv_id"] for p in paper_list if p.get("arxiv_id")])
+                            papers = self._project([full.get(p.get("arxiv_id"), p) for p in paper_list], columnar=True)
                         continue
 
                     try:
                         idx = int(choice) - 1
-                        if paper_list and 0 <= idx < len(paper_list):
-                            sel = paper_list[idx]
+                        if 0 <= idx < count:
+                            sel = self._row(papers, idx)
                             sel_id = sel.get("arxiv_id")
                             # Print a clear confirmation banner with the selected paper title
-                            console.print(f"[green]✓ Selected Paper: {sel.get('title', 'Untitled')}[/green]")
-                            if sel_id:
+                            console.print(f"[green]✓ Selected Paper: {sel.get('title') or 'Untitled'}[/green]")
+                            if sel.get("summary") is not None:
+                                # Already full ArXiv metadata, no need to fetch it again
+                                final_paper_info = sel
+                            elif sel_id:
                                 final_paper_info = self.get_paper_by_id(sel_id)
                             break
                         else:
@@ -370,28 +662,91 @@ Example output:
         """Fetch a single paper by ArXiv ID or URL."""
         try:
             arxiv_id = self.extract_arxiv_id(arxiv_id)
+
+            cached = self._paper_cache.get(arxiv_id)
+            if cached is not None:
+                return dict(cached)
+
+            disk_key = f"paper|{arxiv_id}"
+            cached = self._disk_cache_get(disk_key)
+            if isinstance(cached, dict):
+                self._paper_cache.set(arxiv_id, cached)
+                return dict(cached)
+
             console.print(f"[blue]Fetching paper by ID: {arxiv_id}[/blue]")
             search = arxiv.Search(id_list=[arxiv_id])
-            results = list(self.client.results(search))
+            results = self._fetch_results(search)
 
             if not results:
                 console.print(f"[yellow]No paper found with ID: {arxiv_id}[/yellow]")
                 return None
 
-            paper = results[0]
-            info = {
-                "title": paper.title,
-                "arxiv_id": arxiv_id,
-                "authors": [a.name for a in paper.authors],
-                "summary": paper.summary,
-                "published": paper.published,
-                "pdf_url": paper.pdf_url,
-                "primary_category": paper.primary_category,
-                "categories": paper.categories,
-                "entry_id": paper.entry_id,
-            }
+            info = self._result_to_info(results[0], arxiv_id)
             console.print(f"[green]✓ Found: {info['title']}[/green]")
-            return info
+            self._paper_cache.set(arxiv_id, info)
+            self._disk_cache_set(disk_key, info)
+            return dict(info)
         except Exception as e:
             console.print(f"[red]Error fetching paper by ID: {e}[/red]")
-            return None
\ No newline at end of file
+            return None
+
+    def get_papers_by_ids(self, arxiv_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch several papers with a single ArXiv request
+
+        Args:
+            arxiv_ids: ArXiv IDs or URLs
+
+        Returns:
+            Dict of arxiv_id -> paper info for the IDs that were found
+        """
+        found: Dict[str, Dict] = {}
+        missing: List[str] = []
+        for raw_id in arxiv_ids:
+            arxiv_id = self.extract_arxiv_id(raw_id)
+            cached = self._paper_cache.get(arxiv_id)
+            if cached is not None:
+                found[arxiv_id] = dict(cached)
+            elif arxiv_id not in missing:
+                missing.append(arxiv_id)
+
+        if not missing:
+            return found
+
+        try:
+            console.print(f"[blue]Fetching {len(missing)} papers by ID[/blue]")
+            results = self._fetch_results(arxiv.Search(id_list=missing, max_results=len(missing)))
+        except Exception as e:
+            console.print(f"[red]Error fetching papers by ID: {e}[/red]")
+            return found
+
+        # Requested IDs may or may not carry a version suffix
+        by_id = {}
+        for r in results:
+            short_id = r.entry_id.split("/abs/")[-1]
+            by_id[short_id] = r
+            by_id.setdefault(_VERSION_RE.sub("", short_id), r)
+
+        for arxiv_id in missing:
+            r = by_id.get(arxiv_id)
+            if r is None:
+                continue
+            info = self._result_to_info(r, arxiv_id)
+            self._paper_cache.set(arxiv_id, info)
+            found[arxiv_id] = dict(info)
+
+        return found
+
+    @staticmethod
+    def _result_to_info(paper: arxiv.Result, arxiv_id: str) -> Dict:
+        return {
+            "title": paper.title,
+            "arxiv_id": arxiv_id,
+            "authors": list(map(_name, paper.authors)),
+            "summary": paper.summary,
+            "published": paper.published,
+            "pdf_url": paper.pdf_url,
+            "primary_category": paper.primary_category,
+            "categories": paper.categories,
+            "entry_id": paper.entry_id,
+        }
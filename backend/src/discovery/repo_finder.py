@@ -1,17 +1,40 @@
 """
 GitHub repository discovery using Gemini multimodal API to extract from PDF
 """
+import mmap
 import os
 import re
+import time
 from google import genai
 from google.genai import types
 from utils.config import Config
-from typing import Optional, Dict
+from utils.ttl_cache import TTLCache
+from types import MappingProxyType
+from typing import Optional, Dict, Mapping
 from pathlib import Path
 from rich.console import Console
 
 console = Console()
 
+_GH_RE = re.compile(r'https?://github\.com/[\w-]+/[\w.-]+')
+
+# Words marking a link as the paper's own code ("Code is available at ...")
+_CODE_CUE_RE = re.compile(r'\b(code|available|implementation|released|open[- ]sourced?)\b', re.IGNORECASE)
+
+# Hardcoded paper -> repository pairs used when PDF extraction fails
+_KNOWN_REPOS: Mapping[str, str] = MappingProxyType({
+    "2310.02170": "https://github.com/SALT-NLP/DyLAN",
+    "1706.03762": "https://github.com/tensorflow/tensor2tensor",
+    "1810.04805": "https://github.com/google-research/bert",
+})
+
+# Gemini deletes uploaded files after 48h
+FILE_UPLOAD_TTL_SECONDS = 47 * 3600
+
+# Code links are almost always in the abstract or a first-page footnote;
+# later pages mostly cite other people's repositories
+PRESCAN_PAGES = 2
+
 
 class RepoFinder:
     """Find GitHub repositories for research papers using Gemini"""
@@ -24,15 +47,9 @@ class RepoFinder:
             gemini_api_key: Optional Gemini API key (reads from env if not provided)
         """
         # Get API key
-        if gemini_api_key:
-            self.api_key = gemini_api_key
-        else:
-            # Try to import Config, fallback to os.getenv
-            try:
-                from utils.config import Config
-                self.api_key = Config.GEMINI_API_KEY
-            except:
-                self.api_key = os.getenv("GEMINI_API_KEY")
+        self.api_key = gemini_api_key or Config.GEMINI_API_KEY or os.getenv("GEMINI_API_KEY")
+        # Use configured model (defaults to gemini-2.5-flash)
+        self.model_name = getattr(Config, 'GEMINI_MODEL', 'gemini-2.5-flash')
 
         if not self.api_key:
             console.print("[red]Error: GEMINI_API_KEY not found in .env[/red]")
@@ -40,8 +57,93 @@ class RepoFinder:
         else:
             # Configure Gemini client with new SDK
             self.client = genai.Client(api_key=self.api_key)
-            # Use configured model (defaults to gemini-2.5-flash)
-            self.model_name = getattr(Config, 'GEMINI_MODEL', 'gemini-2.5-flash')
+
+        # (pdf path, mtime, size) -> uploaded Gemini file; kept just under the 48h file lifetime
+        self._uploads = TTLCache(maxsize=128, ttl=FILE_UPLOAD_TTL_SECONDS)
+
+    def _pdf_part(self, pdf_path: Path):
+        """
+        Get the PDF as Gemini content, uploading it through the Files API once
+
+        Uploaded files stay available server-side for 48h, so asking about the
+        same PDF again reuses the upload instead of resending the bytes.
+        Falls back to inline bytes if the upload fails.
+        """
+        stat = pdf_path.stat()
+        key = (str(pdf_path), stat.st_mtime_ns, stat.st_size)
+        uploaded = self._uploads.get(key)
+        if uploaded is not None:
+            return uploaded
+
+        try:
+            uploaded = self.client.files.upload(file=str(pdf_path))
+            for _ in range(10):
+                if getattr(uploaded.state, "name", None) != "PROCESSING":
+                    break
+                time.sleep(1)
+                uploaded = self.client.files.get(name=uploaded.name)
+            self._uploads.set(key, uploaded)
+            return uploaded
+        except Exception as e:
+            console.print(f"[yellow]PDF upload failed ({e}), sending inline[/yellow]")
+            return types.Part.from_bytes(data=self._read_pdf(pdf_path), mime_type='application/pdf')
+
+    @staticmethod
+    def _read_pdf(pdf_path: Path) -> bytes:
+        """Read a PDF with a single copy out of the page cache (via mmap)"""
+        with open(pdf_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[:]
+
+    @staticmethod
+    def _normalize_repo_url(url: str) -> str:
+        """Strip trailing punctuation and a .git suffix from a matched GitHub URL"""
+        url = url.rstrip(".")
+        if url.endswith(".git"):
+            url = url[:-4]
+        return url
+
+    @classmethod
+    def _prescan_pdf(cls, pdf_path: Path) -> Optional[str]:
+        """
+        Look for the paper's GitHub URL in its first pages without calling Gemini
+
+        Text blocks (abstract, footnotes) that mention code/availability are
+        preferred over bare links, which are often cited third-party repos.
+        A URL is only returned when it is the single candidate; otherwise the
+        caller asks Gemini to pick.
+
+        Args:
+            pdf_path: Path to the paper PDF
+
+        Returns:
+            GitHub repository URL or None
+        """
+        try:
+            import fitz
+        except ImportError:
+            return None
+
+        cued, bare = {}, {}
+        try:
+            with fitz.open(pdf_path) as doc:
+                for page in doc.pages(0, min(PRESCAN_PAGES, doc.page_count)):
+                    for block in page.get_text("blocks"):
+                        text = block[4]
+                        urls = [cls._normalize_repo_url(url) for url in _GH_RE.findall(text)]
+                        found = cued if _CODE_CUE_RE.search(text) else bare
+                        for url in urls:
+                            found.setdefault(url.lower(), url)
+        except Exception as e:
+            console.print(f"[yellow]Local PDF scan failed: {e}[/yellow]")
+            return None
+
+        candidates = cued or bare
+        if len(candidates) == 1:
+            return next(iter(candidates.values()))
+        return None
 
     def extract_github_from_pdf(self, pdf_path: Path) -> Optional[str]:
         """
@@ -53,6 +155,12 @@ class RepoFinder:
         Returns:
             GitHub repository URL or None
         """
+        # Cheap local pass first; most papers print the link as plain text
+        repo_url = self._prescan_pdf(pdf_path) if pdf_path.exists() else None
+        if repo_url:
+            console.print(f"[green]✓ Found URL in PDF text: {repo_url}[/green]")
+            return repo_url
+
         if not self.client:
             console.print("[yellow]Gemini not initialized, skipping PDF analysis[/yellow]")
             return None
@@ -65,8 +173,7 @@ class RepoFinder:
                 console.print(f"[red]PDF not found: {pdf_path}[/red]")
                 return None
 
-            # Load PDF as bytes
-            pdf_bytes = pdf_path.read_bytes()
+            pdf_part = self._pdf_part(pdf_path)
 
             # Create multimodal content with PDF + prompt
             prompt = """Analyze this research paper PDF and extract the GitHub repository URL for the code implementation.
@@ -83,13 +190,7 @@ If no GitHub URL is found, return "NONE"."""
 
             response = self.client.models.generate_content(
                 model=self.model_name,
-                contents=[
-                    types.Part.from_bytes(
-                        data=pdf_bytes,
-                        mime_type='application/pdf'
-                    ),
-                    prompt
-                ]
+                contents=[pdf_part, prompt]
             )
 
             # Extract URL from response
@@ -105,11 +206,10 @@ If no GitHub URL is found, return "NONE"."""
                 return None
 
             # Extract GitHub URL using regex
-            github_pattern = r'https?://github\.com/[\w-]+/[\w.-]+'
-            matches = re.findall(github_pattern, text)
+            matches = _GH_RE.findall(text)
 
             if matches:
-                repo_url = matches[0]  # Take first match
+                repo_url = self._normalize_repo_url(matches[0])  # Take first match
                 console.print(f"[green]✓ Extracted URL: {repo_url}[/green]")
                 return repo_url
             else:
@@ -146,18 +246,14 @@ If no GitHub URL is found, return "NONE"."""
         # Extract from PDF using Gemini
         return self.extract_github_from_pdf(pdf_path)
 
-    def get_known_repos(self) -> Dict[str, str]:
+    def get_known_repos(self) -> Mapping[str, str]:
         """
         Hardcoded known paper-repository pairs as fallback
 
         Returns:
-            Dictionary mapping ArXiv IDs to repository URLs
+            Read-only mapping of ArXiv IDs to repository URLs
         """
-        return {
-            "2310.02170": "https://github.com/SALT-NLP/DyLAN",
-            "1706.03762": "https://github.com/tensorflow/tensor2tensor",
-            "1810.04805": "https://github.com/google-research/bert",
-        }
+        return _KNOWN_REPOS
 
     def find_with_fallback(self, paper_info: Dict) -> Optional[str]:
         """
@@ -176,12 +272,11 @@ If no GitHub URL is found, return "NONE"."""
             return repo_url
 
         # Fallback to known repos
-        arxiv_id = paper_info.get("arxiv_id", "")
-        known_repos = self.get_known_repos()
+        known_repo = _KNOWN_REPOS.get(paper_info.get("arxiv_id", ""))
 
-        if arxiv_id in known_repos:
+        if known_repo:
             console.print(f"[green]✓ Using known repository mapping[/green]")
-            return known_repos[arxiv_id]
+            return known_repo
 
         console.print(f"[red]No repository found for this paper[/red]")
         return None
@@ -9,6 +9,7 @@ from rich.panel import Panel
 from rich.table import Table
 
 from utils.config import Config
+from utils.paper_cache import get_cache
 from utils.repo_utils import RepoAnalyzer
 from discovery.paper_finder import PaperFinder
 from discovery.repo_finder import RepoFinder
@@ -156,6 +157,36 @@ class RepoRover:
         response = self.pipeline.query(question)
         return response
 
+    def stream_answer(self, question: str) -> dict:
+        """
+        Answer a question, printing the answer as it is generated
+
+        Args:
+            question: User question
+
+        Returns:
+            Final response dictionary (answer plus sources)
+        """
+        if not self.pipeline:
+            console.print("[red]Please analyze a paper first using analyze_paper()[/red]")
+            return {}
+
+        response = {}
+        console.print("\n[bold green]Answer:[/bold green]")
+        for event in self.pipeline.query_stream(question):
+            if event["type"] == "delta":
+                # Raw text: a chunk may end mid-way through something rich would parse as markup
+                console.print(event["text"], end="", markup=False, highlight=False)
+            elif event["type"] == "sources":
+                response.update(event)
+            else:
+                response["answer"] = event.get("answer", "")
+                if event["type"] == "error" or not response.get("code_snippets"):
+                    # Nothing was streamed; show the final message
+                    console.print(response["answer"], markup=False, highlight=False)
+        console.print()
+        return response
+
     def interactive_mode(self):
         """Interactive Q&A mode"""
         if not self.pipeline:
@@ -183,12 +214,8 @@ class RepoRover:
                 if not question:
                     continue
 
-                # Process query
-                response = self.query(question)
-
-                # Display response
-                console.print("\n[bold green]Answer:[/bold green]")
-                console.print(response.get("answer", "No answer available"))
+                # Process query, printing the answer as it streams in
+                response = self.stream_answer(question)
 
                 # Show code snippets
                 if response.get("code_snippets"):
@@ -232,6 +259,45 @@ class RepoRover:
         return mwe_code
 
 
+def batch_concept_maps():
+    """
+    Backfill concept maps for cached papers that don't have one
+
+    Nobody is waiting on these, so they go through the Gemini Batch API
+    (half the cost of interactive calls) as a single job.
+    """
+    cache = get_cache()
+    repo_analyzer = RepoAnalyzer(Config.REPO_CLONE_DIR)
+    gemini = GeminiSynthesizer(Config.GEMINI_API_KEY, Config.GEMINI_MODEL)
+
+    papers = {}
+    for arxiv_id, data in cache.cache.items():
+        map_path = data.get("concept_map_path")
+        if map_path and Path(map_path).exists():
+            continue
+        repo_path = Path(data.get("repo_path") or "")
+        if not data.get("repo_path") or not repo_path.exists():
+            continue
+
+        paper_info = {"title": data.get("title", arxiv_id), "summary": data.get("summary", "")}
+        readme = repo_analyzer.get_readme_content(repo_path) or ""
+        papers[arxiv_id] = (paper_info, readme, repo_analyzer.get_repo_structure(repo_path))
+
+    if not papers:
+        console.print("[green]All cached papers already have concept maps[/green]")
+        return
+
+    job_name = gemini.submit_concept_map_batch(papers)
+    console.print(f"[cyan]Waiting for {len(papers)} concept maps (batch jobs can take a while)...[/cyan]")
+    results = gemini.wait_for_batch(job_name)
+
+    for arxiv_id, concept_map in gemini.parse_concept_map_results(results, papers).items():
+        map_path = cache.save_concept_map(arxiv_id, concept_map)
+        cache.update(arxiv_id, {"concept_map_path": str(map_path)})
+
+    console.print(f"[green]✓ Saved {len(papers)} concept maps[/green]")
+
+
 def main():
     """Main entry point"""
     import argparse
@@ -242,9 +308,16 @@ def main():
     parser.add_argument("--mwe", type=str, help="Generate MWE for function/class")
     parser.add_argument("--interactive", action="store_true", help="Interactive Q&A mode")
     parser.add_argument("--test", action="store_true", help="Test configuration")
+    parser.add_argument("--batch-concept-maps", action="store_true",
+                        help="Generate missing concept maps for cached papers via the Gemini Batch API")
 
     args = parser.parse_args()
 
+    # Backfill concept maps
+    if args.batch_concept_maps:
+        batch_concept_maps()
+        return
+
     # Test mode
     if args.test:
         console.print("[bold]Testing Repo Rover Configuration[/bold]\n")
@@ -272,9 +345,7 @@ def main():
 
         # Answer question if provided
         if args.question:
-            response = rover.query(args.question)
-            console.print("\n[bold green]Answer:[/bold green]")
-            console.print(response.get("answer", "No answer available"))
+            rover.stream_answer(args.question)
 
         # Generate MWE if requested
         elif args.mwe:
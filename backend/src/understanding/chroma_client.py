@@ -3,16 +3,76 @@ ChromaDB client wrapper for code embedding and retrieval.
 Provides a simple interface for managing collections and documents.
 Supports both local and cloud ChromaDB.
 """
-from typing import Optional, Dict, Any, List
+import asyncio
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterator, List, Set
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 from google import genai
+from google.genai import errors as genai_errors
 import os
 from pathlib import Path
 from rich.console import Console
 
+from utils.ttl_cache import TTLCache
+from .embedding_cache import EmbeddingCache
+
 console = Console()
 
+# Gemini embed_content accepts at most 100 texts per request
+EMBED_BATCH_SIZE = 100
+
+# Attempts per embedding request when the API rate-limits or is briefly unavailable
+EMBED_MAX_ATTEMPTS = 5
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# In-process query embedding cache
+QUERY_CACHE_SIZE = 2048
+QUERY_CACHE_TTL_SECONDS = 24 * 3600
+
+# IDs per delete() call when emptying a collection
+DELETE_BATCH_SIZE = 10_000
+
+# Metadata for documents added without any (Chroma rejects empty metadata).
+# A plain dict because Chroma's validation requires one; never mutate it
+DEFAULT_METADATA = {"source": "code"}
+
+# Blocking Chroma calls the async wrappers allow in worker threads at once
+ASYNC_CALL_LIMIT = 8
+
+
+@lru_cache(maxsize=4)
+def _get_genai_client(
+    client_id: Optional[str],
+    client_secret: Optional[str],
+    project_id: Optional[str],
+    api_key: Optional[str]
+) -> genai.Client:
+    """
+    Authenticated Gemini client, built once per set of credentials
+
+    Every wrapper (one per ChromaIndexer unless a client is shared) would
+    otherwise redo the OAuth token load/refresh on construction.
+    """
+    if client_id and client_secret:
+        # Use GCP OAuth (higher limits, uses GCP billing)
+        console.print("[cyan]Using GCP OAuth authentication (paid tier)[/cyan]")
+        from utils.gcp_auth import get_authenticated_client
+        return get_authenticated_client(
+            client_id=client_id,
+            client_secret=client_secret,
+            project_id=project_id
+        )
+
+    # Use API key (free tier)
+    console.print("[yellow]Using API key authentication (free tier - rate limited)[/yellow]")
+    return genai.Client(api_key=api_key)
+
 
 class ChromaClientWrapper:
     """
@@ -25,7 +85,8 @@ class ChromaClientWrapper:
         self,
         persist_directory: Optional[str] = None,
         cloud_api_key: Optional[str] = None,
-        cloud_host: Optional[str] = None
+        cloud_host: Optional[str] = None,
+        max_concurrent_batches: int = 5
     ):
         """
         Initialize ChromaDB client (local or cloud)
@@ -34,7 +95,10 @@ class ChromaClientWrapper:
             persist_directory: Directory for local persistence (ignored if cloud is used)
             cloud_api_key: ChromaDB Cloud API key (if using cloud)
             cloud_host: ChromaDB Cloud host URL (defaults to api.trychroma.com)
+            max_concurrent_batches: Embedding requests allowed in flight at once
         """
+        self.max_concurrent_batches = max_concurrent_batches
+
         # Use latest Google embedding model for code retrieval
         self.embedding_model = "models/gemini-embedding-001"
 
@@ -42,27 +106,15 @@ class ChromaClientWrapper:
         # Try GCP OAuth first (for higher limits), fall back to API key
         from utils.config import Config
 
-        gcp_client_id = Config.GCP_CLIENT_ID
-        gcp_client_secret = Config.GCP_CLIENT_SECRET
-        gcp_project_id = Config.GCP_PROJECT_ID
-
-        if gcp_client_id and gcp_client_secret:
-            # Use GCP OAuth (higher limits, uses GCP billing)
-            console.print("[cyan]Using GCP OAuth authentication (paid tier)[/cyan]")
-            from utils.gcp_auth import get_authenticated_client
-            self.genai_client = get_authenticated_client(
-                client_id=gcp_client_id,
-                client_secret=gcp_client_secret,
-                project_id=gcp_project_id
-            )
-        else:
-            # Use API key (free tier)
-            gemini_api_key = Config.GEMINI_API_KEY
-            if not gemini_api_key:
-                raise ValueError("Either GEMINI_API_KEY or GCP OAuth credentials are required")
+        if not (Config.GCP_CLIENT_ID and Config.GCP_CLIENT_SECRET) and not Config.GEMINI_API_KEY:
+            raise ValueError("Either GEMINI_API_KEY or GCP OAuth credentials are required")
 
-            console.print("[yellow]Using API key authentication (free tier - rate limited)[/yellow]")
-            self.genai_client = genai.Client(api_key=gemini_api_key)
+        self.genai_client = _get_genai_client(
+            Config.GCP_CLIENT_ID,
+            Config.GCP_CLIENT_SECRET,
+            Config.GCP_PROJECT_ID,
+            Config.GEMINI_API_KEY
+        )
 
         # Determine if using cloud or local
         if cloud_api_key:
@@ -137,23 +189,60 @@ class ChromaClientWrapper:
 
         console.print(f"[OK] Using Google's '{self.embedding_model}' for embeddings")
 
-    def list_collections(self) -> List[Dict[str, Any]]:
+        # Embeddings already computed for identical text (re-indexing, repeated queries)
+        cache_dir = Path(persist_directory) if self.mode == "local" else Config.CACHE_DIR
+        self.embedding_cache = EmbeddingCache(cache_dir / "embedding_cache.sqlite3")
+        # (model, query text) -> embedding tuple, for repeated questions
+        self._query_embeddings = TTLCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL_SECONDS)
+        self.query_cache_hits = 0
+        self.query_cache_misses = 0
+
+        # Bounds the async wrappers; created lazily inside the running event loop
+        self._async_slots: Optional[asyncio.Semaphore] = None
+
+        # Collection name -> Collection object, so hot paths skip the name lookup
+        self._collections: Dict[str, Any] = {}
+
+        # Collection name -> ids whose add_documents call failed, for a retry pass
+        self._failed_ids: Dict[str, Set[str]] = defaultdict(set)
+
+    def close(self):
+        """
+        Release the client's native resources (HNSW indexes, SQLite handles)
+
+        Does not touch stored data - unlike client.reset(), which wipes the database.
+        """
+        try:
+            from chromadb.api.client import SharedSystemClient
+            SharedSystemClient.clear_system_cache()
+        except Exception:
+            pass
+
+    def list_collections(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        with_counts: bool = True
+    ) -> List[Dict[str, Any]]:
         """
-        List all collections
+        List collections, optionally one page at a time
+
+        Args:
+            limit: Maximum number of collections to return (all if None)
+            offset: Number of collections to skip
+            with_counts: Include each collection's document count (one count() query per collection)
 
         Returns:
             List of collection metadata dictionaries
         """
-        collections = self.client.list_collections()
-        return [
-            {
-                "name": col.name,
-                "id": col.id,
-                "metadata": col.metadata,
-                "count": col.count()
-            }
-            for col in collections
-        ]
+        collections = self.client.list_collections(limit=limit, offset=offset)
+        listed = []
+        for col in collections:
+            info = {"name": col.name, "id": col.id, "metadata": col.metadata}
+            if with_counts:
+                info["count"] = col.count()
+            listed.append(info)
+        return listed
 
     def get_or_create_collection(self, name: str, metadata: Optional[Dict] = None) -> Any:
         """
@@ -166,13 +255,27 @@ class ChromaClientWrapper:
         Returns:
             Collection object
         """
+        collection = self._collections.get(name)
+        if collection is not None:
+            return collection
+
         # ChromaDB requires non-empty metadata, so provide default
         collection_metadata = metadata if metadata else {"type": "code_repository"}
 
-        return self.client.get_or_create_collection(
+        collection = self.client.get_or_create_collection(
             name=name,
             metadata=collection_metadata
         )
+        self._collections[name] = collection
+        return collection
+
+    def _get_collection(self, name: str) -> Any:
+        """Get an existing collection, resolving its name only once"""
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self.client.get_collection(name=name)
+            self._collections[name] = collection
+        return collection
 
     def delete_collection(self, name: str) -> bool:
         """
@@ -184,12 +287,146 @@ class ChromaClientWrapper:
         Returns:
             True if successful
         """
+        self._collections.pop(name, None)
+        self._failed_ids.pop(name, None)
         try:
             self.client.delete_collection(name=name)
             return True
         except Exception:
             return False
 
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, calling the API once per distinct text not in the embedding cache
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            (len(texts), dim) float32 array, one row per text in order
+        """
+        keys = [EmbeddingCache.key(self.embedding_model, text) for text in texts]
+        cached = self.embedding_cache.get_many(self.embedding_model, keys)
+
+        # Identical texts (vendored copies, empty __init__.py stubs, ...) share a
+        # key, so embed the first occurrence of each and fan it out by key below
+        first_seen: Dict[bytes, int] = {}
+        for i, key in enumerate(keys):
+            if key not in cached:
+                first_seen.setdefault(key, i)
+        missing = list(first_seen.values())
+        if missing:
+            fresh = {}
+            try:
+                for batch, embeddings in self._embed_batches([texts[i] for i in missing], missing):
+                    for i, values in zip(batch, embeddings):
+                        fresh[keys[i]] = np.asarray(values, dtype=np.float32)
+            finally:
+                # Keep the batches that succeeded even if another one failed,
+                # so retrying the call only embeds what is still missing
+                self.embedding_cache.put_many(self.embedding_model, fresh)
+            cached.update(fresh)
+
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([cached[key] for key in keys])
+
+    def _embed_queries(self, query_texts: List[str]) -> np.ndarray:
+        """
+        Embed queries through an in-process LRU in front of the SQLite cache
+
+        The same question is often asked repeatedly; hits skip both the
+        database lookup and the API call.
+        """
+        embeddings: List[Any] = [None] * len(query_texts)
+        missing = []
+        for i, text in enumerate(query_texts):
+            hit = self._query_embeddings.get((self.embedding_model, text))
+            if hit is None:
+                missing.append(i)
+            else:
+                embeddings[i] = hit
+
+        self.query_cache_hits += len(query_texts) - len(missing)
+        self.query_cache_misses += len(missing)
+
+        if missing:
+            fresh = self._embed([query_texts[i] for i in missing])
+            for i, values in zip(missing, fresh):
+                # Shared between callers, so make it immutable
+                values = values.copy()
+                values.flags.writeable = False
+                self._query_embeddings.set((self.embedding_model, query_texts[i]), values)
+                embeddings[i] = values
+
+        return np.stack(embeddings)
+
+    def query_cache_stats(self) -> Dict[str, int]:
+        """
+        Hit/miss counts of the in-process query embedding cache
+
+        Returns:
+            Dictionary with hits, misses and current size
+        """
+        return {
+            "hits": self.query_cache_hits,
+            "misses": self.query_cache_misses,
+            "size": len(self._query_embeddings),
+        }
+
+    def _embed_batches(self, texts: List[str], indices: List[int]) -> Iterator[tuple]:
+        """
+        Embed texts in API-sized batches, several requests in flight at once
+
+        Rate-limited or briefly unavailable requests are retried with
+        exponential backoff. If a batch still fails, the other batches are
+        yielded first and the error is raised at the end.
+
+        Args:
+            texts: Texts to embed
+            indices: Caller's index for each text, passed through
+
+        Yields:
+            (index batch, embedding batch) pairs in completion order
+        """
+        batches = [
+            (indices[start:start + EMBED_BATCH_SIZE], texts[start:start + EMBED_BATCH_SIZE])
+            for start in range(0, len(texts), EMBED_BATCH_SIZE)
+        ]
+
+        def embed(batch_texts, jitter=True):
+            if jitter:
+                # Spread out request starts so a burst doesn't trip rate limits together
+                time.sleep(random.uniform(0, 0.1))
+            for attempt in range(EMBED_MAX_ATTEMPTS):
+                try:
+                    response = self.genai_client.models.embed_content(
+                        model=self.embedding_model,
+                        contents=batch_texts
+                    )
+                    return [embedding.values for embedding in response.embeddings]
+                except genai_errors.APIError as e:
+                    if e.code not in RETRYABLE_STATUS_CODES or attempt == EMBED_MAX_ATTEMPTS - 1:
+                        raise
+                    time.sleep(2 ** attempt + random.random())
+
+        if len(batches) == 1:
+            batch_indices, batch_texts = batches[0]
+            yield batch_indices, embed(batch_texts, jitter=False)
+            return
+
+        error = None
+        workers = min(self.max_concurrent_batches, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(embed, batch_texts): batch_indices for batch_indices, batch_texts in batches}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    error = error or e
+        if error is not None:
+            raise error
+
     def add_documents(
         self,
         collection_name: str,
@@ -212,25 +449,15 @@ class ChromaClientWrapper:
         try:
             collection = self.get_or_create_collection(collection_name)
 
-            # Generate embeddings with RETRIEVAL_DOCUMENT task type
-            # This optimizes embeddings for documents that will be retrieved
-            response = self.genai_client.models.embed_content(
-                model=self.embedding_model,
-                contents=documents
-            )
-            # Extract embeddings from response
-            embeddings = [embedding.values for embedding in response.embeddings]
+            # Generate embeddings (unchanged documents come from the cache)
+            embeddings = self._embed(documents)
 
-            # Ensure metadatas is not None and each metadata dict is not empty
-            # ChromaDB requires non-empty metadata for each document
+            # ChromaDB requires non-empty metadata for each document; missing
+            # entries all share one default dict (Chroma only reads it)
             if metadatas is None:
-                metadatas = [{"source": "code"} for _ in documents]
-            else:
-                # Ensure each metadata dict has at least one key
-                metadatas = [
-                    meta if meta else {"source": "code"}
-                    for meta in metadatas
-                ]
+                metadatas = [DEFAULT_METADATA] * len(documents)
+            elif not all(metadatas):
+                metadatas = [meta or DEFAULT_METADATA for meta in metadatas]
 
             # Add documents with pre-computed embeddings
             collection.add(
@@ -239,13 +466,30 @@ class ChromaClientWrapper:
                 ids=ids,
                 metadatas=metadatas
             )
+            failed = self._failed_ids.get(collection_name)
+            if failed:
+                failed.difference_update(ids)
             return True
         except Exception as e:
-            console.print(f"[red]Error adding documents: {e}[/red]")
-            import traceback
-            console.print(f"[dim]{traceback.format_exc()}[/dim]")
+            # The collection may have been deleted elsewhere; re-resolve next time
+            self._collections.pop(collection_name, None)
+            # Embeddings that did succeed are cached, so a retry pass is cheap
+            self._failed_ids[collection_name].update(ids)
+            console.print(f"[yellow]Warning: could not add {len(ids)} documents to {collection_name}: {e}[/yellow]")
             return False
 
+    def pop_failed_ids(self, collection_name: str) -> List[str]:
+        """
+        Take the ids whose add_documents call failed, for a later retry pass
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            Failed document ids (cleared from the wrapper)
+        """
+        return sorted(self._failed_ids.pop(collection_name, ()))
+
     def query(
         self,
         collection_name: str,
@@ -269,16 +513,10 @@ class ChromaClientWrapper:
         """
         try:
             # Get collection (no embedding function needed)
-            collection = self.client.get_collection(name=collection_name)
+            collection = self._get_collection(collection_name)
 
-            # Generate query embeddings
-            # This optimizes embeddings for searching code
-            response = self.genai_client.models.embed_content(
-                model=self.embedding_model,
-                contents=query_texts
-            )
-            # Extract embeddings from response
-            query_embeddings = [embedding.values for embedding in response.embeddings]
+            # Generate query embeddings (repeated queries come from the caches)
+            query_embeddings = self._embed_queries(query_texts)
 
             # Query with pre-computed embeddings
             results = collection.query(
@@ -290,9 +528,40 @@ class ChromaClientWrapper:
 
             return results
         except Exception as e:
+            self._collections.pop(collection_name, None)
             console.print(f"[red]Error querying collection: {e}[/red]")
             return {"ids": [], "documents": [], "metadatas": [], "distances": []}
 
+    async def _run_async(self, func, *args, **kwargs):
+        """Run a blocking method in a worker thread, at most ASYNC_CALL_LIMIT at a time"""
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(ASYNC_CALL_LIMIT)
+        async with self._async_slots:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def aadd_documents(
+        self,
+        collection_name: str,
+        documents: List[str],
+        ids: List[str],
+        metadatas: Optional[List[Dict]] = None
+    ) -> bool:
+        """Async variant of add_documents for event-loop callers"""
+        return await self._run_async(self.add_documents, collection_name, documents, ids, metadatas)
+
+    async def aquery(
+        self,
+        collection_name: str,
+        query_texts: List[str],
+        n_results: int = 5,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Async variant of query for event-loop callers"""
+        return await self._run_async(
+            self.query, collection_name, query_texts, n_results, where, where_document
+        )
+
     def delete_all_documents(self, collection_name: str) -> bool:
         """
         Delete all documents from a collection
@@ -304,9 +573,11 @@ class ChromaClientWrapper:
             True if successful
         """
         try:
-            # Delete and recreate collection
-            self.client.delete_collection(name=collection_name)
-            self.get_or_create_collection(collection_name)
+            # Delete the rows but keep the collection (and its metadata/index) in place
+            collection = self._get_collection(collection_name)
+            ids = collection.get(include=[])["ids"]
+            for start in range(0, len(ids), DELETE_BATCH_SIZE):
+                collection.delete(ids=ids[start:start + DELETE_BATCH_SIZE])
             return True
         except Exception:
             return False
@@ -322,7 +593,8 @@ class ChromaClientWrapper:
             Number of documents
         """
         try:
-            collection = self.client.get_collection(name=collection_name)
+            collection = self._get_collection(collection_name)
             return collection.count()
         except Exception:
+            self._collections.pop(collection_name, None)
             return 0
@@ -1,14 +1,36 @@
 """
 ChromaDB integration for semantic code search
 """
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import repeat
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from rich.console import Console
 
+from utils.repo_utils import TEST_DIRS, is_test_file
 from .chroma_client import ChromaClientWrapper
 
 console = Console()
 
+# Each add_documents call is one embedding request plus one Chroma write
+# transaction; batching amortizes both (Gemini embeds up to 100 texts per request)
+DEFAULT_BATCH_SIZE = 100
+
+# Threads reading repository files while indexing
+READ_WORKERS = 16
+
+# Directories never indexed
+INDEX_SKIP_DIRS = TEST_DIRS | {'__pycache__', 'node_modules', '.git'}
+
+# Directories left out of the architecture file
+ARCHITECTURE_SKIP_DIRS = frozenset({
+    '.git', '__pycache__', 'node_modules', '.venv', 'venv', 'env',
+    '.pytest_cache', '.mypy_cache', 'dist', 'build', '.egg-info',
+    '.tox', '.coverage', 'htmlcov', '.idea', '.vscode'
+})
+
 
 class ChromaIndexer:
     """Index and search code using ChromaDB with Jina code embeddings"""
@@ -17,7 +39,9 @@ class ChromaIndexer:
         self,
         persist_directory: Optional[str] = None,
         cloud_api_key: Optional[str] = None,
-        cloud_host: Optional[str] = None
+        cloud_host: Optional[str] = None,
+        client: Optional[ChromaClientWrapper] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
     ):
         """
         Initialize ChromaDB indexer (local or cloud)
@@ -26,7 +50,17 @@ class ChromaIndexer:
             persist_directory: Directory for local ChromaDB (ignored if cloud is used)
             cloud_api_key: ChromaDB Cloud API key (if using cloud)
             cloud_host: ChromaDB Cloud host (defaults to api.trychroma.com)
+            client: Existing client wrapper to share (skips creating a new one)
+            batch_size: Documents per add_documents call when indexing a repository
         """
+        self.current_collection = None
+        self.batch_size = batch_size
+
+        if client is not None:
+            # Reuse an already connected client (one per process is enough)
+            self.client = client
+            self.persist_directory = getattr(client, "persist_directory", persist_directory)
+            return
 
         self.persist_directory = persist_directory or str(Path("data").resolve() / "chroma")
         Path(self.persist_directory).mkdir(parents=True, exist_ok=True)
@@ -36,7 +70,6 @@ class ChromaIndexer:
             cloud_api_key=cloud_api_key,
             cloud_host=cloud_host
         )
-        self.current_collection = None
 
     def set_collection(self, collection_name: str) -> bool:
         """
@@ -57,6 +90,50 @@ class ChromaIndexer:
             console.print(f"[red]Error setting collection: {e}[/red]")
             return False
 
+    @staticmethod
+    def _doc_id(file_path: Path, repo_name: str) -> str:
+        """Document ID for an indexed file"""
+        return f"{repo_name}::{file_path.name}::{file_path.parent}"
+
+    def _prepare_file(self, file_path: Path, repo_name: str, metadata: Optional[Dict] = None) -> Optional[tuple]:
+        """
+        Read a file and build its (document, id, metadata) entry
+
+        Returns:
+            Entry tuple, or None if the file is empty or unreadable
+        """
+        try:
+            # Read file content
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        except Exception as e:
+            console.print(f"[yellow]Error indexing {file_path}: {e}[/yellow]")
+            return None
+
+        if not content.strip():
+            return None
+
+        # Prepare document ID and metadata
+        doc_id = self._doc_id(file_path, repo_name)
+        doc_metadata = {
+            "file_path": str(file_path),
+            "repository": repo_name,
+            "file_type": file_path.suffix,
+            "file_name": file_path.name,
+            **(metadata or {})
+        }
+        return content, doc_id, doc_metadata
+
+    def _add_batch(self, entries: List[tuple]) -> bool:
+        """Add prepared (document, id, metadata) entries in one call"""
+        documents, ids, metadatas = zip(*entries)
+        return self.client.add_documents(
+            collection_name=self.current_collection,
+            documents=list(documents),
+            ids=list(ids),
+            metadatas=list(metadatas)
+        )
+
     def index_file(self, file_path: Path, repo_name: str, metadata: Optional[Dict] = None) -> bool:
         """
         Index a single file in ChromaDB
@@ -69,46 +146,42 @@ class ChromaIndexer:
         Returns:
             True if successful
         """
-        try:
-            # Read file content
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-
-            if not content.strip():
-                return False
-
-            # Prepare document ID and metadata
-            doc_id = f"{repo_name}::{file_path.name}::{file_path.parent}"
-            doc_metadata = {
-                "file_path": str(file_path),
-                "repository": repo_name,
-                "file_type": file_path.suffix,
-                "file_name": file_path.name,
-                **(metadata or {})
-            }
-
-            # Add to collection
-            if not self.current_collection:
-                console.print("[yellow]No collection set. Call set_collection() first.[/yellow]")
-                return False
-
-            success = self.client.add_documents(
-                collection_name=self.current_collection,
-                documents=[content],
-                ids=[doc_id],
-                metadatas=[doc_metadata]
-            )
+        if not self.current_collection:
+            console.print("[yellow]No collection set. Call set_collection() first.[/yellow]")
+            return False
 
-            return success
+        entry = self._prepare_file(file_path, repo_name, metadata)
+        if entry is None:
+            return False
 
+        try:
+            return self._add_batch([entry])
         except Exception as e:
             console.print(f"[yellow]Error indexing {file_path}: {e}[/yellow]")
             return False
 
+    @staticmethod
+    def _iter_source_files(repo_path: Path, file_extensions: List[str]):
+        """
+        Walk the repository once, yielding indexable files
+
+        Skipped directories are pruned so they are never descended into;
+        test files are skipped by name.
+        """
+        extensions = tuple(file_extensions)
+        for root, dirs, files in os.walk(repo_path):
+            dirs[:] = [d for d in dirs if d.lower() not in INDEX_SKIP_DIRS]
+            for name in files:
+                if name.endswith(extensions) and not is_test_file(name):
+                    yield Path(root, name)
+
     def index_repository(self, repo_path: Path, repo_name: str, file_extensions: List[str] = ['.py', '.txt', '.md']) -> int:
         """
         Index all files in a repository
 
+        Files are added batch_size at a time rather than one by one; files
+        whose batch could not be added are retried once at the end.
+
         Args:
             repo_path: Path to repository
             repo_name: Repository name
@@ -124,22 +197,46 @@ class ChromaIndexer:
             self.set_collection(repo_name)
 
         indexed_count = 0
-        files_to_index = []
-
-        # Collect files
-        for ext in file_extensions:
-            files_to_index.extend(repo_path.rglob(f"*{ext}"))
+        files_to_index = list(self._iter_source_files(repo_path, file_extensions))
 
         console.print(f"  Found {len(files_to_index)} files to index")
 
-        # Index each file
-        for file_path in files_to_index:
-            # Skip test files and common directories
-            if any(skip in str(file_path) for skip in ['test', '__pycache__', 'node_modules', '.git']):
-                continue
-
-            if self.index_file(file_path, repo_name):
-                indexed_count += 1
+        def add(batch):
+            nonlocal indexed_count
+            if not batch:
+                return
+            try:
+                if self._add_batch(batch):
+                    indexed_count += len(batch)
+            except Exception as e:
+                console.print(f"[yellow]Error indexing batch of {len(batch)} files: {e}[/yellow]")
+
+        # Read files batch_size at a time on a thread pool (reads release the
+        # GIL), reading the next batch while the current one is embedded; at
+        # most two batches of file contents are held at once
+        chunks = [files_to_index[i:i + self.batch_size] for i in range(0, len(files_to_index), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=READ_WORKERS) as pool:
+            pending = None
+            for chunk in chunks:
+                reading = pool.map(self._prepare_file, chunk, repeat(repo_name))
+                if pending is not None:
+                    add([entry for entry in pending if entry is not None])
+                pending = reading
+            if pending is not None:
+                add([entry for entry in pending if entry is not None])
+
+        # One more pass over documents whose add failed; embeddings that did
+        # succeed are cached, so only the missing ones are requested again
+        failed = self.client.pop_failed_ids(self.current_collection)
+        if failed:
+            paths = {self._doc_id(file_path, repo_name): file_path for file_path in files_to_index}
+            retry_files = [paths[doc_id] for doc_id in failed if doc_id in paths]
+            console.print(f"  Retrying {len(retry_files)} files that failed to index")
+            for i in range(0, len(retry_files), self.batch_size):
+                entries = (self._prepare_file(file_path, repo_name) for file_path in retry_files[i:i + self.batch_size])
+                add([entry for entry in entries if entry is not None])
+            # Files failing twice are only logged
+            self.client.pop_failed_ids(self.current_collection)
 
         console.print(f"[green][OK] Indexed {indexed_count}/{len(files_to_index)} files[/green]")
         return indexed_count
@@ -273,14 +370,17 @@ class ChromaIndexer:
             console.print(f"[red]Error resetting collection: {e}[/red]")
             return False
 
-    def list_collections(self) -> List[Dict]:
+    def list_collections(self, with_counts: bool = True) -> List[Dict]:
         """
         List all collections
 
+        Args:
+            with_counts: Include each collection's document count
+
         Returns:
             List of collection metadata
         """
-        return self.client.list_collections()
+        return self.client.list_collections(with_counts=with_counts)
 
     def delete_collection(self, collection_name: str) -> bool:
         """
@@ -320,111 +420,102 @@ class ChromaIndexer:
 
         console.print(f"[blue]Generating architecture file for: {repo_name}[/blue]")
 
-        # Common directories to skip
-        skip_dirs = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'env',
-                     '.pytest_cache', '.mypy_cache', 'dist', 'build', '.egg-info',
-                     '.tox', '.coverage', 'htmlcov', '.idea', '.vscode'}
+        # Summary accumulators, filled in while the tree is built
+        file_counts = {}
+        total_files = 0
+        total_size = 0
+
+        def skip(name: str) -> bool:
+            return name in ARCHITECTURE_SKIP_DIRS or name.endswith('.egg-info')
 
-        # Collect all files and directories
-        def build_tree(directory: Path, prefix: str = "") -> List[str]:
+        # Single pass over the tree: os.scandir entries carry their type, so
+        # only files need a stat() call (for the size). Lines are yielded as
+        # they are produced and written straight to the file.
+        def build_tree(directory: str, prefix: str = "") -> Iterator[str]:
             """Recursively build tree structure"""
-            lines = []
+            nonlocal total_files, total_size
 
             try:
-                # Get all items in directory
-                items = sorted(directory.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower()))
-
-                # Filter out skip_dirs
-                items = [item for item in items if item.name not in skip_dirs]
-
-                for i, item in enumerate(items):
-                    is_last_item = (i == len(items) - 1)
-
-                    # Create tree characters
-                    if prefix == "":
-                        connector = ""
-                        new_prefix = ""
-                    else:
-                        connector = "└── " if is_last_item else "├── "
-                        new_prefix = prefix + ("    " if is_last_item else "│   ")
-
-                    # Add item to tree
-                    if item.is_dir():
-                        lines.append(f"{prefix}{connector}{item.name}/")
-                        # Recursively add subdirectory contents
-                        lines.extend(build_tree(item, new_prefix))
-                    else:
-                        # Add file size info
-                        try:
-                            size = item.stat().st_size
-                            size_str = f" ({size:,} bytes)" if size < 1024 else f" ({size/1024:.1f} KB)"
-                        except:
-                            size_str = ""
-                        lines.append(f"{prefix}{connector}{item.name}{size_str}")
-
+                with os.scandir(directory) as it:
+                    entries = [(entry, entry.is_dir()) for entry in it if not skip(entry.name)]
             except PermissionError:
-                lines.append(f"{prefix}[Permission Denied]")
-
-            return lines
-
-        # Build the architecture
-        lines = [
-            "=" * 80,
-            f"PROJECT ARCHITECTURE: {repo_name}",
-            "=" * 80,
-            f"Repository Path: {repo_path}",
-            f"Generated: {Path(__file__).parent.parent.parent}",
-            "",
-            "Directory Structure:",
-            "-" * 80,
-            ""
-        ]
-
-        # Add tree structure
-        lines.append(f"{repo_path.name}/")
-        lines.extend(build_tree(repo_path))
-
-        # Add summary statistics
-        lines.extend([
-            "",
-            "-" * 80,
-            "Summary:",
-            "-" * 80,
-        ])
-
-        # Count files by extension
-        file_counts = {}
-        total_files = 0
-        total_size = 0
+                yield f"{prefix}[Permission Denied]"
+                return
+            entries.sort(key=lambda x: (not x[1], x[0].name.lower()))
 
-        for file_path in repo_path.rglob("*"):
-            if file_path.is_file() and not any(skip in str(file_path) for skip in skip_dirs):
-                ext = file_path.suffix or "[no extension]"
+            for i, (entry, is_dir) in enumerate(entries):
+                is_last_item = (i == len(entries) - 1)
+
+                # Create tree characters
+                if prefix == "":
+                    connector = ""
+                    new_prefix = ""
+                else:
+                    connector = "└── " if is_last_item else "├── "
+                    new_prefix = prefix + ("    " if is_last_item else "│   ")
+
+                # Add item to tree
+                if is_dir:
+                    yield f"{prefix}{connector}{entry.name}/"
+                    # Recursively add subdirectory contents
+                    yield from build_tree(entry.path, new_prefix)
+                    continue
+
+                ext = os.path.splitext(entry.name)[1] or "[no extension]"
                 file_counts[ext] = file_counts.get(ext, 0) + 1
                 total_files += 1
+
+                # Add file size info
                 try:
-                    total_size += file_path.stat().st_size
-                except:
-                    pass
-
-        lines.append(f"Total Files: {total_files}")
-        lines.append(f"Total Size: {total_size:,} bytes ({total_size/1024/1024:.2f} MB)")
-        lines.append("")
-        lines.append("Files by Extension:")
-
-        for ext, count in sorted(file_counts.items(), key=lambda x: x[1], reverse=True):
-            lines.append(f"  {ext}: {count} file(s)")
-
-        lines.extend([
-            "",
-            "=" * 80,
-            "End of Architecture",
-            "=" * 80
-        ])
-
-        # Write to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+                    size = entry.stat().st_size
+                    total_size += size
+                    size_str = f" ({size:,} bytes)" if size < 1024 else f" ({size/1024:.1f} KB)"
+                except OSError:
+                    size_str = ""
+                yield f"{prefix}{connector}{entry.name}{size_str}"
+
+        def write_lines(f, lines):
+            f.writelines(f"{line}\n" for line in lines)
+
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            # Header
+            write_lines(f, [
+                "=" * 80,
+                f"PROJECT ARCHITECTURE: {repo_name}",
+                "=" * 80,
+                f"Repository Path: {repo_path}",
+                f"Generated: {datetime.now().isoformat(timespec='seconds')}",
+                "",
+                "Directory Structure:",
+                "-" * 80,
+                ""
+            ])
+
+            # Tree structure, streamed
+            write_lines(f, [f"{repo_path.name}/"])
+            write_lines(f, build_tree(str(repo_path)))
+
+            # Summary statistics (complete once the tree has been written)
+            write_lines(f, [
+                "",
+                "-" * 80,
+                "Summary:",
+                "-" * 80,
+                f"Total Files: {total_files}",
+                f"Total Size: {total_size:,} bytes ({total_size/1024/1024:.2f} MB)",
+                "",
+                "Files by Extension:",
+            ])
+            write_lines(f, (
+                f"  {ext}: {count} file(s)"
+                for ext, count in sorted(file_counts.items(), key=lambda x: x[1], reverse=True)
+            ))
+            write_lines(f, [
+                "",
+                "=" * 80,
+                "End of Architecture",
+                "=" * 80
+            ])
 
         console.print(f"[green][OK] Architecture file saved to: {output_file}[/green]")
         return output_file
@@ -0,0 +1,98 @@
+"""
+Persistent embedding cache, so unchanged files and repeated queries
+are not sent to the embedding API again
+"""
+import hashlib
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Sequence
+
+import numpy as np
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+class EmbeddingCache:
+    """SQLite table of embedding vectors keyed by SHA-256(model + text)"""
+
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) the cache database
+
+        Args:
+            db_path: SQLite file to store vectors in
+        """
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+
+        # One connection shared by all threads; sqlite3 calls are serialized by the lock
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._lock = Lock()
+        with self._lock:
+            # WAL lets readers proceed during writes and avoids an fsync per
+            # commit; losing the last few entries on a crash only costs re-embedding
+            for pragma in SQLITE_PRAGMAS:
+                self._conn.execute(pragma)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache ("
+                "hash BLOB NOT NULL, model TEXT NOT NULL, vec BLOB NOT NULL, "
+                "PRIMARY KEY (hash, model))"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        """Cache key for a text embedded with a given model"""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).digest()
+
+    def get_many(self, model: str, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up several embeddings at once
+
+        Args:
+            model: Embedding model name
+            keys: Keys from EmbeddingCache.key
+
+        Returns:
+            Dict of key -> float32 vector for the keys that were cached
+        """
+        found: Dict[bytes, np.ndarray] = {}
+        unique = list(dict.fromkeys(keys))
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM embedding_cache WHERE model = ? AND hash IN ({placeholders})",
+                    [model, *chunk],
+                ).fetchall()
+            for hash_, vec in rows:
+                found[hash_] = np.frombuffer(vec, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, items: Dict[bytes, Sequence[float]]):
+        """
+        Store embeddings (existing entries are kept)
+
+        Args:
+            model: Embedding model name
+            items: Dict of key -> vector
+        """
+        if not items:
+            return
+        rows = [(key, model, np.asarray(vec, dtype=np.float32).tobytes()) for key, vec in items.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embedding_cache (hash, model, vec) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
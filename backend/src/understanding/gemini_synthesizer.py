@@ -1,14 +1,79 @@
 """
 Google Gemini integration for paper-to-code synthesis
 """
+import asyncio
+import logging
+import os
+import tempfile
+import time
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
-from typing import Dict, List, Optional
-from rich.console import Console
+from pydantic import BaseModel
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import json
 from pathlib import Path
 
-console = Console()
+from utils.paper_cache import get_cache
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Concept explanations explain_many keeps in flight at once; requests rejected
+# with 429 past the per-key limit are retried with exponential backoff
+EXPLAIN_CONCURRENCY = 4
+EXPLAIN_MAX_ATTEMPTS = 5
+
+# Batch jobs take minutes to hours; no point checking more often than this
+BATCH_POLL_SECONDS = 60
+BATCH_DONE_STATES = frozenset({
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"
+})
+
+# Lifetime of the context cache holding a paper's PDF; it is extended when
+# used with less than PDF_CACHE_REFRESH_SECONDS left
+PDF_CACHE_TTL_SECONDS = 3600
+PDF_CACHE_REFRESH_SECONDS = 600
+# Errors from a request referencing a context cache that is gone (deleted,
+# expired early, or created under another key/project)
+STALE_CACHE_STATUS_CODES = frozenset({400, 403, 404})
+
+# PDFs kept in memory for papers whose context couldn't be cached (sent inline
+# every question); a few papers at a few MB each
+PDF_BYTES_CACHE_SIZE = 8
+
+# Service tiers: background work (concept maps, explanations, examples) can
+# wait for cheaper flex capacity; answers a user is waiting on go priority
+SERVICE_TIER_BACKGROUND = "flex"
+SERVICE_TIER_INTERACTIVE = "priority"
+
+
+class MainConcept(BaseModel):
+    concept: str
+    description: str
+    likely_files: List[str]
+    search_keywords: List[str]
+
+
+class KeyFunction(BaseModel):
+    function_name: str
+    purpose: str
+    file_hint: str
+
+
+class ConceptMap(BaseModel):
+    """Response schema for create_concept_map (Gemini returns matching JSON)"""
+    main_concepts: List[MainConcept]
+    key_functions: List[KeyFunction]
+    architecture_overview: str
+
+
+# Structured output: the response is guaranteed to be bare JSON matching ConceptMap
+CONCEPT_MAP_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=ConceptMap,
+    temperature=0.3
+)
 
 
 class GeminiSynthesizer:
@@ -27,23 +92,68 @@ class GeminiSynthesizer:
             "max_output_tokens": 8192,
         }
 
-    def create_concept_map(self, paper_info: Dict, readme_content: str, repo_structure: Dict) -> Dict:
-        """
-        Create a mapping of paper concepts to code
-
-        Args:
-            paper_info: Paper metadata
-            readme_content: Repository README
-            repo_structure: Repository file structure
-
-        Returns:
-            Concept mapping dictionary
-        """
+        # pdf_path -> (context cache name or None if caching failed, expires_at epoch seconds)
+        self._pdf_caches: Dict[str, tuple] = {}
+        # pdf_path -> PDF bytes, so inline requests don't reread the file every question
+        self._pdf_bytes = TTLCache(maxsize=PDF_BYTES_CACHE_SIZE, ttl=PDF_CACHE_TTL_SECONDS)
+
+        # Cleared if the API rejects the service tier field, so later calls skip it
+        self._service_tiers = True
+
+    def _tiered(self, config: Optional[types.GenerateContentConfig], tier: str) -> Optional[types.GenerateContentConfig]:
+        """Copy of config that requests the given service tier"""
+        if not self._service_tiers:
+            return config
+        http_options = types.HttpOptions(extra_body={"serviceTier": tier})
+        if config is None:
+            return types.GenerateContentConfig(http_options=http_options)
+        return config.model_copy(update={"http_options": http_options})
+
+    def _tier_rejected(self, error: genai_errors.ClientError) -> bool:
+        """Whether a request failed because the service tier isn't supported; disables tiers if so"""
+        if self._service_tiers and error.code == 400 and "tier" in str(error).lower():
+            logger.warning("Service tiers not supported for this model/key, using standard tier")
+            self._service_tiers = False
+            return True
+        return False
+
+    def _generate(self, tier: str, *, config: Optional[types.GenerateContentConfig] = None, **kwargs):
+        """client.models.generate_content on the given service tier (standard if unsupported)"""
         try:
-            console.print(f"[blue]Creating concept map with Gemini...[/blue]")
-
-            # Build prompt
-            prompt = f"""You are analyzing a research paper and its code implementation.
+            return self.client.models.generate_content(config=self._tiered(config, tier), **kwargs)
+        except genai_errors.ClientError as e:
+            if not self._tier_rejected(e):
+                raise
+        return self.client.models.generate_content(config=config, **kwargs)
+
+    async def _agenerate(self, tier: str, *, config: Optional[types.GenerateContentConfig] = None, **kwargs):
+        """Async _generate"""
+        try:
+            return await self.client.aio.models.generate_content(config=self._tiered(config, tier), **kwargs)
+        except genai_errors.ClientError as e:
+            if not self._tier_rejected(e):
+                raise
+        return await self.client.aio.models.generate_content(config=config, **kwargs)
+
+    def _generate_stream(self, tier: str, *, config: Optional[types.GenerateContentConfig] = None, **kwargs):
+        """Streaming _generate"""
+        chunks = self.client.models.generate_content_stream(config=self._tiered(config, tier), **kwargs)
+        try:
+            # The request is sent (and rejected) on the first chunk
+            first = next(chunks, None)
+        except genai_errors.ClientError as e:
+            if not self._tier_rejected(e):
+                raise
+            yield from self.client.models.generate_content_stream(config=config, **kwargs)
+            return
+        if first is not None:
+            yield first
+            yield from chunks
+
+    @staticmethod
+    def _concept_map_prompt(paper_info: Dict, readme_content: str, repo_structure: Dict) -> str:
+        """Build the create_concept_map prompt"""
+        return f"""You are analyzing a research paper and its code implementation.
 
 PAPER INFORMATION:
 Title: {paper_info['title']}
@@ -83,50 +193,80 @@ Focus on the 3-5 most important concepts from the paper.
 Return ONLY valid JSON, no additional text.
 """
 
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+    def create_concept_map(self, paper_info: Dict, readme_content: str, repo_structure: Dict) -> Dict:
+        """
+        Create a mapping of paper concepts to code
 
-            # Parse JSON response
-            response_text = response.text.strip()
+        Args:
+            paper_info: Paper metadata
+            readme_content: Repository README
+            repo_structure: Repository file structure
 
-            # Clean markdown code blocks if present
-            if response_text.startswith("```"):
-                response_text = response_text.split("```")[1]
-                if response_text.startswith("json"):
-                    response_text = response_text[4:]
-                response_text = response_text.strip()
+        Returns:
+            Concept mapping dictionary
+        """
+        response_text = ""
+        try:
+            logger.info("Creating concept map with Gemini...")
 
+            response = self._generate(
+                SERVICE_TIER_BACKGROUND,
+                model=self.model_name,
+                contents=self._concept_map_prompt(paper_info, readme_content, repo_structure),
+                config=CONCEPT_MAP_CONFIG
+            )
+            response_text = response.text
             concept_map = json.loads(response_text)
 
-            console.print(f"[green]✓ Created concept map with {len(concept_map.get('main_concepts', []))} concepts[/green]")
+            logger.info("Created concept map with %s concepts", len(concept_map.get('main_concepts', [])))
             return concept_map
 
         except json.JSONDecodeError as e:
-            console.print(f"[red]Failed to parse JSON response: {e}[/red]")
-            console.print(f"Response was: {response_text[:200]}...")
+            logger.error("Failed to parse JSON response: %s (response was: %.200s...)", e, response_text)
             return self._create_fallback_map(paper_info)
         except Exception as e:
-            console.print(f"[red]Error creating concept map: {e}[/red]")
+            logger.error("Error creating concept map: %s", e)
             return self._create_fallback_map(paper_info)
 
-    def explain_code_concept(self, concept: str, code_snippet: str, paper_context: str) -> str:
+    async def acreate_concept_map(self, paper_info: Dict, readme_content: str, repo_structure: Dict) -> Dict:
         """
-        Explain how code implements a paper concept
+        Async variant of create_concept_map (uses the SDK's aio client)
 
         Args:
-            concept: Concept name from paper
-            code_snippet: Relevant code
-            paper_context: Context from paper
+            paper_info: Paper metadata
+            readme_content: Repository README
+            repo_structure: Repository file structure
 
         Returns:
-            Explanation text
+            Concept mapping dictionary
         """
+        response_text = ""
         try:
-            console.print(f"[blue]Explaining concept: {concept}[/blue]")
+            logger.info("Creating concept map with Gemini (async)...")
 
-            prompt = f"""You are explaining how research paper concepts are implemented in code.
+            response = await self._agenerate(
+                SERVICE_TIER_BACKGROUND,
+                model=self.model_name,
+                contents=self._concept_map_prompt(paper_info, readme_content, repo_structure),
+                config=CONCEPT_MAP_CONFIG
+            )
+            response_text = response.text
+            concept_map = json.loads(response_text)
+
+            logger.info("Created concept map with %s concepts", len(concept_map.get('main_concepts', [])))
+            return concept_map
+
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse JSON response: %s (response was: %.200s...)", e, response_text)
+            return self._create_fallback_map(paper_info)
+        except Exception as e:
+            logger.error("Error creating concept map: %s", e)
+            return self._create_fallback_map(paper_info)
+
+    @staticmethod
+    def _explain_prompt(concept: str, code_snippet: str, paper_context: str) -> str:
+        """Build the explain_code_concept prompt"""
+        return f"""You are explaining how research paper concepts are implemented in code.
 
 CONCEPT FROM PAPER: {concept}
 PAPER CONTEXT: {paper_context[:500]}
@@ -145,42 +285,223 @@ Provide a clear, concise explanation (2-3 paragraphs) that:
 Be specific about code details (function names, variable names, logic flow).
 """
 
-            response = self.client.models.generate_content(
+    def explain_code_concept(self, concept: str, code_snippet: str, paper_context: str) -> str:
+        """
+        Explain how code implements a paper concept
+
+        Args:
+            concept: Concept name from paper
+            code_snippet: Relevant code
+            paper_context: Context from paper
+
+        Returns:
+            Explanation text
+        """
+        try:
+            logger.info("Explaining concept: %s", concept)
+
+            response = self._generate(
+                SERVICE_TIER_BACKGROUND,
                 model=self.model_name,
-                contents=prompt
+                contents=self._explain_prompt(concept, code_snippet, paper_context)
             )
 
             explanation = response.text.strip()
-            console.print(f"[green]✓ Generated explanation ({len(explanation)} chars)[/green]")
+            logger.info("Generated explanation (%s chars)", len(explanation))
             return explanation
 
         except Exception as e:
-            console.print(f"[red]Error generating explanation: {e}[/red]")
+            logger.error("Error generating explanation: %s", e)
             return f"Could not generate explanation for {concept}. Error: {str(e)}"
 
-    def answer_question(self, question: str, code_context: str, paper_info: Dict) -> str:
+    async def aexplain_code_concept(self, concept: str, code_snippet: str, paper_context: str) -> str:
         """
-        Answer a question about the paper and code using PDF context
+        Async variant of explain_code_concept (uses the SDK's aio client);
+        retries with exponential backoff when rate limited
 
         Args:
-            question: User question
-            code_context: Relevant code snippets from search
-            paper_info: Paper metadata (must include pdf_path)
+            concept: Concept name from paper
+            code_snippet: Relevant code
+            paper_context: Context from paper
 
         Returns:
-            Answer text
+            Explanation text
+        """
+        try:
+            logger.info("Explaining concept (async): %s", concept)
+
+            contents = self._explain_prompt(concept, code_snippet, paper_context)
+            for attempt in range(EXPLAIN_MAX_ATTEMPTS):
+                try:
+                    response = await self._agenerate(
+                        SERVICE_TIER_BACKGROUND,
+                        model=self.model_name,
+                        contents=contents
+                    )
+                    break
+                except genai_errors.APIError as e:
+                    if e.code != 429 or attempt == EXPLAIN_MAX_ATTEMPTS - 1:
+                        raise
+                    logger.warning("Rate limited explaining %s, retrying in %ss", concept, 2 ** attempt)
+                    await asyncio.sleep(2 ** attempt)
+
+            explanation = response.text.strip()
+            logger.info("Generated explanation (%s chars)", len(explanation))
+            return explanation
+
+        except Exception as e:
+            logger.error("Error generating explanation: %s", e)
+            return f"Could not generate explanation for {concept}. Error: {str(e)}"
+
+    async def explain_many(
+        self,
+        concepts: List[Tuple[str, str, str]],
+        max_concurrent: int = EXPLAIN_CONCURRENCY
+    ) -> List[str]:
+        """
+        Explain several concepts with their requests in flight together
+
+        Args:
+            concepts: (concept, code_snippet, paper_context) tuples
+            max_concurrent: Requests allowed in flight at once
+
+        Returns:
+            Explanations, in the same order as concepts
         """
+        slots = asyncio.Semaphore(max_concurrent)
+
+        async def explain(concept: str, code_snippet: str, paper_context: str) -> str:
+            async with slots:
+                return await self.aexplain_code_concept(concept, code_snippet, paper_context)
+
+        return await asyncio.gather(*(explain(*item) for item in concepts))
+
+    def _read_pdf(self, pdf_path: str) -> bytes:
+        """PDF bytes, read from disk once per paper"""
+        data = self._pdf_bytes.get(pdf_path)
+        if data is None:
+            data = Path(pdf_path).read_bytes()
+            self._pdf_bytes.set(pdf_path, data)
+        return data
+
+    def _remember_pdf_cache(self, pdf_path: str, arxiv_id: Optional[str], name: Optional[str]) -> Optional[str]:
+        """Record a PDF context cache in memory and, for cached papers, in PaperCache"""
+        expires_at = time.time() + PDF_CACHE_TTL_SECONDS
+        self._pdf_caches[pdf_path] = (name, expires_at)
+
+        if name and arxiv_id:
+            cache = get_cache()
+            if cache.exists(arxiv_id):
+                cache.update(arxiv_id, {
+                    "gemini_cache_name": name,
+                    "gemini_cache_model": self.model_name,
+                    "gemini_cache_pdf": pdf_path,
+                    "gemini_cache_expires_at": expires_at,
+                })
+        return name
+
+    def _stale_pdf_cache(
+        self,
+        error: genai_errors.ClientError,
+        config: Optional[types.GenerateContentConfig],
+        paper_info: Dict
+    ) -> bool:
+        """Whether a request failed because its PDF context cache is gone; forgets the cache if so"""
+        if config is None or not config.cached_content or error.code not in STALE_CACHE_STATUS_CODES:
+            return False
+
+        logger.warning("PDF context cache %s unusable (%s), sending the PDF inline", config.cached_content, error.code)
+        self._pdf_caches.pop(paper_info.get("pdf_path"), None)
+        arxiv_id = paper_info.get("arxiv_id")
+        if arxiv_id:
+            cache = get_cache()
+            if cache.exists(arxiv_id):
+                cache.update(arxiv_id, {
+                    "gemini_cache_name": None,
+                    "gemini_cache_model": None,
+                    "gemini_cache_pdf": None,
+                    "gemini_cache_expires_at": None,
+                })
+        return True
+
+    def _pdf_cache_name(self, pdf_path: str, paper_info: Dict) -> Optional[str]:
+        """
+        Name of a Gemini context cache holding the paper PDF, created on first use
+
+        Questions then reference the cache instead of re-sending (and
+        re-tokenizing) the whole PDF each time.
+
+        Args:
+            pdf_path: Local PDF path
+            paper_info: Paper metadata (arxiv_id is used to persist the cache name)
+
+        Returns:
+            Cache name, or None if the PDF could not be cached (send it inline)
+        """
+        now = time.time()
+        arxiv_id = paper_info.get("arxiv_id")
+
+        entry = self._pdf_caches.get(pdf_path)
+        if entry is None and arxiv_id:
+            # Another process (e.g. a previous server run) may have created one
+            stored = get_cache().peek(arxiv_id)
+            if (stored and stored.get("gemini_cache_name")
+                    and stored.get("gemini_cache_model") == self.model_name
+                    and stored.get("gemini_cache_pdf") == pdf_path):
+                entry = (stored["gemini_cache_name"], stored.get("gemini_cache_expires_at", 0))
+                self._pdf_caches[pdf_path] = entry
+
+        if entry is not None:
+            name, expires_at = entry
+            if now < expires_at - PDF_CACHE_REFRESH_SECONDS:
+                return name
+            if name and now < expires_at:
+                # Still in use; extend it rather than uploading the PDF again
+                try:
+                    self.client.caches.update(
+                        name=name,
+                        config=types.UpdateCachedContentConfig(ttl=f"{PDF_CACHE_TTL_SECONDS}s")
+                    )
+                    return self._remember_pdf_cache(pdf_path, arxiv_id, name)
+                except Exception:
+                    pass
+
         try:
-            console.print(f"[blue]Answering question with Gemini (using PDF + code)...[/blue]")
+            cached = self.client.caches.create(
+                model=self.model_name,
+                config=types.CreateCachedContentConfig(
+                    contents=[types.Content(role="user", parts=[
+                        types.Part.from_bytes(data=self._read_pdf(pdf_path), mime_type='application/pdf')
+                    ])],
+                    ttl=f"{PDF_CACHE_TTL_SECONDS}s"
+                )
+            )
+            logger.info("Cached PDF context: %s", cached.name)
+            return self._remember_pdf_cache(pdf_path, arxiv_id, cached.name)
+        except Exception as e:
+            # e.g. PDF below the model's minimum cacheable size; don't retry every question
+            logger.warning("Could not cache PDF context, sending it inline: %s", e)
+            return self._remember_pdf_cache(pdf_path, arxiv_id, None)
+
+    def _answer_contents(self, question: str, code_context: str, paper_info: Dict, use_cache: bool = True) -> tuple:
+        """
+        Build the Gemini request for answering a question
 
-            # Check if we have a PDF path
-            pdf_path = paper_info.get('pdf_path')
+        Args:
+            question: User question
+            code_context: Relevant code snippets from search
+            paper_info: Paper metadata (uses pdf_path when available)
+            use_cache: Reference the PDF context cache; False sends the PDF inline
 
-            if pdf_path and Path(pdf_path).exists():
-                # Load PDF
-                pdf_bytes = Path(pdf_path).read_bytes()
+        Returns:
+            (contents, used_pdf, config) tuple; config references the PDF
+            context cache when there is one, else None
+        """
+        # Check if we have a PDF path
+        pdf_path = paper_info.get('pdf_path')
 
-                prompt = f"""You are an expert at explaining research paper implementations. Answer CONCISELY (2-3 paragraphs maximum).
+        if pdf_path and Path(pdf_path).exists():
+            prompt = f"""You are an expert at explaining research paper implementations. Answer CONCISELY (2-3 paragraphs maximum).
 
 RELEVANT CODE FROM REPOSITORY:
 {code_context[:4000]}
@@ -215,24 +536,23 @@ IMPORTANT RULES:
 - Be precise, not verbose
 """
 
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=[
-                        types.Part.from_bytes(
-                            data=pdf_bytes,
-                            mime_type='application/pdf'
-                        ),
-                        prompt
-                    ]
-                )
+            cache_name = self._pdf_cache_name(pdf_path, paper_info) if use_cache else None
+            if cache_name:
+                return prompt, True, types.GenerateContentConfig(cached_content=cache_name)
 
-                answer = response.text.strip()
-                console.print(f"[green]✓ Generated answer using PDF + code context[/green]")
-                return answer
+            # Load PDF
+            pdf_bytes = self._read_pdf(pdf_path)
+            contents = [
+                types.Part.from_bytes(
+                    data=pdf_bytes,
+                    mime_type='application/pdf'
+                ),
+                prompt
+            ]
+            return contents, True, None
 
-            else:
-                # Fallback: use only abstract if no PDF
-                prompt = f"""You are an expert at explaining research paper implementations. Answer CONCISELY (2-3 paragraphs maximum).
+        # Fallback: use only abstract if no PDF
+        prompt = f"""You are an expert at explaining research paper implementations. Answer CONCISELY (2-3 paragraphs maximum).
 
 PAPER: {paper_info['title']}
 ABSTRACT: {paper_info.get('summary', '')[:800]}
@@ -260,37 +580,160 @@ IMPORTANT RULES:
 - Be precise, not verbose
 """
 
-                response = self.client.models.generate_content(
+        return prompt, False, None
+
+    def answer_question(self, question: str, code_context: str, paper_info: Dict) -> str:
+        """
+        Answer a question about the paper and code using PDF context
+
+        Args:
+            question: User question
+            code_context: Relevant code snippets from search
+            paper_info: Paper metadata (must include pdf_path)
+
+        Returns:
+            Answer text
+        """
+        try:
+            logger.info("Answering question with Gemini (using PDF + code)...")
+
+            contents, used_pdf, config = self._answer_contents(question, code_context, paper_info)
+
+            try:
+                response = self._generate(
+                    SERVICE_TIER_INTERACTIVE,
                     model=self.model_name,
-                    contents=prompt
+                    contents=contents,
+                    config=config
+                )
+            except genai_errors.ClientError as e:
+                if not self._stale_pdf_cache(e, config, paper_info):
+                    raise
+                contents, used_pdf, config = self._answer_contents(
+                    question, code_context, paper_info, use_cache=False
+                )
+                response = self._generate(
+                    SERVICE_TIER_INTERACTIVE,
+                    model=self.model_name,
+                    contents=contents,
+                    config=config
                 )
 
-                answer = response.text.strip()
-                console.print(f"[green]✓ Generated answer (without PDF)[/green]")
-                return answer
+            answer = response.text.strip()
+            if used_pdf:
+                logger.info("Generated answer using PDF + code context")
+            else:
+                logger.info("Generated answer (without PDF)")
+            return answer
 
         except Exception as e:
-            console.print(f"[red]Error answering question: {e}[/red]")
-            import traceback
-            console.print(f"[dim]{traceback.format_exc()}[/dim]")
+            logger.exception("Error answering question: %s", e)
             return f"I encountered an error while answering: {str(e)}"
 
-    def generate_minimal_example(self, function_name: str, code_snippet: str, paper_context: str) -> str:
+    async def aanswer_question(self, question: str, code_context: str, paper_info: Dict) -> str:
         """
-        Generate a minimal working example
+        Async variant of answer_question (uses the SDK's aio client)
 
         Args:
-            function_name: Name of function/class to demonstrate
-            code_snippet: Source code
-            paper_context: Context from paper
+            question: User question
+            code_context: Relevant code snippets from search
+            paper_info: Paper metadata (uses pdf_path when available)
 
         Returns:
-            Runnable Python code
+            Answer text
+        """
+        try:
+            logger.info("Answering question with Gemini (async)...")
+
+            contents, used_pdf, config = self._answer_contents(question, code_context, paper_info)
+
+            try:
+                response = await self._agenerate(
+                    SERVICE_TIER_INTERACTIVE,
+                    model=self.model_name,
+                    contents=contents,
+                    config=config
+                )
+            except genai_errors.ClientError as e:
+                if not self._stale_pdf_cache(e, config, paper_info):
+                    raise
+                contents, used_pdf, config = self._answer_contents(
+                    question, code_context, paper_info, use_cache=False
+                )
+                response = await self._agenerate(
+                    SERVICE_TIER_INTERACTIVE,
+                    model=self.model_name,
+                    contents=contents,
+                    config=config
+                )
+
+            answer = response.text.strip()
+            if used_pdf:
+                logger.info("Generated answer using PDF + code context")
+            else:
+                logger.info("Generated answer (without PDF)")
+            return answer
+
+        except Exception as e:
+            logger.error("Error answering question: %s", e)
+            return f"I encountered an error while answering: {str(e)}"
+
+    def answer_question_stream(self, question: str, code_context: str, paper_info: Dict) -> Iterator[str]:
+        """
+        Stream an answer as Gemini generates it (same prompt as answer_question)
+
+        Args:
+            question: User question
+            code_context: Relevant code snippets from search
+            paper_info: Paper metadata (uses pdf_path when available)
+
+        Yields:
+            Answer text chunks
         """
         try:
-            console.print(f"[blue]Generating MWE for: {function_name}[/blue]")
+            logger.info("Streaming answer with Gemini...")
 
-            prompt = f"""You are generating a minimal working example (MWE) for a research paper implementation.
+            contents, _, config = self._answer_contents(question, code_context, paper_info)
+
+            chunks = self._generate_stream(
+                SERVICE_TIER_INTERACTIVE,
+                model=self.model_name,
+                contents=contents,
+                config=config
+            )
+            try:
+                # The request is sent (and rejected) on the first chunk
+                first = next(chunks, None)
+            except genai_errors.ClientError as e:
+                if not self._stale_pdf_cache(e, config, paper_info):
+                    raise
+                contents, _, config = self._answer_contents(
+                    question, code_context, paper_info, use_cache=False
+                )
+                chunks = self._generate_stream(
+                    SERVICE_TIER_INTERACTIVE,
+                    model=self.model_name,
+                    contents=contents,
+                    config=config
+                )
+                first = next(chunks, None)
+
+            if first is not None and first.text:
+                yield first.text
+            for chunk in chunks:
+                if chunk.text:
+                    yield chunk.text
+
+            logger.info("Streamed answer")
+
+        except Exception as e:
+            logger.error("Error streaming answer: %s", e)
+            yield f"I encountered an error while answering: {str(e)}"
+
+    @staticmethod
+    def _minimal_example_prompt(function_name: str, code_snippet: str, paper_context: str) -> str:
+        """Build the generate_minimal_example prompt"""
+        return f"""You are generating a minimal working example (MWE) for a research paper implementation.
 
 PAPER CONTEXT: {paper_context[:500]}
 
@@ -313,27 +756,215 @@ Requirements:
 Return ONLY the Python code, properly formatted.
 """
 
-            response = self.client.models.generate_content(
+    @staticmethod
+    def _clean_minimal_example(mwe: str) -> str:
+        """Strip markdown code fences from a generated example"""
+        mwe = mwe.strip()
+
+        # Clean markdown code blocks if present
+        if mwe.startswith("```"):
+            mwe = mwe.split("```")[1]
+            if mwe.startswith("python"):
+                mwe = mwe[6:]
+            mwe = mwe.strip()
+
+        return mwe
+
+    def generate_minimal_example(self, function_name: str, code_snippet: str, paper_context: str) -> str:
+        """
+        Generate a minimal working example
+
+        Args:
+            function_name: Name of function/class to demonstrate
+            code_snippet: Source code
+            paper_context: Context from paper
+
+        Returns:
+            Runnable Python code
+        """
+        try:
+            logger.info("Generating MWE for: %s", function_name)
+
+            response = self._generate(
+                SERVICE_TIER_BACKGROUND,
                 model=self.model_name,
-                contents=prompt
+                contents=self._minimal_example_prompt(function_name, code_snippet, paper_context)
             )
 
-            mwe = response.text.strip()
+            mwe = self._clean_minimal_example(response.text)
+            logger.info("Generated MWE (%s lines)", len(mwe.split(chr(10))))
+            return mwe
+
+        except Exception as e:
+            logger.error("Error generating MWE: %s", e)
+            return f"# Error generating MWE: {str(e)}"
 
-            # Clean markdown code blocks if present
-            if mwe.startswith("```"):
-                mwe = mwe.split("```")[1]
-                if mwe.startswith("python"):
-                    mwe = mwe[6:]
-                mwe = mwe.strip()
+    async def agenerate_minimal_example(self, function_name: str, code_snippet: str, paper_context: str) -> str:
+        """
+        Async variant of generate_minimal_example (uses the SDK's aio client)
 
-            console.print(f"[green]✓ Generated MWE ({len(mwe.split(chr(10)))} lines)[/green]")
+        Args:
+            function_name: Name of function/class to demonstrate
+            code_snippet: Source code
+            paper_context: Context from paper
+
+        Returns:
+            Runnable Python code
+        """
+        try:
+            logger.info("Generating MWE (async) for: %s", function_name)
+
+            response = await self._agenerate(
+                SERVICE_TIER_BACKGROUND,
+                model=self.model_name,
+                contents=self._minimal_example_prompt(function_name, code_snippet, paper_context)
+            )
+
+            mwe = self._clean_minimal_example(response.text)
+            logger.info("Generated MWE (%s lines)", len(mwe.split(chr(10))))
             return mwe
 
         except Exception as e:
-            console.print(f"[red]Error generating MWE: {e}[/red]")
+            logger.error("Error generating MWE: %s", e)
             return f"# Error generating MWE: {str(e)}"
 
+    def submit_batch(
+        self,
+        prompts: Dict[str, str],
+        display_name: str = "repo-rover-batch",
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Submit prompts as one Gemini Batch API job
+
+        Batch jobs cost half as much as interactive calls and have their own
+        rate limits, for work nobody is waiting on (e.g. backfilling concept maps).
+
+        Args:
+            prompts: Request key -> prompt text
+            display_name: Job name shown in the Gemini console
+            generation_config: Generation config applied to every request
+
+        Returns:
+            Batch job name, for get_batch_results / wait_for_batch
+        """
+        fd, jsonl_path = tempfile.mkstemp(suffix=".jsonl")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for key, prompt in prompts.items():
+                    request = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+                    if generation_config:
+                        request["generation_config"] = generation_config
+                    line = {"key": key, "request": request}
+                    f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+            uploaded = self.client.files.upload(
+                file=jsonl_path,
+                config=types.UploadFileConfig(display_name=display_name, mime_type="jsonl")
+            )
+        finally:
+            os.unlink(jsonl_path)
+
+        job = self.client.batches.create(
+            model=self.model_name,
+            src=uploaded.name,
+            config={"display_name": display_name}
+        )
+        logger.info("Submitted batch job %s (%s requests)", job.name, len(prompts))
+        return job.name
+
+    def get_batch_results(self, job_name: str) -> Optional[Dict[str, str]]:
+        """
+        Fetch a batch job's results if it has finished
+
+        Args:
+            job_name: Name returned by submit_batch
+
+        Returns:
+            Request key -> response text (failed requests are left out),
+            or None while the job is still running
+
+        Raises:
+            RuntimeError: If the job failed, was cancelled or expired
+        """
+        job = self.client.batches.get(name=job_name)
+        state = job.state.name
+        if state not in BATCH_DONE_STATES:
+            return None
+        if state != "JOB_STATE_SUCCEEDED":
+            raise RuntimeError(f"Batch job {job_name} ended in state {state}")
+
+        results = {}
+        for line in self.client.files.download(file=job.dest.file_name).decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            try:
+                parts = item["response"]["candidates"][0]["content"]["parts"]
+            except (KeyError, IndexError):
+                logger.warning("Batch request %s failed: %s", item.get('key'), item.get('error'))
+                continue
+            results[item["key"]] = "".join(part.get("text", "") for part in parts)
+        return results
+
+    def wait_for_batch(self, job_name: str, poll_seconds: float = BATCH_POLL_SECONDS) -> Dict[str, str]:
+        """
+        Block until a batch job finishes and return its results
+
+        Args:
+            job_name: Name returned by submit_batch
+            poll_seconds: Delay between status checks
+
+        Returns:
+            Request key -> response text
+        """
+        while True:
+            results = self.get_batch_results(job_name)
+            if results is not None:
+                return results
+            time.sleep(poll_seconds)
+
+    def submit_concept_map_batch(self, papers: Dict[str, tuple]) -> str:
+        """
+        Queue concept maps for several papers as one batch job
+
+        Args:
+            papers: arxiv_id -> (paper_info, readme_content, repo_structure)
+
+        Returns:
+            Batch job name
+        """
+        prompts = {
+            arxiv_id: self._concept_map_prompt(*args)
+            for arxiv_id, args in papers.items()
+        }
+        return self.submit_batch(
+            prompts,
+            display_name="repo-rover-concept-maps",
+            # The prompt spells out the structure; raw batch requests take the
+            # REST schema format, so only the JSON mime type is enforced here
+            generation_config={"response_mime_type": "application/json", "temperature": 0.3}
+        )
+
+    def parse_concept_map_results(self, results: Dict[str, str], papers: Dict[str, tuple]) -> Dict[str, Dict]:
+        """
+        Turn concept map batch results into concept maps
+
+        Args:
+            results: Output of get_batch_results / wait_for_batch
+            papers: The dict passed to submit_concept_map_batch
+
+        Returns:
+            arxiv_id -> concept map (the fallback map where a response is missing or invalid)
+        """
+        concept_maps = {}
+        for arxiv_id, (paper_info, _, _) in papers.items():
+            try:
+                concept_maps[arxiv_id] = json.loads(results[arxiv_id])
+            except (KeyError, json.JSONDecodeError):
+                concept_maps[arxiv_id] = self._create_fallback_map(paper_info)
+        return concept_maps
+
     def _create_fallback_map(self, paper_info: Dict) -> Dict:
         """
         Create a basic fallback concept map
@@ -370,21 +1001,38 @@ Return ONLY the Python code, properly formatted.
         Raises:
             Exception if transcription fails
         """
-        try:
-            console.print(f"[blue]Transcribing audio with Gemini...[/blue]")
+        # Read audio file as bytes
+        with open(audio_file_path, 'rb') as f:
+            audio_data = f.read()
+
+        # Determine MIME type based on file extension
+        import mimetypes
+        mime_type, _ = mimetypes.guess_type(audio_file_path)
 
-            # Read audio file as bytes
-            with open(audio_file_path, 'rb') as f:
-                audio_data = f.read()
+        return self.transcribe_audio_bytes(audio_data, mime_type)
+
+    def transcribe_audio_bytes(self, audio_data: bytes, mime_type: Optional[str] = None) -> str:
+        """
+        Transcribe in-memory audio to text using Gemini multimodal API
+
+        Args:
+            audio_data: Raw audio bytes (WebM, WAV, MP3, etc.)
+            mime_type: Audio MIME type (defaults to audio/webm)
+
+        Returns:
+            Transcribed text
+
+        Raises:
+            Exception if transcription fails
+        """
+        try:
+            logger.info("Transcribing audio with Gemini...")
 
-            # Determine MIME type based on file extension
-            import mimetypes
-            mime_type, _ = mimetypes.guess_type(audio_file_path)
             if not mime_type or not mime_type.startswith('audio/'):
                 # Default to webm for browser recordings
                 mime_type = 'audio/webm'
 
-            console.print(f"[blue]Audio file size: {len(audio_data)} bytes, MIME: {mime_type}[/blue]")
+            logger.info("Audio size: %s bytes, MIME: %s", len(audio_data), mime_type)
 
             # Create inline data part
             audio_part = types.Part.from_bytes(
@@ -393,7 +1041,8 @@ Return ONLY the Python code, properly formatted.
             )
 
             # Generate transcription using inline data
-            response = self.client.models.generate_content(
+            response = self._generate(
+                SERVICE_TIER_INTERACTIVE,
                 model=self.model_name,
                 contents=[
                     audio_part,
@@ -402,12 +1051,10 @@ Return ONLY the Python code, properly formatted.
             )
 
             transcription = response.text.strip()
-            console.print(f"[green]✓ Transcription complete: {len(transcription)} characters[/green]")
+            logger.info("Transcription complete: %s characters", len(transcription))
 
             return transcription
 
         except Exception as e:
-            console.print(f"[red]✗ Transcription error: {e}[/red]")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Transcription error: %s", e)
             raise Exception(f"Failed to transcribe audio: {str(e)}")
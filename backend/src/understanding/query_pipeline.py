@@ -1,7 +1,8 @@
 """
 Combined query pipeline: ChromaDB search + Gemini synthesis
 """
-from typing import Dict, Optional
+import asyncio
+from typing import Dict, Iterator, Optional
 from pathlib import Path
 from rich.console import Console
 
@@ -52,6 +53,97 @@ class QueryPipeline:
 
         console.print(f"[green]✓ Pipeline initialized[/green]")
 
+    def _retrieve(self, question: str, num_code_results: int) -> tuple:
+        """
+        Search for relevant code and format it as Gemini context
+
+        Returns:
+            (search_results, code_context) tuple; results are empty if nothing matched
+        """
+        # Step 1: Search for relevant code using ChromaDB (SINGLE SEARCH - OPTIMIZED)
+        metadata_filter = None
+
+        search_results = self.chroma.search(
+            question,
+            num_results=num_code_results,
+            metadata_filter=metadata_filter,
+        )
+
+        if not search_results:
+            return [], ""
+
+        # Step 2: Format code context from already-retrieved results (NO DUPLICATE SEARCH)
+        formatted_results = []
+        for i, result in enumerate(search_results, 1):
+            metadata = result.get("metadata", {})
+            file_path = metadata.get("file_path") or result.get("file_path") or result.get("document_title") or result.get("document_id")
+            line_start = metadata.get("line_start")
+            line_end = metadata.get("line_end")
+            
+            # Clean up file path - remove cloned_repos/repo_name/ prefix for cleaner display
+            if file_path and isinstance(file_path, str):
+                if 'cloned_repos' in file_path:
+                    # Extract path after cloned_repos/repo_name/
+                    parts = file_path.split('cloned_repos/')
+                    if len(parts) > 1:
+                        remaining = parts[1]
+                        # Skip the repo name (first directory)
+                        path_parts = remaining.split('/', 1)
+                        if len(path_parts) > 1:
+                            file_path = path_parts[1]  # Relative path within repo
+                
+                # Also handle Windows paths
+                if 'cloned_repos\\' in file_path:
+                    parts = file_path.split('cloned_repos\\')
+                    if len(parts) > 1:
+                        remaining = parts[1]
+                        path_parts = remaining.split('\\', 1)
+                        if len(path_parts) > 1:
+                            file_path = path_parts[1].replace('\\', '/')  # Normalize to forward slashes
+            
+            if file_path:
+                if line_start and line_end:
+                    header = f"[SOURCE {i}: {file_path}:{line_start}-{line_end}]"
+                else:
+                    header = f"[SOURCE {i}: {file_path}]"
+            else:
+                header = f"[SOURCE {i}]"
+            
+            formatted_results.append(f"{header}\n{result['text']}\n")
+        
+        code_context = "\n".join(formatted_results)
+
+        return search_results, code_context
+
+    @staticmethod
+    def _sources(search_results: list) -> Dict:
+        """Build the code snippet / citation part of a response"""
+        return {
+            "code_snippets": [
+                {
+                    "text": result["text"],
+                    "score": result["score"],
+                    "metadata": result.get("metadata", {}),
+                    "file_path": result.get("file_path"),
+                    "document_title": result.get("document_title"),
+                    "document_id": result.get("document_id"),
+                }
+                for result in search_results
+            ],
+            "citations": [  # NEW: Structured citations for frontend
+                {
+                    "file_path": result.get("metadata", {}).get("file_path") or result.get("file_path"),
+                    "line_start": result.get("metadata", {}).get("line_start"),
+                    "line_end": result.get("metadata", {}).get("line_end"),
+                    "snippet_preview": result["text"][:200] + "..." if len(result["text"]) > 200 else result["text"],
+                    "score": result["score"]
+                }
+                for result in search_results
+            ],
+            "confidence": "high" if search_results[0]["score"] > 0.5 else "medium",
+            "num_sources": len(search_results)
+        }
+
     def query(self, question: str, num_code_results: int = 3) -> Dict:
         """
         Answer a question about the paper and code
@@ -66,14 +158,7 @@ class QueryPipeline:
         try:
             console.print(f"\n[bold blue]Processing query: {question}[/bold blue]")
 
-            # Step 1: Search for relevant code using ChromaDB (SINGLE SEARCH - OPTIMIZED)
-            metadata_filter = None
-            
-            search_results = self.chroma.search(
-                question,
-                num_results=num_code_results,
-                metadata_filter=metadata_filter,
-            )
+            search_results, code_context = self._retrieve(question, num_code_results)
 
             if not search_results:
                 return {
@@ -82,47 +167,6 @@ class QueryPipeline:
                     "confidence": "low"
                 }
 
-            # Step 2: Format code context from already-retrieved results (NO DUPLICATE SEARCH)
-            formatted_results = []
-            for i, result in enumerate(search_results, 1):
-                metadata = result.get("metadata", {})
-                file_path = metadata.get("file_path") or result.get("file_path") or result.get("document_title") or result.get("document_id")
-                line_start = metadata.get("line_start")
-                line_end = metadata.get("line_end")
-                
-                # Clean up file path - remove cloned_repos/repo_name/ prefix for cleaner display
-                if file_path and isinstance(file_path, str):
-                    if 'cloned_repos' in file_path:
-                        # Extract path after cloned_repos/repo_name/
-                        parts = file_path.split('cloned_repos/')
-                        if len(parts) > 1:
-                            remaining = parts[1]
-                            # Skip the repo name (first directory)
-                            path_parts = remaining.split('/', 1)
-                            if len(path_parts) > 1:
-                                file_path = path_parts[1]  # Relative path within repo
-                    
-                    # Also handle Windows paths
-                    if 'cloned_repos\\' in file_path:
-                        parts = file_path.split('cloned_repos\\')
-                        if len(parts) > 1:
-                            remaining = parts[1]
-                            path_parts = remaining.split('\\', 1)
-                            if len(path_parts) > 1:
-                                file_path = path_parts[1].replace('\\', '/')  # Normalize to forward slashes
-                
-                if file_path:
-                    if line_start and line_end:
-                        header = f"[SOURCE {i}: {file_path}:{line_start}-{line_end}]"
-                    else:
-                        header = f"[SOURCE {i}: {file_path}]"
-                else:
-                    header = f"[SOURCE {i}]"
-                
-                formatted_results.append(f"{header}\n{result['text']}\n")
-            
-            code_context = "\n".join(formatted_results)
-
             # Step 3: Generate answer using Gemini
             answer = self.gemini.answer_question(
                 question,
@@ -131,33 +175,53 @@ class QueryPipeline:
             )
 
             # Step 4: Format response
-            response = {
-                "answer": answer,
-                "code_snippets": [
-                    {
-                        "text": result["text"],
-                        "score": result["score"],
-                        "metadata": result.get("metadata", {}),
-                        "file_path": result.get("file_path"),
-                        "document_title": result.get("document_title"),
-                        "document_id": result.get("document_id"),
-                    }
-                    for result in search_results
-                ],
-                "citations": [  # NEW: Structured citations for frontend
-                    {
-                        "file_path": result.get("metadata", {}).get("file_path") or result.get("file_path"),
-                        "line_start": result.get("metadata", {}).get("line_start"),
-                        "line_end": result.get("metadata", {}).get("line_end"),
-                        "snippet_preview": result["text"][:200] + "..." if len(result["text"]) > 200 else result["text"],
-                        "score": result["score"]
-                    }
-                    for result in search_results
-                ],
-                "confidence": "high" if search_results[0]["score"] > 0.5 else "medium",
-                "num_sources": len(search_results)
+            response = {"answer": answer, **self._sources(search_results)}
+
+            console.print(f"[green]✓ Generated response ({response['confidence']} confidence)[/green]")
+            return response
+
+        except Exception as e:
+            console.print(f"[red]Error processing query: {e}[/red]")
+            return {
+                "answer": f"Error processing query: {str(e)}",
+                "code_snippets": [],
+                "confidence": "error"
             }
 
+    async def aquery(self, question: str, num_code_results: int = 3) -> Dict:
+        """
+        Async variant of query: retrieval runs in a worker thread and the Gemini call is awaited
+
+        Args:
+            question: User question
+            num_code_results: Number of code snippets to retrieve
+
+        Returns:
+            Dictionary with answer, code snippets, and metadata
+        """
+        try:
+            console.print(f"\n[bold blue]Processing query: {question}[/bold blue]")
+
+            # Embedding + Chroma search are blocking; keep them off the event loop
+            search_results, code_context = await asyncio.to_thread(
+                self._retrieve, question, num_code_results
+            )
+
+            if not search_results:
+                return {
+                    "answer": "I couldn't find relevant code for this question.",
+                    "code_snippets": [],
+                    "confidence": "low"
+                }
+
+            answer = await self.gemini.aanswer_question(
+                question,
+                code_context,
+                self.paper_info
+            )
+
+            response = {"answer": answer, **self._sources(search_results)}
+
             console.print(f"[green]✓ Generated response ({response['confidence']} confidence)[/green]")
             return response
 
@@ -169,6 +233,43 @@ class QueryPipeline:
                 "confidence": "error"
             }
 
+    def query_stream(self, question: str, num_code_results: int = 3) -> Iterator[Dict]:
+        """
+        Answer a question, streaming the answer as it is generated
+
+        Args:
+            question: User question
+            num_code_results: Number of code snippets to retrieve
+
+        Yields:
+            {"type": "sources", ...} once retrieval is done, then
+            {"type": "delta", "text": ...} chunks, then
+            {"type": "done", "answer": ...} with the full answer
+        """
+        try:
+            console.print(f"\n[bold blue]Streaming query: {question}[/bold blue]")
+
+            search_results, code_context = self._retrieve(question, num_code_results)
+
+            if not search_results:
+                yield {"type": "sources", "code_snippets": [], "confidence": "low", "num_sources": 0}
+                yield {"type": "done", "answer": "I couldn't find relevant code for this question."}
+                return
+
+            # Sources are known before the answer, send them first
+            yield {"type": "sources", **self._sources(search_results)}
+
+            parts = []
+            for text in self.gemini.answer_question_stream(question, code_context, self.paper_info):
+                parts.append(text)
+                yield {"type": "delta", "text": text}
+
+            yield {"type": "done", "answer": "".join(parts).strip()}
+
+        except Exception as e:
+            console.print(f"[red]Error processing query: {e}[/red]")
+            yield {"type": "error", "answer": f"Error processing query: {str(e)}", "confidence": "error"}
+
     def explain_concept(self, concept_name: str) -> Dict:
         """
         Explain a specific concept from the paper
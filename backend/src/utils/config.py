@@ -27,6 +27,8 @@ class Config:
 
     # Model Settings
     GEMINI_MODEL: str = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+    # Paper search only extracts titles/URLs; a Flash model is plenty even if GEMINI_MODEL is Pro
+    GEMINI_SEARCH_MODEL: str = os.getenv("GEMINI_SEARCH_MODEL", "gemini-2.5-flash")
 
     # Paths
     PROJECT_ROOT: Path = Path(__file__).parent.parent.parent
@@ -40,10 +42,16 @@ class Config:
     CHROMA_CLOUD_API_KEY: Optional[str] = os.getenv("CHROMA_CLOUD_API_KEY")
     CHROMA_CLOUD_HOST: Optional[str] = os.getenv("CHROMA_CLOUD_HOST")  # defaults to api.trychroma.com
 
+    # Shared session store (optional - leave empty for in-process sessions)
+    REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+
     # Application Settings
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     MAX_CONTEXT_LENGTH: int = 1_000_000  # Gemini 2.0 Flash supports up to 2M
 
+    # Set once ensure_directories has run, so writers can skip their own mkdir calls
+    _dirs_ready: bool = False
+
     @classmethod
     def validate(cls) -> list[str]:
         """Validate required configuration"""
@@ -65,6 +73,7 @@ class Config:
         # Only create local ChromaDB directory if not using cloud
         if not cls.CHROMA_CLOUD_API_KEY:
             Path(cls.CHROMA_PATH).mkdir(parents=True, exist_ok=True)
+        cls._dirs_ready = True
 
 
 # Validate on import
@@ -3,7 +3,10 @@ GCP OAuth authentication for Gemini API
 Allows using GCP billing/credits instead of free tier
 """
 import os
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from threading import Lock, Timer
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -12,6 +15,13 @@ from typing import Optional
 # Scopes required for Gemini API
 SCOPES = ['https://www.googleapis.com/auth/generative-language']
 
+# The access token is refreshed in the background this long before it
+# expires, so the refresh doesn't land on a request's critical path (the
+# Gemini client holds the same Credentials object, so it sees the new token)
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+# Wait before retrying a failed background refresh
+TOKEN_REFRESH_RETRY_SECONDS = 60
+
 
 class GCPAuthManager:
     """Manages GCP OAuth authentication for Gemini API"""
@@ -37,6 +47,8 @@ class GCPAuthManager:
         self.project_id = project_id
         self.token_path = token_path or str(Path.cwd() / "gcp_token.json")
         self.credentials: Optional[Credentials] = None
+        self._refresh_lock = Lock()
+        self._refresh_timer: Optional[Timer] = None
 
     def get_credentials(self) -> Credentials:
         """
@@ -45,6 +57,10 @@ class GCPAuthManager:
         Returns:
             Valid OAuth credentials
         """
+        # Reuse the in-memory token while it has time left
+        if self.credentials and self.credentials.valid and not self._expiring_soon():
+            return self.credentials
+
         # Try to load existing token
         if os.path.exists(self.token_path):
             try:
@@ -56,8 +72,12 @@ class GCPAuthManager:
                 print(f"Failed to load existing token: {e}")
                 self.credentials = None
 
-        # Refresh if expired
-        if self.credentials and self.credentials.expired and self.credentials.refresh_token:
+        # Refresh if expired or about to expire
+        if (
+            self.credentials
+            and (self.credentials.expired or self._expiring_soon())
+            and self.credentials.refresh_token
+        ):
             try:
                 self.credentials.refresh(Request())
                 self._save_credentials()
@@ -70,8 +90,51 @@ class GCPAuthManager:
             self.credentials = self._run_oauth_flow()
             self._save_credentials()
 
+        self._schedule_refresh()
         return self.credentials
 
+    def _schedule_refresh(self, wait: Optional[float] = None):
+        """
+        Refresh the token in the background shortly before it expires
+
+        Args:
+            wait: Seconds until the refresh; defaults to TOKEN_REFRESH_MARGIN_SECONDS before expiry
+        """
+        if not self.credentials or not self.credentials.expiry or not self.credentials.refresh_token:
+            return
+        if wait is None:
+            wait = max(self._seconds_left() - TOKEN_REFRESH_MARGIN_SECONDS, 0)
+
+        with self._refresh_lock:
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+            self._refresh_timer = Timer(wait, self._refresh_in_background)
+            self._refresh_timer.daemon = True
+            self._refresh_timer.start()
+
+    def _refresh_in_background(self):
+        """Timer body: refresh the credentials in place and schedule the next refresh"""
+        try:
+            self.credentials.refresh(Request())
+            self._save_credentials()
+        except Exception as e:
+            print(f"Failed to refresh token: {e}")
+            self._schedule_refresh(TOKEN_REFRESH_RETRY_SECONDS)
+            return
+        self._schedule_refresh()
+
+    def _seconds_left(self) -> float:
+        """Seconds until the access token expires"""
+        # google-auth stores expiry as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (self.credentials.expiry - now).total_seconds()
+
+    def _expiring_soon(self) -> bool:
+        """Whether the access token expires within TOKEN_REFRESH_MARGIN_SECONDS"""
+        if not self.credentials or self.credentials.expiry is None:
+            return False
+        return self._seconds_left() < TOKEN_REFRESH_MARGIN_SECONDS
+
     def _run_oauth_flow(self) -> Credentials:
         """
         Run OAuth flow to get new credentials
@@ -155,6 +218,12 @@ class GCPAuthManager:
         return creds.token
 
 
+@lru_cache(maxsize=4)
+def _get_auth_manager(client_id: str, client_secret: str, project_id: Optional[str] = None) -> GCPAuthManager:
+    """Shared auth manager per OAuth client, so its credentials are reused across clients"""
+    return GCPAuthManager(client_id, client_secret, project_id)
+
+
 def get_authenticated_client(client_id: str, client_secret: str, project_id: Optional[str] = None):
     """
     Get authenticated Gemini client using GCP OAuth
@@ -169,7 +238,7 @@ def get_authenticated_client(client_id: str, client_secret: str, project_id: Opt
     """
     from google import genai
 
-    auth_manager = GCPAuthManager(client_id, client_secret, project_id)
+    auth_manager = _get_auth_manager(client_id, client_secret, project_id)
     credentials = auth_manager.get_credentials()
 
     # Create client with OAuth credentials
@@ -0,0 +1,35 @@
+"""
+Shared HTTP session for outbound requests (ArXiv API, PDF downloads)
+"""
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@lru_cache(maxsize=None)
+def get_http_session() -> requests.Session:
+    """
+    Get the process-wide requests session
+
+    Keeps TCP/TLS connections alive between calls and retries rate limits
+    (429) and transient gateway errors with exponential backoff, honouring
+    Retry-After.
+
+    Returns:
+        Shared requests.Session
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=["GET", "HEAD"],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -1,16 +1,62 @@
 """
 Paper caching system for Repo Rover
 Stores paper metadata, repo URLs, concept maps to avoid redundant API calls
+
+Paper metadata lives in papers.json; concept maps live in one SQLite file
+(concept_maps.sqlite3), with per-paper JSON files in CONCEPT_MAPS_DIR still
+read for maps saved before the move (e.g. the checked-in showcase papers).
 """
-import json
+import atexit
 import logging
+import os
+import sqlite3
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from threading import Lock, Timer, get_ident
+from typing import Optional, Dict, Any, Set
+
+import orjson
+
 from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# Changes are written at most this often; later ones within the window are
+# coalesced into one deferred write
+FLUSH_INTERVAL_SECONDS = 5.0
+
+# get_stats results are reused for this long
+STATS_TTL_SECONDS = 30.0
+
+CONCEPT_MAPS_DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+)
+
+
+@lru_cache(maxsize=4096)
+def _normalize(arxiv_id: str) -> str:
+    """Strip the version suffix from an arXiv ID (e.g. 1706.03762v5 -> 1706.03762)"""
+    idx = arxiv_id.find('v')
+    return arxiv_id if idx < 0 else arxiv_id[:idx]
+
+
+def _write_json(path: Path, data: Any) -> int:
+    """
+    Write JSON atomically: readers see the old file or the new one, never a partial write
+
+    Returns:
+        Size of the written file in bytes
+    """
+    # Unique per process and thread, so concurrent writers never share a temp file
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{get_ident()}.tmp")
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+    return len(payload)
+
 
 class PaperCache:
     """Manages persistent cache for paper metadata and analysis results"""
@@ -24,14 +70,37 @@ class PaperCache:
         """
         self.cache_file = cache_file or (Config.CACHE_DIR / "papers.json")
         self.cache: Dict[str, Dict[str, Any]] = {}
+        # papers.json is shared by every worker process; its mtime tells when
+        # another one wrote entries this process hasn't seen
+        self._file_mtime: Optional[int] = None
+        # Entries deleted here, so merging another process's file doesn't bring them back
+        self._deleted: Set[str] = set()
         self._load_cache()
 
+        # File sizes for get_stats, recorded when written (or stat'ed once)
+        self._file_size: Optional[int] = None
+        self._map_sizes: Dict[str, int] = {}
+        self._stats: Optional[Dict[str, Any]] = None
+        self._stats_at = 0.0
+
+        # Concept map store, opened on first use
+        self.concept_maps_db = self.cache_file.parent / "concept_maps.sqlite3"
+        self._maps_conn: Optional[sqlite3.Connection] = None
+        self._maps_lock = Lock()
+
+        self._dirty = False
+        # Nothing written yet, so the first change is saved immediately
+        self._last_flush = time.monotonic() - FLUSH_INTERVAL_SECONDS
+        self._flush_timer: Optional[Timer] = None
+        self._flush_lock = Lock()
+        atexit.register(self.flush)
+
     def _load_cache(self):
         """Load cache from disk"""
         if self.cache_file.exists():
             try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    self.cache = json.load(f)
+                self._file_mtime = self.cache_file.stat().st_mtime_ns
+                self.cache = orjson.loads(self.cache_file.read_bytes())
                 logger.info(f"Loaded cache with {len(self.cache)} papers")
             except Exception as e:
                 logger.error(f"Failed to load cache: {e}")
@@ -40,15 +109,83 @@ class PaperCache:
             self.cache = {}
             logger.info("No existing cache found, starting fresh")
 
-    def _save_cache(self):
-        """Save cache to disk"""
+    def _merge_from_disk(self):
+        """Add entries other processes wrote to papers.json since this one last read or wrote it"""
+        try:
+            mtime = self.cache_file.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._file_mtime:
+            return
+
         try:
-            Config.CACHE_DIR.mkdir(parents=True, exist_ok=True)
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2, ensure_ascii=False)
+            disk = orjson.loads(self.cache_file.read_bytes())
+        except Exception as e:
+            logger.error(f"Failed to reload cache: {e}")
+            return
+        self._file_mtime = mtime
+
+        # Entries this process also has keep its (possibly unsaved) version
+        added = [
+            arxiv_id for arxiv_id in disk
+            if arxiv_id not in self.cache and arxiv_id not in self._deleted
+        ]
+        for arxiv_id in added:
+            self.cache[arxiv_id] = disk[arxiv_id]
+        if added:
+            self._stats = None
+            logger.info(f"Merged {len(added)} papers cached by another process")
+
+    def _save_cache(self) -> bool:
+        """
+        Save cache to disk, keeping entries other processes added since the last read
+
+        Returns:
+            True if the file was written
+        """
+        try:
+            if not Config._dirs_ready:
+                Config.ensure_directories()
+            self._merge_from_disk()
+            self._file_size = _write_json(self.cache_file, self.cache)
+            self._file_mtime = self.cache_file.stat().st_mtime_ns
             logger.debug(f"Saved cache with {len(self.cache)} papers")
+            return True
         except Exception as e:
             logger.error(f"Failed to save cache: {e}")
+            return False
+
+    def _schedule_flush(self, wait: float):
+        """Start the deferred-write timer if none is pending (caller holds _flush_lock)"""
+        if self._flush_timer is None:
+            self._flush_timer = Timer(wait, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _mark_dirty(self):
+        """Record an in-memory change; write now or schedule a write within FLUSH_INTERVAL_SECONDS"""
+        with self._flush_lock:
+            self._dirty = True
+            wait = FLUSH_INTERVAL_SECONDS - (time.monotonic() - self._last_flush)
+            if wait > 0:
+                self._schedule_flush(wait)
+                return
+        self.flush()
+
+    def flush(self):
+        """Write pending changes to disk"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            self._last_flush = time.monotonic()
+            if self._save_cache():
+                self._dirty = False
+            else:
+                # Keep the changes pending and try again later (or at exit)
+                self._schedule_flush(FLUSH_INTERVAL_SECONDS)
 
     def get(self, arxiv_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -60,20 +197,36 @@ class PaperCache:
         Returns:
             Cached paper data or None if not found
         """
-        # Normalize arxiv_id (remove version suffix if present)
-        normalized_id = arxiv_id.split('v')[0] if 'v' in arxiv_id else arxiv_id
+        normalized_id = _normalize(arxiv_id)
+        if normalized_id not in self.cache:
+            self._merge_from_disk()
 
         if normalized_id in self.cache:
-            # Update last accessed time
+            # Update last accessed time (written by the next flush)
             self.cache[normalized_id]["last_accessed"] = datetime.now(timezone.utc).isoformat()
             self.cache[normalized_id]["access_count"] = self.cache[normalized_id].get("access_count", 0) + 1
-            self._save_cache()
+            self._mark_dirty()
             logger.info(f"Cache HIT for {normalized_id}")
             return self.cache[normalized_id]
 
         logger.info(f"Cache MISS for {normalized_id}")
         return None
 
+    def peek(self, arxiv_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached paper data without recording an access
+
+        Args:
+            arxiv_id: ArXiv ID
+
+        Returns:
+            Cached paper data or None if not found
+        """
+        normalized_id = _normalize(arxiv_id)
+        if normalized_id not in self.cache:
+            self._merge_from_disk()
+        return self.cache.get(normalized_id)
+
     def set(self, arxiv_id: str, data: Dict[str, Any]):
         """
         Store paper data in cache
@@ -82,8 +235,7 @@ class PaperCache:
             arxiv_id: ArXiv ID
             data: Paper metadata and analysis results
         """
-        # Normalize arxiv_id
-        normalized_id = arxiv_id.split('v')[0] if 'v' in arxiv_id else arxiv_id
+        normalized_id = _normalize(arxiv_id)
 
         # Add timestamps
         now = datetime.now(timezone.utc).isoformat()
@@ -94,7 +246,9 @@ class PaperCache:
             data["created_at"] = now
 
         self.cache[normalized_id] = data
-        self._save_cache()
+        self._deleted.discard(normalized_id)
+        self._stats = None
+        self._mark_dirty()
         logger.info(f"Cached data for {normalized_id}")
 
     def update(self, arxiv_id: str, updates: Dict[str, Any]):
@@ -105,12 +259,13 @@ class PaperCache:
             arxiv_id: ArXiv ID
             updates: Dictionary of fields to update
         """
-        normalized_id = arxiv_id.split('v')[0] if 'v' in arxiv_id else arxiv_id
+        normalized_id = _normalize(arxiv_id)
 
         if normalized_id in self.cache:
             self.cache[normalized_id].update(updates)
             self.cache[normalized_id]["last_accessed"] = datetime.now(timezone.utc).isoformat()
-            self._save_cache()
+            self._stats = None
+            self._mark_dirty()
             logger.info(f"Updated cache for {normalized_id}")
         else:
             logger.warning(f"Cannot update non-existent cache entry: {normalized_id}")
@@ -125,11 +280,17 @@ class PaperCache:
         Returns:
             True if deleted, False if not found
         """
-        normalized_id = arxiv_id.split('v')[0] if 'v' in arxiv_id else arxiv_id
+        normalized_id = _normalize(arxiv_id)
 
         if normalized_id in self.cache:
+            map_path = self.cache[normalized_id].get("concept_map_path")
+            if map_path:
+                self._map_sizes.pop(map_path, None)
             del self.cache[normalized_id]
-            self._save_cache()
+            self._deleted.add(normalized_id)
+            self._stats = None
+            self._dirty = True
+            self.flush()
             logger.info(f"Deleted cache for {normalized_id}")
             return True
 
@@ -145,7 +306,9 @@ class PaperCache:
         Returns:
             True if cached, False otherwise
         """
-        normalized_id = arxiv_id.split('v')[0] if 'v' in arxiv_id else arxiv_id
+        normalized_id = _normalize(arxiv_id)
+        if normalized_id not in self.cache:
+            self._merge_from_disk()
         return normalized_id in self.cache
 
     def get_stats(self) -> Dict[str, Any]:
@@ -155,22 +318,32 @@ class PaperCache:
         Returns:
             Dictionary with cache stats
         """
+        now = time.monotonic()
+        if self._stats is not None and now - self._stats_at < STATS_TTL_SECONDS:
+            return self._stats
+
         total_papers = len(self.cache)
         total_accesses = sum(p.get("access_count", 0) for p in self.cache.values())
 
-        # Calculate total cache size
-        total_size = 0
-        if self.cache_file.exists():
-            total_size = self.cache_file.stat().st_size
-
-        # Add concept map sizes
-        for paper in self.cache.values():
-            if "concept_map_path" in paper:
-                map_path = Path(paper["concept_map_path"])
-                if map_path.exists():
-                    total_size += map_path.stat().st_size
-
-        return {
+        # Calculate total cache size from recorded sizes; files not written
+        # by this process are stat'ed once
+        if self._file_size is None:
+            self._file_size = self._stat_size(self.cache_file)
+        total_size = self._file_size
+
+        # Add concept map sizes (the SQLite store is shared, so count each path once)
+        map_paths = {paper["concept_map_path"] for paper in self.cache.values() if paper.get("concept_map_path")}
+        db_path = str(self.concept_maps_db)
+        if db_path in map_paths:
+            map_paths.discard(db_path)
+            total_size += self._stat_size(self.concept_maps_db)
+        for map_path in map_paths:
+            size = self._map_sizes.get(map_path)
+            if size is None:
+                size = self._map_sizes[map_path] = self._stat_size(Path(map_path))
+            total_size += size
+
+        self._stats = {
             "total_papers": total_papers,
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
@@ -188,40 +361,73 @@ class PaperCache:
                 for arxiv_id, data in self.cache.items()
             ]
         }
+        self._stats_at = now
+        return self._stats
+
+    @staticmethod
+    def _stat_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
 
     def clear_all(self):
         """Clear entire cache"""
+        self._merge_from_disk()
+        self._deleted.update(self.cache)
         self.cache = {}
-        self._save_cache()
+        self._map_sizes.clear()
+        self._stats = None
+        self._dirty = True
+        self.flush()
         logger.warning("Cleared entire cache")
 
+    def _concept_maps(self) -> sqlite3.Connection:
+        """Connection to the concept map store, created on first use"""
+        if self._maps_conn is None:
+            if not Config._dirs_ready:
+                Config.ensure_directories()
+            conn = sqlite3.connect(str(self.concept_maps_db), check_same_thread=False)
+            for pragma in CONCEPT_MAPS_DB_PRAGMAS:
+                conn.execute(pragma)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS concept_maps (arxiv_id TEXT PRIMARY KEY, payload BLOB NOT NULL)"
+            )
+            conn.commit()
+            self._maps_conn = conn
+        return self._maps_conn
+
     def save_concept_map(self, arxiv_id: str, concept_map: Dict[str, Any]) -> Path:
         """
-        Save concept map to separate file
+        Save concept map to the concept map store
 
         Args:
             arxiv_id: ArXiv ID
             concept_map: Concept map data
 
         Returns:
-            Path to saved concept map file
+            Path to the concept map store (recorded as the paper's concept_map_path)
         """
-        normalized_id = arxiv_id.split('v')[0] if 'v' in arxiv_id else arxiv_id
-        map_path = Config.CONCEPT_MAPS_DIR / f"{normalized_id}.json"
+        normalized_id = _normalize(arxiv_id)
 
         try:
-            Config.CONCEPT_MAPS_DIR.mkdir(parents=True, exist_ok=True)
-            with open(map_path, 'w', encoding='utf-8') as f:
-                json.dump(concept_map, f, indent=2, ensure_ascii=False)
+            with self._maps_lock:
+                conn = self._concept_maps()
+                conn.execute(
+                    "INSERT OR REPLACE INTO concept_maps (arxiv_id, payload) VALUES (?, ?)",
+                    (normalized_id, orjson.dumps(concept_map)),
+                )
+                conn.commit()
+            self._stats = None
             logger.info(f"Saved concept map for {normalized_id}")
-            return map_path
+            return self.concept_maps_db
         except Exception as e:
             logger.error(f"Failed to save concept map: {e}")
             raise
 
     def load_concept_map(self, arxiv_id: str) -> Optional[Dict[str, Any]]:
         """
-        Load concept map from file
+        Load concept map from the store, or from a legacy per-paper JSON file
 
         Args:
             arxiv_id: ArXiv ID
@@ -229,19 +435,57 @@ class PaperCache:
         Returns:
             Concept map data or None if not found
         """
-        normalized_id = arxiv_id.split('v')[0] if 'v' in arxiv_id else arxiv_id
-        map_path = Config.CONCEPT_MAPS_DIR / f"{normalized_id}.json"
+        normalized_id = _normalize(arxiv_id)
+
+        try:
+            with self._maps_lock:
+                row = self._concept_maps().execute(
+                    "SELECT payload FROM concept_maps WHERE arxiv_id = ?", (normalized_id,)
+                ).fetchone()
+            if row is not None:
+                return orjson.loads(row[0])
+        except Exception as e:
+            logger.error(f"Failed to load concept map: {e}")
 
+        map_path = Config.CONCEPT_MAPS_DIR / f"{normalized_id}.json"
         if map_path.exists():
             try:
-                with open(map_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return orjson.loads(map_path.read_bytes())
             except Exception as e:
                 logger.error(f"Failed to load concept map: {e}")
                 return None
 
         return None
 
+    def delete_concept_map(self, arxiv_id: str) -> bool:
+        """
+        Delete a paper's concept map (store entry and any legacy JSON file)
+
+        Args:
+            arxiv_id: ArXiv ID
+
+        Returns:
+            True if a concept map was deleted
+        """
+        normalized_id = _normalize(arxiv_id)
+
+        with self._maps_lock:
+            conn = self._concept_maps()
+            deleted = conn.execute(
+                "DELETE FROM concept_maps WHERE arxiv_id = ?", (normalized_id,)
+            ).rowcount > 0
+            conn.commit()
+
+        map_path = Config.CONCEPT_MAPS_DIR / f"{normalized_id}.json"
+        if map_path.exists():
+            map_path.unlink()
+            self._map_sizes.pop(str(map_path), None)
+            deleted = True
+
+        if deleted:
+            self._stats = None
+        return deleted
+
 
 # Global cache instance
 _cache_instance: Optional[PaperCache] = None
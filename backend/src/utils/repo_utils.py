@@ -4,6 +4,7 @@ Repository utilities for cloning and analyzing Git repositories
 import os
 import shutil
 from pathlib import Path
+from threading import Lock
 from typing import Dict, List, Optional
 import git
 from git import Repo
@@ -11,6 +12,18 @@ from rich.console import Console
 
 console = Console()
 
+# Directories get_python_files never descends into
+PYTHON_SKIP_DIRS = frozenset({'node_modules', '__pycache__', 'venv', 'env', 'build', 'dist'})
+
+# Directories holding tests, matched against whole (lowercased) path components
+TEST_DIRS = frozenset({'test', 'tests'})
+
+
+def is_test_file(name: str) -> bool:
+    """Whether a file name looks like a test module (case-insensitive)"""
+    name = name.lower()
+    return name.startswith("test_") or name.endswith(("_test.py", "_tests.py")) or name == "conftest.py"
+
 
 class RepoAnalyzer:
     """Analyze and manage Git repositories"""
@@ -18,6 +31,31 @@ class RepoAnalyzer:
     def __init__(self, clone_dir: Path):
         self.clone_dir = Path(clone_dir)
         self.clone_dir.mkdir(parents=True, exist_ok=True)
+        # (kind, repo_path, ...) -> (.git/HEAD mtime, value)
+        self._memo: Dict[tuple, tuple] = {}
+        self._memo_lock = Lock()
+
+    @staticmethod
+    def _repo_version(repo_path: Path) -> Optional[int]:
+        """mtime of .git/HEAD, which changes whenever the checkout moves"""
+        try:
+            return (Path(repo_path) / ".git" / "HEAD").stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _memo_get(self, key: tuple, version: Optional[int]):
+        if version is None:
+            return None
+        with self._memo_lock:
+            entry = self._memo.get(key)
+        if entry is not None and entry[0] == version:
+            return entry
+        return None
+
+    def _memo_set(self, key: tuple, version: Optional[int], value):
+        if version is not None:
+            with self._memo_lock:
+                self._memo[key] = (version, value)
 
     def clone_repository(self, repo_url: str, depth: int = 1) -> Optional[Path]:
         """
@@ -154,6 +192,12 @@ class RepoAnalyzer:
         Returns:
             Dictionary with repository structure information
         """
+        key = ("structure", str(repo_path), max_depth)
+        version = self._repo_version(repo_path)
+        hit = self._memo_get(key, version)
+        if hit is not None:
+            return hit[1]
+
         structure = {
             "root": str(repo_path),
             "files": [],
@@ -198,6 +242,7 @@ class RepoAnalyzer:
                 if file in key_file_names:
                     structure["key_files"].append(str(rel_path))
 
+        self._memo_set(key, version, structure)
         return structure
 
     def get_python_files(self, repo_path: Path, exclude_tests: bool = False) -> List[Path]:
@@ -212,20 +257,20 @@ class RepoAnalyzer:
             List of Python file paths
         """
         python_files = []
+        skip_dirs = PYTHON_SKIP_DIRS | TEST_DIRS if exclude_tests else PYTHON_SKIP_DIRS
 
         for root, dirs, files in os.walk(repo_path):
-            # Skip common directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'venv', 'env', 'build', 'dist']]
+            # Skip common directories (and test directories if requested) by name,
+            # so e.g. "latest/" or "contest/" are not mistaken for tests
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d.lower() not in skip_dirs]
 
             for file in files:
                 if file.endswith('.py'):
-                    file_path = Path(root) / file
-
                     # Skip test files if requested
-                    if exclude_tests and ('test' in file.lower() or 'test' in str(file_path).lower()):
+                    if exclude_tests and is_test_file(file):
                         continue
 
-                    python_files.append(file_path)
+                    python_files.append(Path(root) / file)
 
         return python_files
 
@@ -260,14 +305,23 @@ class RepoAnalyzer:
         Returns:
             README content or None
         """
+        key = ("readme", str(repo_path))
+        version = self._repo_version(repo_path)
+        hit = self._memo_get(key, version)
+        if hit is not None:
+            return hit[1]
+
+        readme = None
         readme_names = ["README.md", "README.rst", "README.txt", "README"]
 
         for name in readme_names:
             readme_path = repo_path / name
             if readme_path.exists():
-                return self.read_file_content(readme_path)
+                readme = self.read_file_content(readme_path)
+                break
 
-        return None
+        self._memo_set(key, version, readme)
+        return readme
 
     def cleanup_repo(self, repo_path: Path):
         """
@@ -276,6 +330,10 @@ class RepoAnalyzer:
         Args:
             repo_path: Path to repository to remove
         """
+        with self._memo_lock:
+            for key in [k for k in self._memo if k[1] == str(repo_path)]:
+                del self._memo[key]
+
         if repo_path.exists():
             shutil.rmtree(repo_path)
             console.print(f"[green]Cleaned up: {repo_path}[/green]")